@@ -23,6 +23,12 @@ class Config:
         # Chrome paths
         self.CHROMEDRIVER_PATH = '/usr/local/bin/chromedriver'
         self.CHROMEDRIVER_LOG_PATH = '/app/logs/chromedriver.log'
+        # Verbose Chrome logging to stderr (--enable-logging --v=1), for debugging only
+        self.CHROME_VERBOSE_LOGGING = os.getenv('CHROME_VERBOSE_LOGGING', '').lower() in ('1', 'true', 'yes')
+
+        # WebDriver pool (warm Chrome sessions)
+        self.WEBDRIVER_POOL_SIZE = int(os.getenv('WEBDRIVER_POOL_SIZE', '1'))
+        self.WEBDRIVER_POOL_TIMEOUT = int(os.getenv('WEBDRIVER_POOL_TIMEOUT', '30'))
 
         # Logging
         self.LOG_FILE_PATH = '/app/logs/flask.log'
@@ -2,5 +2,6 @@
 
 from .browser_session_manager import BrowserSessionManager
 from .browser_registry import BrowserRegistry
+from .webdriver_pool import WebDriverPool
 
-__all__ = ['BrowserSessionManager', 'BrowserRegistry']
+__all__ = ['BrowserSessionManager', 'BrowserRegistry', 'WebDriverPool']
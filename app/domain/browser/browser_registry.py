@@ -2,9 +2,13 @@
 
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
 logger = logging.getLogger(__name__)
 
+# Maximum seconds to wait for concurrent detector closes
+CLOSE_TIMEOUT = 30
+
 
 class BrowserRegistry:
     """
@@ -13,12 +17,16 @@ class BrowserRegistry:
     Provides thread-safe operations for registering, retrieving, and managing
     browser detector instances. Enforces singleton pattern by clearing all
     browsers before registering a new one.
+
+    Writes are copy-on-write: each mutation builds a new dict under the write
+    lock and swaps it in with a single attribute assignment. Reads never take
+    the lock; they load the current snapshot and query it.
     """
 
     def __init__(self):
-        """Initialize browser registry with empty dict and lock"""
+        """Initialize browser registry with empty snapshot and write lock"""
         self._active_browsers = {}
-        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
 
     def register(self, browser_id, detector, enforce_singleton=True):
         """
@@ -32,12 +40,14 @@ class BrowserRegistry:
         Returns:
             bool: True if registration successful
         """
-        with self._lock:
+        with self._write_lock:
             if enforce_singleton and self._active_browsers:
                 logger.info("Enforcing singleton: closing existing browsers before registration")
-                self._close_all_internal()
+                self._close_detectors(self._detach_all())
 
-            self._active_browsers[browser_id] = detector
+            new_browsers = dict(self._active_browsers)
+            new_browsers[browser_id] = detector
+            self._active_browsers = new_browsers
             logger.debug(f"Registered browser {browser_id}")
             return True
 
@@ -51,7 +61,7 @@ class BrowserRegistry:
         Returns:
             bool: True if browser was found and unregistered
         """
-        with self._lock:
+        with self._write_lock:
             if browser_id in self._active_browsers:
                 detector = self._active_browsers[browser_id]
                 try:
@@ -60,7 +70,9 @@ class BrowserRegistry:
                 except Exception as e:
                     logger.error(f"Error closing browser {browser_id}: {e}")
 
-                del self._active_browsers[browser_id]
+                new_browsers = dict(self._active_browsers)
+                del new_browsers[browser_id]
+                self._active_browsers = new_browsers
                 return True
             return False
 
@@ -74,8 +86,7 @@ class BrowserRegistry:
         Returns:
             StreamDetector instance or None if not found
         """
-        with self._lock:
-            return self._active_browsers.get(browser_id)
+        return self._active_browsers.get(browser_id)
 
     def get_all(self):
         """
@@ -84,8 +95,7 @@ class BrowserRegistry:
         Returns:
             list: List of active browser IDs
         """
-        with self._lock:
-            return list(self._active_browsers.keys())
+        return list(self._active_browsers)
 
     def has(self, browser_id):
         """
@@ -97,8 +107,7 @@ class BrowserRegistry:
         Returns:
             bool: True if browser exists in registry
         """
-        with self._lock:
-            return browser_id in self._active_browsers
+        return browser_id in self._active_browsers
 
     def clear_all(self):
         """
@@ -107,36 +116,65 @@ class BrowserRegistry:
         Returns:
             list: List of browser IDs that were closed
         """
-        with self._lock:
-            return self._close_all_internal()
+        with self._write_lock:
+            detached = self._detach_all()
 
-    def _close_all_internal(self):
+        # Close outside the lock; readers already see an empty registry
+        return self._close_detectors(detached)
+
+    def _detach_all(self):
         """
-        Internal method to close all browsers (must be called within lock).
+        Internal method to empty the registry (must be called within write lock).
+
+        Returns:
+            dict: Snapshot of browser_id -> detector that was removed
+        """
+        snapshot = self._active_browsers
+        self._active_browsers = {}
+        return snapshot
+
+    def _close_detectors(self, detectors):
+        """
+        Close detectors concurrently.
+
+        Each close() can block on chromedriver and process teardown, so the
+        closes run in parallel rather than one after another.
+
+        Args:
+            detectors: dict of browser_id -> detector to close
 
         Returns:
             list: List of browser IDs that were closed
         """
-        closed_ids = []
-        browsers_to_close = list(self._active_browsers.keys())
+        if not detectors:
+            return []
 
-        for browser_id in browsers_to_close:
-            detector = self._active_browsers[browser_id]
+        closed_ids = []
+        executor = ThreadPoolExecutor(max_workers=len(detectors))
+        futures = {executor.submit(detector.close): browser_id
+                   for browser_id, detector in detectors.items()}
+        done, not_done = wait(futures, timeout=CLOSE_TIMEOUT)
+        # Don't block on closes that overran the timeout
+        executor.shutdown(wait=False)
+
+        for future in done:
+            browser_id = futures[future]
             try:
-                detector.close()
+                future.result()
                 closed_ids.append(browser_id)
                 logger.debug(f"Closed browser {browser_id}")
             except Exception as e:
                 logger.error(f"Error closing browser {browser_id}: {e}")
 
-        self._active_browsers.clear()
+        for future in not_done:
+            logger.error(f"Timed out closing browser {futures[future]}")
+
         return closed_ids
 
     def __len__(self):
         """Return number of active browsers"""
-        with self._lock:
-            return len(self._active_browsers)
+        return len(self._active_browsers)
 
     def __contains__(self, browser_id):
         """Support 'in' operator"""
-        return self.has(browser_id)
+        return browser_id in self._active_browsers
@@ -1,7 +1,9 @@
 """Browser Session Manager - Handles browser lifecycle and navigation"""
 
 import time
+import atexit
 import logging
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import WebDriverException, TimeoutException
@@ -9,6 +11,55 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive sockets per host for the WebDriver HTTP client (urllib3 default is 1)
+WEBDRIVER_HTTP_POOL_MAXSIZE = 20
+
+# One chromedriver process serves every session (chromedriver supports multiple sessions)
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+# document.readyState values that count as a loaded page
+_READY_STATES = frozenset({'interactive', 'complete'})
+
+
+# Current URL, body size and ready state in a single WebDriver round trip
+_PAGE_STATE_SCRIPT = (
+    'return {'
+    'url: window.location.href, '
+    'bodyLength: document.body ? document.body.innerHTML.length : 0, '
+    'readyState: document.readyState'
+    '};'
+)
+
+
+def _page_ready(driver):
+    """WebDriverWait predicate: True once the document is interactive or complete"""
+    return driver.execute_script('return document.readyState') in _READY_STATES
+
+
+def _get_shared_service(config):
+    """
+    Start the shared chromedriver service on first use.
+
+    Args:
+        config: Application config object with CHROMEDRIVER_PATH and CHROMEDRIVER_LOG_PATH
+
+    Returns:
+        Service: Running chromedriver service
+    """
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None or not _shared_service.is_connectable():
+            service = Service(
+                config.CHROMEDRIVER_PATH,
+                log_output=config.CHROMEDRIVER_LOG_PATH
+            )
+            service.start()
+            atexit.register(service.stop)
+            logger.info(f"Shared ChromeDriver started at {service.service_url}")
+            _shared_service = service
+        return _shared_service
+
 
 class BrowserSessionManager:
     """
@@ -26,11 +77,12 @@ class BrowserSessionManager:
         config: Application configuration object
         chrome_config: ChromeConfigManager instance for browser configuration
         cdp_client: CDPClient instance for DevTools Protocol communication
+        driver_pool: Optional WebDriverPool supplying pre-launched drivers
         driver: Selenium WebDriver instance (None until browser starts)
         is_running: Boolean flag indicating if browser session is active
     """
 
-    def __init__(self, config, chrome_config, cdp_client):
+    def __init__(self, config, chrome_config, cdp_client, driver_pool=None):
         """
         Initialize the browser session manager with required dependencies.
 
@@ -38,13 +90,84 @@ class BrowserSessionManager:
             config: Application config object with CHROMEDRIVER_PATH and CHROMEDRIVER_LOG_PATH
             chrome_config: ChromeConfigManager instance for managing Chrome configuration
             cdp_client: CDPClient instance for handling DevTools Protocol communication
+            driver_pool: Optional WebDriverPool; when set, drivers are acquired from
+                and released back to the pool instead of being launched and quit
         """
         self.config = config
         self.chrome_config = chrome_config
         self.cdp_client = cdp_client
+        self.driver_pool = driver_pool
         self.driver = None
         self.is_running = False
 
+    def create_driver(self):
+        """
+        Launch a new Chrome WebDriver instance.
+
+        Resets Chrome preferences, builds Chrome options and opens a new session
+        on the shared chromedriver service. Also used as the factory for
+        WebDriverPool.
+
+        Returns:
+            WebDriver: Newly launched Chrome WebDriver
+        """
+        # Reset Chrome preferences before starting
+        self.chrome_config.reset_preferences()
+
+        # Create Chrome options using config manager
+        chrome_options = self.chrome_config.create_chrome_options()
+
+        logger.info("Initializing ChromeDriver...")
+        service = _get_shared_service(self.config)
+
+        # Remote session on the shared service; quit() ends the session
+        # without stopping chromedriver
+        driver = webdriver.Remote(command_executor=service.service_url, options=chrome_options)
+        logger.info("Chrome started successfully")
+
+        self._widen_connection_pool(driver)
+
+        # Set page load timeout to prevent hangs
+        driver.set_page_load_timeout(60)
+        return driver
+
+    @staticmethod
+    def _widen_connection_pool(driver):
+        """
+        Raise the urllib3 pool size of the WebDriver command connection.
+
+        Selenium's RemoteConnection uses a PoolManager with one socket per host,
+        so concurrent commands from CDP/thumbnail threads drop connections and
+        re-handshake. The existing manager keeps its timeout/cert settings; only
+        the per-host pool size changes.
+
+        Args:
+            driver: Selenium WebDriver instance
+        """
+        try:
+            conn = driver.command_executor._conn
+            conn.connection_pool_kw.update(maxsize=WEBDRIVER_HTTP_POOL_MAXSIZE, block=False)
+            # Drop pools created with the old size so the next request uses the new one
+            conn.clear()
+        except AttributeError as e:
+            logger.debug(f"Could not resize WebDriver connection pool: {e}")
+
+    def _acquire_driver(self):
+        """
+        Get a driver from the pool if one is configured, otherwise launch one.
+
+        Returns:
+            WebDriver: Ready-to-use Chrome WebDriver
+        """
+        if self.driver_pool is None:
+            return self.create_driver()
+
+        driver = self.driver_pool.acquire(timeout=self.config.WEBDRIVER_POOL_TIMEOUT)
+        if driver is None:
+            raise WebDriverException("No WebDriver available from pool")
+        logger.info("Acquired warm Chrome driver from pool")
+        return driver
+
     def start_browser(self, url):
         """
         Start Chrome browser with DevTools Protocol enabled and navigate to URL.
@@ -52,10 +175,12 @@ class BrowserSessionManager:
         This method handles the complete browser startup flow:
         1. Resets Chrome preferences to clear crash flags
         2. Creates Chrome options with CDP enabled
-        3. Initializes WebDriver with retry logic for lock file issues
+        3. Initializes WebDriver (or acquires a warm one from the pool)
+           with retry logic for lock file issues
         4. Sets up CDP WebSocket connection
-        5. Configures window size
-        6. Navigates to the target URL with verification
+        5. Navigates to the target URL with verification
+
+        The window size is set at launch via --window-size in the Chrome options.
 
         The method includes automatic retry logic:
         - Retries WebDriver initialization if Chrome lock files are preventing startup
@@ -82,24 +207,8 @@ class BrowserSessionManager:
             try:
                 logger.info(f"Starting Chrome browser for {url}")
 
-                # Reset Chrome preferences before starting
-                self.chrome_config.reset_preferences()
-
-                # Create Chrome options using config manager
-                chrome_options = self.chrome_config.create_chrome_options()
-
-                logger.info("Initializing ChromeDriver...")
-                service = Service(
-                    self.config.CHROMEDRIVER_PATH,
-                    log_output=self.config.CHROMEDRIVER_LOG_PATH
-                )
-
                 try:
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    logger.info("Chrome started successfully")
-
-                    # Set page load timeout to prevent hangs
-                    self.driver.set_page_load_timeout(60)
+                    self.driver = self._acquire_driver()
 
                 except Exception as driver_error:
                     logger.error(f"Failed to create Chrome webdriver: {driver_error}")
@@ -118,8 +227,6 @@ class BrowserSessionManager:
                     else:
                         raise
 
-                # Set window size for consistent rendering
-                self.driver.set_window_size(1920, 1080)
                 break  # Success, exit retry loop
 
             except WebDriverException as e:
@@ -132,9 +239,7 @@ class BrowserSessionManager:
                 logger.error(f"Error details: {str(e)}")
                 return False
             except Exception as e:
-                logger.error(f"Unexpected error starting browser: {type(e).__name__}: {e}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
+                logger.exception(f"Unexpected error starting browser: {type(e).__name__}: {e}")
                 return False
 
         if retry_count >= max_retries:
@@ -160,7 +265,8 @@ class BrowserSessionManager:
         - Session restore bypass (navigates via about:blank first)
         - JavaScript-based navigation as fallback
         - Page load verification (checks for actual content)
-        - Document ready state waiting
+        - Waiting on CDP Page.loadEventFired, or document ready state
+          polling when the CDP listener is not connected
 
         The navigation process attempts to work around Chrome's session restore
         feature which can cause blank pages or highlighted URL bars. It verifies
@@ -180,42 +286,58 @@ class BrowserSessionManager:
         logger.info(f"Navigating to {url}")
         max_nav_attempts = 3
 
+        # Wait on CDP page load events when the listener is connected,
+        # otherwise fall back to fixed delays and document.readyState polling
+        use_page_events = has_websocket and self.cdp_client.is_connected
+
         for attempt in range(max_nav_attempts):
             try:
                 # First, navigate to about:blank to reset any session restore state
+                # (driver.get blocks until the blank page has loaded)
                 if attempt == 0:
                     self.driver.get('about:blank')
-                    time.sleep(0.5)
+
+                if use_page_events:
+                    self.cdp_client.expect_page_load()
 
                 # Use JavaScript navigation for more forceful control
                 try:
-                    self.driver.execute_script(f'window.location.href = "{url}";')
+                    self.driver.execute_script('window.location.href = arguments[0];', url)
                 except Exception:
                     self.driver.get(url)
 
-                time.sleep(1)
-                current_url = self.driver.current_url
+                if use_page_events:
+                    self.cdp_client.wait_for_page_load(timeout=10)
+                else:
+                    time.sleep(1)
+                page = self.driver.execute_script(_PAGE_STATE_SCRIPT)
+                current_url = page['url']
 
                 # Verify we're not still on about:blank
                 if current_url == 'about:blank' or 'about:blank' in current_url:
                     continue
 
                 # Check if body has content (not just a blank white page)
+                refreshed = False
                 try:
-                    body_len = self.driver.execute_script('return document.body ? document.body.innerHTML.length : 0')
-                    if body_len < 100:
-                        self.driver.refresh()
-                        time.sleep(2)
+                    if page['bodyLength'] < 100:
+                        refreshed = True
+                        if use_page_events:
+                            self.cdp_client.expect_page_load()
+                            self.driver.refresh()
+                            self.cdp_client.wait_for_page_load(timeout=10)
+                        else:
+                            self.driver.refresh()
+                            time.sleep(2)
                 except Exception:
                     pass
 
-                # Wait for page to be ready
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        lambda d: d.execute_script('return document.readyState') in ['interactive', 'complete']
-                    )
-                except TimeoutException:
-                    pass
+                # Wait for page to be ready (load event already covers this with CDP)
+                if not use_page_events and (refreshed or page['readyState'] not in _READY_STATES):
+                    try:
+                        WebDriverWait(self.driver, 10).until(_page_ready)
+                    except TimeoutException:
+                        pass
 
                 logger.info(f"Successfully navigated to {url}")
                 return True
@@ -269,7 +391,8 @@ class BrowserSessionManager:
         This method:
         1. Sets is_running flag to False
         2. Closes the CDP WebSocket connection
-        3. Quits the WebDriver (which closes the browser)
+        3. Quits the WebDriver (which closes the browser), or releases it
+           back to the pool when one is configured
         4. Handles any errors during cleanup gracefully
 
         It's safe to call this method multiple times - it will only
@@ -285,7 +408,10 @@ class BrowserSessionManager:
 
         if self.driver:
             try:
-                self.driver.quit()
+                if self.driver_pool is not None:
+                    self.driver_pool.release(self.driver)
+                else:
+                    self.driver.quit()
                 logger.info("Browser session closed")
             except Exception as e:
                 logger.error(f"Error closing browser: {e}")
@@ -0,0 +1,156 @@
+"""WebDriver Pool - Keeps pre-launched Chrome sessions warm for reuse"""
+
+import queue
+import logging
+import threading
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPool:
+    """
+    Pool of pre-launched WebDriver instances.
+
+    Launching chromedriver + Chrome takes several seconds per session. The pool
+    launches drivers ahead of time in a background thread and hands them out
+    via acquire()/release(), so a session start only pays for navigation.
+
+    Released drivers are reset to about:blank and probed; drivers that no
+    longer respond (zombie sessions) are quit and evicted instead of being
+    returned to the pool.
+
+    Attributes:
+        size: Maximum number of drivers owned by the pool
+    """
+
+    def __init__(self, driver_factory, size=1):
+        """
+        Initialize the pool.
+
+        Args:
+            driver_factory: Callable returning a new WebDriver instance
+            size (int): Maximum number of drivers owned by the pool
+        """
+        self._driver_factory = driver_factory
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """
+        Seed the pool in a daemon thread.
+
+        Returns immediately; acquire() blocks until a driver is available.
+        """
+        threading.Thread(target=self._seed, daemon=True).start()
+
+    def _seed(self):
+        """Launch drivers until the pool is full"""
+        while not self._closed:
+            try:
+                driver = self._create_driver()
+            except Exception as e:
+                logger.error(f"WebDriver pool: failed to launch driver: {e}")
+                return
+            if driver is None:
+                return
+            self._idle.put(driver)
+
+    def _create_driver(self):
+        """
+        Launch a new driver if the pool has spare capacity.
+
+        Returns:
+            WebDriver instance, or None if the pool is full
+
+        Raises:
+            Exception: Whatever the driver factory raised on launch failure
+        """
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return None
+            self._created += 1
+
+        try:
+            driver = self._driver_factory()
+            logger.info("WebDriver pool: launched warm driver")
+            return driver
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def acquire(self, timeout=None):
+        """
+        Take a driver from the pool.
+
+        Launches a driver on demand if none are idle and the pool has spare
+        capacity, otherwise waits for one to be released.
+
+        Args:
+            timeout (float): Seconds to wait for a driver (None = forever)
+
+        Returns:
+            WebDriver instance, or None if none became available in time
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        driver = self._create_driver()
+        if driver is not None:
+            return driver
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            logger.warning("WebDriver pool: timed out waiting for a driver")
+            return None
+
+    def release(self, driver):
+        """
+        Return a driver to the pool after resetting it.
+
+        Args:
+            driver: WebDriver previously obtained from acquire()
+        """
+        if driver is None:
+            return
+
+        if self._closed:
+            self._evict(driver)
+            return
+
+        try:
+            driver.get('about:blank')
+            # Probe the session so zombie drivers are not handed out again
+            driver.current_url
+        except WebDriverException as e:
+            logger.warning(f"WebDriver pool: evicting unresponsive driver: {e}")
+            self._evict(driver)
+            return
+
+        self._idle.put(driver)
+
+    def _evict(self, driver):
+        """Quit a driver and free its slot in the pool"""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"WebDriver pool: error quitting evicted driver: {e}")
+        with self._lock:
+            self._created -= 1
+
+    def close(self):
+        """Quit all idle drivers and stop handing out new ones"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._evict(driver)
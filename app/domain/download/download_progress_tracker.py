@@ -1,42 +1,157 @@
 import os
 import time
+import heapq
+import queue
+import select
 import logging
 import threading
 from app.utils import ThumbnailGenerator
 
 logger = logging.getLogger(__name__)
 
+# How long a cached output file size stays valid (seconds)
+FILE_SIZE_CACHE_TTL = 0.5
+
+# Upper bound on concurrent ffmpeg thumbnail extractions
+MAX_THUMBNAIL_WORKERS = 2
+
 
 class DownloadProgressTracker:
-    """Tracks download progress, status, and thumbnails"""
+    """
+    Tracks download progress, status, and thumbnails
+
+    download_queue is copy-on-write: writers rebuild the dict (and the
+    affected entry) under the lock and swap it in, so readers only load
+    the current snapshot and never block.
+    """
+
+    _AUDIO_FORMATS = frozenset({'mp3', 'aac', 'm4a', 'flac', 'wav', 'ogg', 'opus', 'wma'})
 
     def __init__(self):
         self.download_queue = {}
         self.direct_download_status = {}
         self.download_thumbnails = {}
+        self._file_sizes = {}  # browser_id -> (monotonic timestamp, size)
         self._lock = threading.Lock()
 
+        # Delayed cleanups: heap of (monotonic deadline, browser_id) served by one worker
+        self._cleanup_heap = []
+        self._cleanup_cv = threading.Condition()
+        self._cleanup_thread = None
+
+        # Thumbnail extraction requests, coalesced per browser_id
+        self._thumbnail_request_queue = queue.Queue()
+        self._pending_thumbnail_ids = set()
+        self._thumbnail_lock = threading.Lock()
+        self._thumbnail_workers = []
+
+        # Process exit notifications (Linux pidfd + epoll); browser_id ->
+        # (process, exit code or None while running), guarded by _lock. The
+        # process is kept so a download re-added under the same id is not
+        # marked finished by the old process. Downloads missing here fall
+        # back to process.poll()
+        self._exit_codes = {}
+        self._exit_watch = {}  # pidfd -> (browser_id, process)
+        self._exit_lock = threading.Lock()
+        self._exit_epoll = None
+
+    def _replace_entry(self, browser_id, entry):
+        """Swap in a new queue snapshot with browser_id set to entry (call with lock held)"""
+        new_queue = dict(self.download_queue)
+        new_queue[browser_id] = entry
+        self.download_queue = new_queue
+
     def add_download(self, browser_id, process, output_path, stream_url, resolution_display, metadata, thumbnail=None):
         """Add a new download to tracking"""
+        filename = os.path.basename(output_path)
+        ext = os.path.splitext(output_path)[1].lower().lstrip('.')
+        resolution = metadata.get('resolution', 'Unknown')
+        framerate = metadata.get('framerate', 'Unknown')
+        codecs = metadata.get('codecs', 'Unknown')
+
         with self._lock:
-            self.download_queue[browser_id] = {
+            self._replace_entry(browser_id, {
                 'process': process,
                 'output_path': output_path,
                 'stream_url': stream_url,
                 'started_at': time.time(),
                 'resolution_name': resolution_display,
-                'resolution': metadata.get('resolution', 'Unknown'),
-                'framerate': metadata.get('framerate', 'Unknown'),
-                'codecs': metadata.get('codecs', 'Unknown'),
-                'filename': os.path.basename(output_path),
-                'latest_thumbnail': thumbnail
-            }
+                'resolution': resolution,
+                'framerate': framerate,
+                'codecs': codecs,
+                'filename': filename,
+                'ext': ext,
+                'latest_thumbnail': thumbnail,
+                # Fields of the get_all_downloads entry that never change after start
+                '_static': {
+                    'browser_id': browser_id,
+                    'filename': filename,
+                    'resolution': resolution_display,
+                    'resolution_detail': resolution,
+                    'framerate': framerate,
+                    'codecs': codecs
+                }
+            })
+
+        if process:
+            self._watch_process_exit(browser_id, process)
+
+    def _watch_process_exit(self, browser_id, process):
+        """
+        Get notified when a download process exits instead of polling it.
+
+        Uses a pidfd registered with a single epoll watcher thread. On platforms
+        without pidfd_open/epoll the download is left to the process.poll()
+        fallback in get_all_downloads.
+        """
+        if not hasattr(os, 'pidfd_open') or not hasattr(select, 'epoll'):
+            return
+
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError as e:
+            logger.debug(f"pidfd_open failed for {browser_id}, falling back to polling: {e}")
+            return
+
+        # Recorded before registering, so the watcher always finds the entry
+        with self._lock:
+            self._exit_codes[browser_id] = (process, None)
+
+        with self._exit_lock:
+            if self._exit_epoll is None:
+                self._exit_epoll = select.epoll()
+                threading.Thread(target=self._exit_watcher, daemon=True).start()
+            self._exit_watch[pidfd] = (browser_id, process)
+            self._exit_epoll.register(pidfd, select.EPOLLIN)
+
+    def _exit_watcher(self):
+        """Background thread that records download process exit codes as they happen"""
+        while True:
+            try:
+                events = self._exit_epoll.poll()
+            except InterruptedError:
+                continue
+
+            for pidfd, _ in events:
+                with self._exit_lock:
+                    browser_id, process = self._exit_watch.pop(pidfd)
+                    self._exit_epoll.unregister(pidfd)
+                os.close(pidfd)
+
+                # The process has already exited, so wait() only reaps it
+                returncode = process.wait()
+                with self._lock:
+                    # Skip if removed, or re-added with a different process
+                    record = self._exit_codes.get(browser_id)
+                    if record is not None and record[0] is process:
+                        self._exit_codes[browser_id] = (process, returncode)
 
     def update_thumbnail(self, browser_id, thumbnail):
         """Update the thumbnail for a download"""
         with self._lock:
-            if browser_id in self.download_queue:
-                self.download_queue[browser_id]['latest_thumbnail'] = thumbnail
+            entry = self.download_queue.get(browser_id)
+            if entry is not None:
+                self._replace_entry(browser_id, dict(entry, latest_thumbnail=thumbnail))
                 self.download_thumbnails[browser_id] = {
                     'thumbnail': thumbnail,
                     'timestamp': time.time()
@@ -45,51 +160,77 @@ class DownloadProgressTracker:
     def mark_completed(self, browser_id, success=True):
         """Mark a download as completed"""
         with self._lock:
-            if browser_id in self.download_queue:
-                self.download_queue[browser_id]['completed_at'] = time.time()
-                self.download_queue[browser_id]['success'] = success
+            entry = self.download_queue.get(browser_id)
+            if entry is not None:
+                self._replace_entry(browser_id, dict(entry, completed_at=time.time(), success=success))
 
     def remove_download(self, browser_id):
         """Remove a download from tracking"""
         with self._lock:
-            if browser_id in self.download_queue:
-                del self.download_queue[browser_id]
-            if browser_id in self.download_thumbnails:
-                del self.download_thumbnails[browser_id]
+            self._remove_entry(browser_id)
+
+    def _remove_entry(self, browser_id):
+        """Swap in a new queue snapshot without browser_id (call with lock held)"""
+        if browser_id in self.download_queue:
+            new_queue = dict(self.download_queue)
+            del new_queue[browser_id]
+            self.download_queue = new_queue
+        if browser_id in self.download_thumbnails:
+            del self.download_thumbnails[browser_id]
+        self._file_sizes.pop(browser_id, None)
+        self._exit_codes.pop(browser_id, None)
+
+    def _get_file_size(self, browser_id, output_path):
+        """Return output file size with one stat call, cached for FILE_SIZE_CACHE_TTL"""
+        now = time.monotonic()
+        cached = self._file_sizes.get(browser_id)
+        if cached and now - cached[0] < FILE_SIZE_CACHE_TTL:
+            return cached[1]
+
+        try:
+            file_size = os.stat(output_path).st_size
+        except (FileNotFoundError, TypeError):
+            file_size = 0
+
+        self._file_sizes[browser_id] = (now, file_size)
+        return file_size
 
     def get_download_info(self, browser_id):
-        """Get download info for a specific browser_id (thread-safe read)"""
-        with self._lock:
-            return self.download_queue.get(browser_id)
+        """Get download info for a specific browser_id (lock-free snapshot read)"""
+        return self.download_queue.get(browser_id)
 
     def get_download_status(self, browser_id):
         """Get download status for a specific browser_id"""
-        with self._lock:
-            if browser_id in self.download_queue:
-                download_info = self.download_queue[browser_id]
-                # Calculate duration
-                if 'completed_at' in download_info:
-                    duration = download_info['completed_at'] - download_info['started_at']
-                else:
-                    duration = time.time() - download_info['started_at']
-
-                return {
-                    'output_path': download_info['output_path'],
-                    'stream_url': download_info['stream_url'],
-                    'duration': duration,
-                    'completed': 'completed_at' in download_info,
-                    'success': download_info.get('success', True)
-                }
+        download_info = self.download_queue.get(browser_id)
+        if download_info is None:
             return None
 
+        # Calculate duration
+        completed_at = download_info.get('completed_at')
+        duration = (completed_at or time.time()) - download_info['started_at']
+
+        return {
+            'output_path': download_info['output_path'],
+            'stream_url': download_info['stream_url'],
+            'duration': duration,
+            'completed': completed_at is not None,
+            'success': download_info.get('success', True)
+        }
+
     def get_all_downloads(self):
         """Get list of all downloads with progress"""
-        active = []
+        return list(self.iter_all_downloads())
 
-        with self._lock:
-            queue_items = list(self.download_queue.items())
+    def iter_all_downloads(self):
+        """
+        Yield progress dicts for all active downloads.
 
-        for browser_id, download_info in queue_items:
+        Iterates a single queue snapshot, so callers can stream entries
+        (e.g. to an incremental JSON encoder) without an intermediate list.
+        """
+        now = time.time()
+
+        for browser_id, download_info in self.download_queue.items():
             # Skip completed downloads
             if 'completed_at' in download_info:
                 continue
@@ -99,49 +240,39 @@ class DownloadProgressTracker:
             started_at = download_info.get('started_at')
 
             # Check file size
-            file_size = 0
-            if os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
+            file_size = self._get_file_size(browser_id, output_path)
 
             # Calculate duration
-            duration = int(time.time() - started_at)
+            duration = int(now - started_at)
 
-            # Check if process is still running
-            is_running = process.poll() is None if process else False
+            # Check if process is still running (exit watcher result, else poll)
+            record = self._exit_codes.get(browser_id)
+            if record is not None and record[0] is process:
+                is_running = record[1] is None
+            else:
+                is_running = process.poll() is None if process else False
 
             # Use cached thumbnail managed by background thread
             thumbnail = download_info.get('latest_thumbnail')
 
-            active.append({
-                'browser_id': browser_id,
-                'filename': download_info.get('filename', 'Unknown'),
-                'resolution': download_info.get('resolution_name', 'Unknown'),
-                'resolution_detail': download_info.get('resolution', 'Unknown'),
-                'framerate': download_info.get('framerate', 'Unknown'),
-                'codecs': download_info.get('codecs', 'Unknown'),
+            yield {
+                **download_info['_static'],
                 'size': file_size,
                 'duration': duration,
                 'is_running': is_running,
                 'thumbnail': thumbnail
-            })
-
-        return active
+            }
 
     def has_download(self, browser_id):
         """Check if a download exists"""
-        with self._lock:
-            return browser_id in self.download_queue
+        return browser_id in self.download_queue
 
     def is_audio_format(self, browser_id):
         """Check if the download is an audio format"""
-        with self._lock:
-            if browser_id in self.download_queue:
-                file_path = self.download_queue[browser_id].get('output_path')
-                if file_path:
-                    ext = os.path.splitext(file_path)[1].lower().lstrip('.')
-                    audio_formats = ['mp3', 'aac', 'm4a', 'flac', 'wav', 'ogg', 'opus', 'wma']
-                    return ext in audio_formats
-            return False
+        download_info = self.download_queue.get(browser_id)
+        if download_info is not None:
+            return download_info['ext'] in self._AUDIO_FORMATS
+        return False
 
     def add_direct_download_status(self, browser_id, thumbnail, stream_metadata):
         """Add direct download status"""
@@ -169,20 +300,80 @@ class DownloadProgressTracker:
 
     def schedule_cleanup(self, browser_id, delay=30):
         """Schedule cleanup of completed download after delay"""
-        def cleanup_after_delay():
-            time.sleep(delay)
+        with self._cleanup_cv:
+            heapq.heappush(self._cleanup_heap, (time.monotonic() + delay, browser_id))
+            if self._cleanup_thread is None:
+                self._cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
+                self._cleanup_thread.start()
+            self._cleanup_cv.notify()
+
+    def _cleanup_worker(self):
+        """Single background thread that runs scheduled cleanups as their deadlines pass"""
+        while True:
+            with self._cleanup_cv:
+                while True:
+                    if not self._cleanup_heap:
+                        self._cleanup_cv.wait()
+                        continue
+                    deadline, browser_id = self._cleanup_heap[0]
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        heapq.heappop(self._cleanup_heap)
+                        break
+                    self._cleanup_cv.wait(timeout=remaining)
+
             with self._lock:
                 if browser_id in self.download_queue and 'completed_at' in self.download_queue[browser_id]:
                     logger.debug(f"Cleaning up completed download from queue: {browser_id}")
-                    del self.download_queue[browser_id]
-                    # Also clean up thumbnail cache
-                    if browser_id in self.download_thumbnails:
-                        del self.download_thumbnails[browser_id]
-
-        threading.Thread(target=cleanup_after_delay, daemon=True).start()
+                    # Also cleans up thumbnail cache
+                    self._remove_entry(browser_id)
 
     def update_thumbnail_from_file(self, browser_id):
-        """Update thumbnail by extracting from the download file"""
+        """
+        Request a fresh thumbnail extracted from the download file.
+
+        Extraction runs on a small pool of worker threads; repeated requests
+        for a download that is already queued are coalesced. Returns the most
+        recent cached thumbnail without waiting for ffmpeg.
+        """
+        download_info = self.get_download_info(browser_id)
+        if not download_info:
+            return None
+
+        with self._thumbnail_lock:
+            if browser_id not in self._pending_thumbnail_ids:
+                self._pending_thumbnail_ids.add(browser_id)
+                self._start_thumbnail_workers()
+                self._thumbnail_request_queue.put(browser_id)
+
+        return download_info.get('latest_thumbnail')
+
+    def _start_thumbnail_workers(self):
+        """Start the thumbnail extraction workers on first use (call with _thumbnail_lock held)"""
+        if self._thumbnail_workers:
+            return
+        worker_count = min(MAX_THUMBNAIL_WORKERS, os.cpu_count() or 1)
+        for _ in range(worker_count):
+            worker = threading.Thread(target=self._thumbnail_worker, daemon=True)
+            worker.start()
+            self._thumbnail_workers.append(worker)
+
+    def _thumbnail_worker(self):
+        """Background thread that extracts queued thumbnails one at a time"""
+        while True:
+            browser_id = self._thumbnail_request_queue.get()
+            # Clear pending before extracting so a request arriving mid-extraction is queued again
+            with self._thumbnail_lock:
+                self._pending_thumbnail_ids.discard(browser_id)
+            try:
+                self._extract_thumbnail(browser_id)
+            except Exception as e:
+                logger.error(f"Thumbnail worker error for {browser_id}: {e}")
+            finally:
+                self._thumbnail_request_queue.task_done()
+
+    def _extract_thumbnail(self, browser_id):
+        """Extract a thumbnail from the download file and store it"""
         download_info = self.get_download_info(browser_id)
         if not download_info:
             return None
@@ -1,5 +1,6 @@
 """Scheduling domain components."""
-from .time_calculator import TimeCalculator, DailyTimeCalculator, RegularTimeCalculator
+from .schedule import Schedule
+from .time_calculator import ScheduleState, TimeCalculator, DailyTimeCalculator, RegularTimeCalculator
 from .schedule_executor import ScheduleExecutor
 
-__all__ = ['TimeCalculator', 'DailyTimeCalculator', 'RegularTimeCalculator', 'ScheduleExecutor']
+__all__ = ['Schedule', 'ScheduleState', 'TimeCalculator', 'DailyTimeCalculator', 'RegularTimeCalculator', 'ScheduleExecutor']
@@ -0,0 +1,61 @@
+"""Schedule model used by the scheduling domain components."""
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(slots=True)
+class Schedule:
+    """
+    A scheduled stream check.
+
+    Times are kept as strings exactly as persisted: ISO datetimes for
+    regular schedules, HH:MM for daily ones. Their parsed values live next
+    to them in `parsed` (field -> (raw string, parsed value)) and are
+    never serialized. Keys without a dedicated field are kept in `extra`
+    so a dict survives a from_dict/to_dict round trip unchanged.
+    """
+
+    id: str
+    url: str
+    start_time: str
+    end_time: str
+    name: Optional[str] = None
+    status: str = 'pending'
+    daily: bool = False
+    repeat: bool = False
+    next_check: Optional[str] = None
+    last_check: Optional[str] = None
+    resolution: str = '1080p'
+    framerate: str = 'any'
+    format: str = 'mp4'
+    extra: Dict[str, Any] = field(default_factory=dict)
+    parsed: Dict[str, Tuple[Any, Any]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Schedule from its persisted dict form.
+
+        Args:
+            data (dict): Schedule dictionary (e.g. loaded from schedules.json)
+
+        Returns:
+            Schedule: The schedule object
+        """
+        known = {k: v for k, v in data.items() if k in _FIELD_NAMES}
+        extra = {k: v for k, v in data.items() if k not in _FIELD_NAMES}
+        return cls(**known, extra=extra)
+
+    def to_dict(self):
+        """
+        Return the persisted dict form of this schedule.
+
+        Returns:
+            dict: Schedule dictionary including any extra keys
+        """
+        data = {name: getattr(self, name) for name in _FIELD_NAMES}
+        data.update(self.extra)
+        return data
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(Schedule) if f.name not in ('extra', 'parsed'))
@@ -1,12 +1,23 @@
 """Schedule execution loop component for managing scheduled stream checks."""
 import time
+import heapq
+import itertools
 import logging
 import random
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from .time_calculator import ScheduleState, daily_window, parsed_datetime, remember_datetime
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of browser checks running at the same time
+MAX_CONCURRENT_CHECKS = 8
+
+# Seconds a queued save waits so that saves requested close together are written once
+SAVE_COALESCE_DELAY = 0.05
+
 
 class ScheduleExecutor:
     """
@@ -34,19 +45,59 @@ class ScheduleExecutor:
         self.regular_calculator = regular_calculator
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()
+        self._check_pool = None
+        self._save_executor = None
+        self._save_pending = threading.Event()
+        self._save_guard = threading.Lock()
+
+        # Schedule index, rebuilt by index_schedules() whenever the list changes
+        self._indexed_list = None
+        self._indexed_len = 0
+        self._daily = []
+        self._regular = []
+        self._by_id = {}
+        # Ids of schedules whose stored times cannot be parsed; never visited
+        self._invalid = set()
+        # Heap of (due datetime, tie-breaker, schedule id) of schedules to visit
+        self._due_heap = []
+        self._heap_seq = itertools.count()
+        # Due time at the top of the heap; idle ticks before it return immediately
+        self._earliest_due = datetime.min
+
+        # What the loop thread executes, set by configure()
+        self._schedules = None
+        self._browser_service = None
+        self._lock = None
+        self._save_callback = None
+
+    def configure(self, schedules, browser_service, lock, save_callback):
+        """
+        Set the schedules the executor thread checks on every tick.
+
+        Args:
+            schedules (list): List of Schedule objects to check
+            browser_service: Service for starting/managing browser instances
+            lock (threading.Lock): Lock for thread-safe schedule access
+            save_callback (callable): Function to call to persist schedule changes
+        """
+        self._schedules = schedules
+        self._browser_service = browser_service
+        self._lock = lock
+        self._save_callback = save_callback
 
     def start(self):
         """
         Start the executor thread.
 
         Launches a daemon thread that runs the execution loop. The thread
-        checks schedules every 30 seconds (via 1-second increments for
-        responsive shutdown).
+        wakes every 30 seconds, or immediately when stop() is called.
         """
         if self.running:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         logger.info("Schedule executor started")
@@ -59,88 +110,290 @@ class ScheduleExecutor:
         for the thread to terminate gracefully.
         """
         self.running = False
+        self._stop_event.set()
+        if self._check_pool:
+            self._check_pool.shutdown(wait=False)
+            self._check_pool = None
+        if self._save_executor:
+            # Let a queued save reach disk
+            self._save_executor.shutdown(wait=True)
+            self._save_executor = None
         if self.thread:
             self.thread.join(timeout=2)
             logger.info("Schedule executor stopped")
 
+    def _submit_check(self, *args):
+        """
+        Run a browser check task on the bounded check pool.
+
+        Args:
+            *args: Arguments for _run_browser_check_task
+        """
+        if self._check_pool is None:
+            self._check_pool = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_CHECKS,
+                thread_name_prefix='sched-check'
+            )
+        self._check_pool.submit(self._run_browser_check_task, *args)
+
+    def _schedule_save(self, lock, save_callback):
+        """
+        Queue a save on the single writer thread, coalescing with a queued one.
+
+        Args:
+            lock (threading.Lock): Lock held while the save runs
+            save_callback (callable): Function that persists schedule changes
+        """
+        with self._save_guard:
+            if self._save_pending.is_set():
+                return
+            self._save_pending.set()
+            if self._save_executor is None:
+                self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sched-save')
+            self._save_executor.submit(self._flush_save, lock, save_callback)
+
+    def _flush_save(self, lock, save_callback):
+        """
+        Write the queued save (runs on the writer thread).
+
+        Args:
+            lock (threading.Lock): Lock held while the save runs
+            save_callback (callable): Function that persists schedule changes
+        """
+        time.sleep(SAVE_COALESCE_DELAY)
+        # Clear first so changes made while saving queue another save
+        self._save_pending.clear()
+        try:
+            with lock:
+                save_callback()
+        except Exception as e:
+            logger.error(f"Error saving schedules: {e}")
+
     def _run_loop(self):
         """
         Main execution loop (runs in dedicated thread).
 
-        Continuously checks schedules every 30 seconds. Uses 1-second
-        sleep increments to allow responsive shutdown when stop() is called.
+        Runs execute_schedules on the configured schedules, then waits on the
+        stop event for 30 seconds so stop() wakes it immediately. Until
+        configure() has been called the loop only waits.
         """
         logger.info("Schedule executor loop running")
         while self.running:
-            try:
-                # Note: execute_schedules is called by external code
-                # This loop just ensures the thread stays alive
-                # The actual checking happens when execute_schedules is called
-                pass
-            except Exception as e:
-                logger.error(f"Schedule executor loop error: {e}")
+            if self._schedules is not None:
+                try:
+                    self.execute_schedules(
+                        self._schedules, self._browser_service, self._lock, self._save_callback
+                    )
+                except Exception as e:
+                    logger.error(f"Error in schedule executor loop: {e}")
 
-            # Sleep for 30 seconds total, but check every 1 second for shutdown
-            for _ in range(30):
-                if not self.running:
-                    break
-                time.sleep(1)
+            if self._stop_event.wait(timeout=30):
+                break
 
     def execute_schedules(self, schedules, browser_service, lock, save_callback):
         """
         Check all schedules and execute browser checks if needed.
 
         This is the main iteration of the execution loop. It:
-        1. Iterates through all schedules
+        1. Snapshots the due schedules from the due-time heap under the lock
         2. Determines if each schedule should be executed (using time calculators)
         3. Triggers browser checks for active schedules
         4. Handles weekly rescheduling for expired repeating schedules
-        5. Saves schedule state changes
+        5. Queues a save of schedule state changes on the writer thread
+
+        Idle ticks (nothing due before the earliest queued time) return
+        without taking the lock or saving.
 
         Args:
-            schedules (list): List of schedule dictionaries to check
+            schedules (list): List of Schedule objects to check
             browser_service: Service for starting/managing browser instances
             lock (threading.Lock): Lock for thread-safe schedule access
             save_callback (callable): Function to call to persist schedule changes
         """
         now = datetime.now()
 
+        # Nothing is due yet and the list is unchanged: skip the whole pass
+        if (now < self._earliest_due and schedules is self._indexed_list
+                and len(schedules) == self._indexed_len):
+            return
+
+        # Hold the lock only to take the due snapshot, not for the whole pass
         with lock:
-            for schedule in schedules:
-                if schedule['status'] == 'completed' and not schedule.get('daily'):
-                    # Skip completed non-daily schedules
-                    continue
+            if schedules is not self._indexed_list or len(schedules) != self._indexed_len:
+                self.index_schedules(schedules)
+
+            heap = self._due_heap
+            due_entries = []
+            while heap and heap[0][0] <= now:
+                _, _, schedule_id = heapq.heappop(heap)
+                entry = self._by_id.get(schedule_id)
+                if entry is not None:
+                    due_entries.append(entry)
+
+            if not due_entries:
+                # Nothing changed, so there is nothing to save
+                self._earliest_due = heap[0][0] if heap else datetime.max
+                return
 
-                try:
-                    if schedule.get('daily'):
-                        # Daily schedule - handle time-based windows
-                        should_execute = self.daily_calculator.check_schedule(schedule, now)
-                        if should_execute:
-                            self._perform_check(schedule, browser_service, lock, save_callback)
-                    else:
-                        # Regular schedule - handle datetime-based windows
-                        start_dt = datetime.fromisoformat(schedule['start_time'])
-                        end_dt = datetime.fromisoformat(schedule['end_time'])
-
-                        # Check if window passed
-                        if now > end_dt:
-                            if schedule['repeat']:
-                                # Move to next week
-                                self.reschedule_weekly(schedule)
-                            else:
-                                if schedule['status'] != 'download_started':
-                                    schedule['status'] = 'completed'
-                            continue
-
-                        # Use calculator to check regular schedule
-                        should_execute = self.regular_calculator.check_schedule(schedule, now)
-                        if should_execute:
-                            self._perform_check(schedule, browser_service, lock, save_callback)
+        # Schedules were validated when indexed, so there is no per-item handler;
+        # if one still fails it is set aside and the rest retry on the next tick
+        requeue = []
+        position = 0
+        try:
+            for position, (schedule, is_daily) in enumerate(due_entries):
+                # Short critical section per schedule for its status/next_check mutations
+                with lock:
+                    due = self._visit_schedule(schedule, is_daily, now, browser_service, lock, save_callback)
+                if due is not None:
+                    requeue.append((due, schedule.id))
+        except Exception as e:
+            failed = due_entries[position][0]
+            logger.error(f"Error processing schedule {failed.id}: {e}")
+            self._invalid.add(failed.id)
+            requeue.extend((now, entry[0].id) for entry in due_entries[position + 1:])
 
-                except Exception as e:
-                    logger.error(f"Error processing schedule {schedule['id']}: {e}")
+        with lock:
+            # Re-queue after draining so a schedule due again now waits for the next tick
+            for due, schedule_id in requeue:
+                self._push_due(due, schedule_id)
+            self._earliest_due = self._due_heap[0][0] if self._due_heap else datetime.max
+
+        self._schedule_save(lock, save_callback)
+
+    def _visit_schedule(self, schedule, is_daily, now, browser_service, lock, save_callback):
+        """
+        Check one due schedule and trigger its browser check if needed.
+
+        Must be called with the schedules lock held.
+
+        Args:
+            schedule (Schedule): The due schedule
+            is_daily (bool): Whether it is a daily schedule
+            now (datetime): Current datetime of the tick
+            browser_service: Service for starting/managing browser instances
+            lock (threading.Lock): Lock for thread-safe schedule access
+            save_callback (callable): Function to call to persist schedule changes
+
+        Returns:
+            datetime or None: When the schedule is next due (see _next_due)
+        """
+        calculator = self.daily_calculator if is_daily else self.regular_calculator
+        state = calculator.check_schedule(schedule, now)
+
+        if state is ScheduleState.EXECUTE:
+            self._perform_check(schedule, browser_service, lock, save_callback, now)
+        elif state is ScheduleState.EXPIRED:
+            # Regular window passed (daily windows reset themselves)
+            if schedule.repeat:
+                # Move to next week
+                self.reschedule_weekly(schedule, now)
+            elif schedule.status != 'download_started':
+                schedule.status = 'completed'
+
+        return self._next_due(schedule, is_daily, now)
+
+    def index_schedules(self, schedules):
+        """
+        Partition schedules by type and mark every live schedule as due.
 
-            save_callback()
+        Called automatically when execute_schedules sees a different list
+        object or length; owners that edit schedules in place (type, window
+        or status changes) should call it after the mutation.
+
+        Args:
+            schedules (list): List of Schedule objects
+        """
+        self._indexed_list = schedules
+        self._indexed_len = len(schedules)
+        self._invalid = {s.id for s in schedules if not self._validate_schedule(s)}
+        valid = [s for s in schedules if s.id not in self._invalid]
+        self._daily = [s for s in valid if s.daily]
+        self._regular = [s for s in valid if not s.daily]
+        self._by_id = {s.id: (s, True) for s in self._daily}
+        self._by_id.update((s.id, (s, False)) for s in self._regular)
+
+        self._due_heap = []
+        for schedule in self._daily:
+            self._push_due(datetime.min, schedule.id)
+        for schedule in self._regular:
+            # Completed non-daily schedules never need another visit
+            if schedule.status != 'completed':
+                self._push_due(datetime.min, schedule.id)
+        # An empty or all-completed list leaves nothing to visit until re-indexed
+        self._earliest_due = datetime.min if self._due_heap else datetime.max
+
+    def _validate_schedule(self, schedule):
+        """
+        Parse a schedule's stored times once, warming the parse caches.
+
+        Args:
+            schedule (Schedule): The schedule to validate
+
+        Returns:
+            bool: True if all of its times parse, False otherwise
+        """
+        try:
+            if schedule.daily:
+                daily_window(schedule)
+            else:
+                parsed_datetime(schedule, 'start_time')
+                parsed_datetime(schedule, 'end_time')
+            if schedule.next_check:
+                parsed_datetime(schedule, 'next_check')
+            return True
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping schedule {schedule.id} with invalid times: {e}")
+            return False
+
+    def _push_due(self, due, schedule_id):
+        """
+        Queue a schedule to be visited once `due` has passed.
+
+        Args:
+            due (datetime): When the schedule next needs attention
+            schedule_id: Id of the schedule
+        """
+        heapq.heappush(self._due_heap, (due, next(self._heap_seq), schedule_id))
+
+    def _next_due(self, schedule, is_daily, now):
+        """
+        Work out when a just-visited schedule next needs attention.
+
+        A schedule only changes state at its window start, its next_check and
+        its window end, so it is not visited in between. Visiting early is
+        harmless; anything that changes in between re-indexes the schedules.
+
+        Args:
+            schedule (Schedule): The schedule just visited
+            is_daily (bool): Whether it is a daily schedule
+            now (datetime): Current datetime
+
+        Returns:
+            datetime or None: Next due time, or None if it never needs a visit
+        """
+        calculator = self.daily_calculator if is_daily else self.regular_calculator
+        start_dt, end_dt = calculator.window_bounds(schedule, now)
+
+        if now < start_dt:
+            return start_dt
+
+        if now <= end_dt:
+            # Active window: visit at the next check, and at the latest when it ends
+            if schedule.status == 'download_started' or not schedule.next_check:
+                due = end_dt if schedule.status == 'download_started' else now
+            else:
+                due = min(parsed_datetime(schedule, 'next_check'), end_dt)
+            return due
+
+        if not is_daily:
+            # One-time window is over (completed, or downloaded and finished);
+            # a weekly one was just moved ahead, so look again
+            return now if schedule.repeat else None
+
+        # Daily window passed: the reset scheduled the next window start
+        if schedule.next_check:
+            return parsed_datetime(schedule, 'next_check')
+        return now
 
     def check_schedule(self, schedule, browser_service):
         """
@@ -149,7 +402,7 @@ class ScheduleExecutor:
         This method:
         1. Logs the check
         2. Determines a random check duration (20-60 seconds)
-        3. Spawns a separate thread to run the browser check
+        3. Submits the browser check to the bounded check pool
         4. Returns immediately (non-blocking)
 
         The browser check thread handles:
@@ -160,150 +413,141 @@ class ScheduleExecutor:
         - Closing the browser
 
         Args:
-            schedule (dict): The schedule to check
+            schedule (Schedule): The schedule to check
             browser_service: Service for managing browser instances
         """
-        logger.info(f"Performing scheduled check for {schedule['name']} ({schedule['url']})")
+        logger.info(f"Performing scheduled check for {schedule.name} ({schedule.url})")
 
         # Determine duration (20-60s)
         duration = random.uniform(20, 60)
 
-        # Thread logic for the check so we don't block main scheduler loop
-        check_thread = threading.Thread(
-            target=self._run_browser_check_task,
-            args=(schedule, browser_service, duration)
-        )
-        check_thread.start()
+        # Run the check on the pool so we don't block main scheduler loop
+        self._submit_check(schedule, browser_service, duration)
 
-    def reschedule_weekly(self, schedule):
+    def reschedule_weekly(self, schedule, now=None):
         """
-        Reschedule a regular schedule for next week.
+        Reschedule a regular schedule for its next week that has not ended.
 
         This method:
         1. Parses the current start/end times
-        2. Adds 7 days to both times
+        2. Adds whole weeks to both times until the window ends after now
+           (a schedule several weeks stale catches up in one call)
         3. Updates the schedule with new times
         4. Resets status to 'pending'
         5. Recalculates next_check time
 
         Args:
-            schedule (dict): The schedule to reschedule
+            schedule (Schedule): The schedule to reschedule
+            now (datetime, optional): Current datetime; read from the clock if omitted
         """
-        start_dt = datetime.fromisoformat(schedule['start_time'])
-        end_dt = datetime.fromisoformat(schedule['end_time'])
+        if now is None:
+            now = datetime.now()
 
-        new_start = start_dt + timedelta(days=7)
-        new_end = end_dt + timedelta(days=7)
+        start_dt = parsed_datetime(schedule, 'start_time')
+        end_dt = parsed_datetime(schedule, 'end_time')
 
-        schedule['start_time'] = new_start.isoformat()
-        schedule['end_time'] = new_end.isoformat()
-        schedule['status'] = 'pending'
+        week = timedelta(days=7)
+        weeks = 1
+        while now > end_dt + weeks * week:
+            weeks += 1
+
+        new_start = start_dt + weeks * week
+        new_end = end_dt + weeks * week
+
+        remember_datetime(schedule, 'start_time', new_start)
+        remember_datetime(schedule, 'end_time', new_end)
+        schedule.status = 'pending'
 
         # Update next_check to the new window start
-        self._update_next_check(schedule)
+        self._update_next_check(schedule, now)
 
-        logger.info(f"Rescheduled {schedule['id']} to next week: {new_start}")
+        logger.info(f"Rescheduled {schedule.id} to next week: {new_start}")
 
-    def _perform_check(self, schedule, browser_service, lock, save_callback):
+    def _perform_check(self, schedule, browser_service, lock, save_callback, now=None):
         """
         Perform the actual browser check (internal helper).
 
         Args:
-            schedule (dict): The schedule to check
+            schedule (Schedule): The schedule to check
             browser_service: Service for managing browser instances
             lock (threading.Lock): Lock for thread-safe schedule access
             save_callback (callable): Function to call to persist schedule changes
+            now (datetime, optional): Current datetime of the scheduler tick
         """
-        logger.info(f"Performing scheduled check for {schedule['name']} ({schedule['url']})")
+        logger.info(f"Performing scheduled check for {schedule.name} ({schedule.url})")
 
         # Determine duration (20-60s)
         duration = random.uniform(20, 60)
 
-        # Thread logic for the check so we don't block main scheduler loop for a minute
-        check_thread = threading.Thread(
-            target=self._run_browser_check_task,
-            args=(schedule, browser_service, duration, lock, save_callback)
-        )
-        check_thread.start()
+        # Run the check on the pool so we don't block main scheduler loop for a minute
+        self._submit_check(schedule, browser_service, duration, lock, save_callback)
 
         # Update next check time immediately so we don't spawn multiple
-        self._update_next_check(schedule)
+        self._update_next_check(schedule, now)
 
     def _run_browser_check_task(self, schedule, browser_service, duration, lock=None, save_callback=None):
         """
-        Run the browser check in a separate thread.
+        Run the browser check on a check pool worker thread.
 
         This method:
         1. Generates a unique browser ID
         2. Starts the browser with auto_download enabled
         3. Waits for the specified duration or until download starts
-        4. Polls the download service every second to detect download start
-        5. Updates schedule status to 'download_started' when detected
+        4. Waits on a start Event set by the download service (no polling)
+        5. Updates schedule status to 'download_started' when signalled
         6. Closes the browser when done
 
         Args:
-            schedule (dict): The schedule being checked
+            schedule (Schedule): The schedule being checked
             browser_service: Service for managing browser instances
             duration (float): Maximum duration in seconds to keep browser open
             lock (threading.Lock, optional): Lock for thread-safe schedule access
             save_callback (callable, optional): Function to call to persist schedule changes
         """
-        browser_id = f"sched_{schedule['id']}_{int(time.time())}"
+        browser_id = f"sched_{schedule.id}_{int(time.time())}"
+        download_service = browser_service.download_service
+
+        # Register before launching so a fast download start is not missed
+        download_event = download_service.register_start_event(browser_id)
 
         try:
             # Queue browser (will wait for previous browsers to close)
-            logger.info(f"Requesting browser for schedule {schedule['id']} (will queue if needed)")
+            logger.info(f"Requesting browser for schedule {schedule.id} (will queue if needed)")
             success, detector = browser_service.start_browser(
-                url=schedule['url'],
+                url=schedule.url,
                 browser_id=browser_id,
                 auto_download=True,  # Important!
                 filename=None,  # Auto name
-                resolution=schedule.get('resolution', '1080p'),
-                framerate=schedule.get('framerate', 'any'),
-                output_format=schedule.get('format', 'mp4')
+                resolution=schedule.resolution,
+                framerate=schedule.framerate,
+                output_format=schedule.format
             )
 
             if not success:
-                logger.warning(f"Failed to start browser for schedule {schedule['id']}")
+                logger.warning(f"Failed to start browser for schedule {schedule.id}")
                 return
 
             # Wait for random duration or until download starts
-            start_wait = time.time()
-            while time.time() - start_wait < duration:
-                # Check status
-                status = browser_service.get_browser_status(browser_id)
-                if not status:
-                    break
-
-                # Check if download started
-                # The browser_service.start_browser sets callback to download_service.start_download
-                # We can check if download was triggered by querying download_service
-                dl_status = browser_service.download_service.get_download_status(browser_id)
-                if dl_status:
-                    logger.info(f"Download started for schedule {schedule['id']}!")
-
-                    if lock and save_callback:
-                        with lock:
-                            # Find the schedule in the list and update it
-                            # (We need to update the actual dict in the list, not our local reference)
-                            # The schedule dict should be the same object reference, so this update
-                            # should reflect in the main list
-                            schedule['status'] = 'download_started'
-                            # Clear next_check - no more checks needed until next window
-                            schedule['next_check'] = None
-                            save_callback()
-                    else:
-                        # Fallback if no lock/save_callback provided
-                        schedule['status'] = 'download_started'
-                        schedule['next_check'] = None
-
-                    # Download started, we're done
-                    break
-
-                time.sleep(1)
+            # (the browser's download callback is download_service.start_download,
+            # which sets the event once the download is queued)
+            if download_event.wait(timeout=duration):
+                logger.info(f"Download started for schedule {schedule.id}!")
+
+                if lock and save_callback:
+                    with lock:
+                        # The schedule is the same object reference held in the
+                        # main list, so this update is reflected there
+                        schedule.status = 'download_started'
+                        # Clear next_check - no more checks needed until next window
+                        schedule.next_check = None
+                    self._schedule_save(lock, save_callback)
+                else:
+                    # Fallback if no lock/save_callback provided
+                    schedule.status = 'download_started'
+                    schedule.next_check = None
 
             # Cleanup
-            logger.info(f"Closing browser for schedule {schedule['id']}")
+            logger.info(f"Closing browser for schedule {schedule.id}")
             browser_service.close_browser(browser_id)
 
         except Exception as e:
@@ -312,8 +556,10 @@ class ScheduleExecutor:
                 browser_service.close_browser(browser_id)
             except:
                 pass
+        finally:
+            download_service.unregister_start_event(browser_id)
 
-    def _update_next_check(self, schedule):
+    def _update_next_check(self, schedule, now=None):
         """
         Calculate next check time based on schedule window.
 
@@ -321,11 +567,13 @@ class ScheduleExecutor:
         (daily vs regular).
 
         Args:
-            schedule (dict): The schedule to update
+            schedule (Schedule): The schedule to update
+            now (datetime, optional): Current datetime; read from the clock if omitted
         """
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
 
-        if schedule.get('daily'):
+        if schedule.daily:
             self.daily_calculator.calculate_next_check(schedule, now)
         else:
             self.regular_calculator.calculate_next_check(schedule, now)
@@ -1,11 +1,123 @@
 """Time calculation strategies for different schedule types."""
+import itertools
 import logging
 import random
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from enum import Enum
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Precomputed 5-8 minute check intervals, handed out round-robin
+_JITTER_RING_SIZE = 1024
+_JITTER_RING = tuple(timedelta(minutes=random.uniform(5, 8)) for _ in range(_JITTER_RING_SIZE))
+_JITTER_IDX = itertools.cycle(range(_JITTER_RING_SIZE))
+
+
+def parsed_datetime(schedule, field):
+    """
+    Return datetime.fromisoformat(getattr(schedule, field)), parsing each distinct value once.
+
+    Args:
+        schedule (Schedule): The schedule
+        field (str): ISO datetime field name (e.g. 'start_time', 'next_check')
+
+    Returns:
+        datetime: The parsed value
+    """
+    raw = getattr(schedule, field)
+    cached = schedule.parsed.get(field)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+    dt = datetime.fromisoformat(raw)
+    schedule.parsed[field] = (raw, dt)
+    return dt
+
+
+def remember_datetime(schedule, field, dt):
+    """
+    Store dt as schedule.<field> (ISO string) and seed the parse cache with it.
+
+    Args:
+        schedule (Schedule): The schedule to update
+        field (str): ISO datetime field name
+        dt (datetime): Value to store
+    """
+    raw = dt.isoformat()
+    setattr(schedule, field, raw)
+    schedule.parsed[field] = (raw, dt)
+
+
+def daily_window(schedule):
+    """
+    Return the parsed HH:MM window of a daily schedule, parsing each distinct value once.
+
+    Args:
+        schedule (Schedule): Daily schedule with 'start_time'/'end_time' in HH:MM format
+
+    Returns:
+        tuple: (start_hour, start_min, end_hour, end_min, spans_midnight)
+    """
+    raw = (schedule.start_time, schedule.end_time)
+    cached = schedule.parsed.get('daily_window')
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+
+    start_hour, start_min = map(int, raw[0].split(':'))
+    end_hour, end_min = map(int, raw[1].split(':'))
+    # Detect if this is a midnight-spanning window (e.g., 23:00 - 01:00)
+    spans_midnight = end_hour < start_hour or (end_hour == start_hour and end_min < start_min)
+
+    window = (start_hour, start_min, end_hour, end_min, spans_midnight)
+    schedule.parsed['daily_window'] = (raw, window)
+    return window
+
+
+@lru_cache(maxsize=512)
+def _daily_window_bounds(start_hour, start_min, end_hour, end_min, spans_midnight, day_ordinal, before_start):
+    """
+    Build the concrete (start_dt, end_dt) of a daily window for one day.
+
+    Cached on the branch inputs only, so each schedule computes its window
+    once per day (twice for midnight-spanning windows).
+
+    Args:
+        start_hour, start_min, end_hour, end_min (int): Parsed HH:MM window
+        spans_midnight (bool): Whether the window ends on the following day
+        day_ordinal (int): date.toordinal() of the current day
+        before_start (bool): Whether the current time is before today's start time
+
+    Returns:
+        tuple: (start_dt, end_dt)
+    """
+    today = date.fromordinal(day_ordinal)
+
+    # Create datetime objects for today's window
+    start_dt = datetime(today.year, today.month, today.day, start_hour, start_min)
+    end_dt = datetime(today.year, today.month, today.day, end_hour, end_min)
+
+    if spans_midnight:
+        # For midnight-spanning windows, we need to check if we're in yesterday's window
+        # that extends into today, OR in today's window that extends into tomorrow
+        if before_start:
+            # We're in the early morning hours - check if yesterday's window extends to now
+            start_dt = start_dt - timedelta(days=1)
+        else:
+            # We're after start time today - window extends into tomorrow
+            end_dt = end_dt + timedelta(days=1)
+
+    return start_dt, end_dt
+
+
+class ScheduleState(Enum):
+    """Outcome of checking a schedule against the current time."""
+
+    EXECUTE = 'execute'          # in window and a browser check is due
+    ACTIVE_WAIT = 'active_wait'  # in window, waiting for next_check (or already downloaded)
+    PENDING = 'pending'          # window not started yet (or daily window reset)
+    EXPIRED = 'expired'          # one-time/weekly window has passed
+
 
 class TimeCalculator(ABC):
     """Abstract base class for time calculation strategies."""
@@ -16,11 +128,11 @@ class TimeCalculator(ABC):
         Check if a schedule should be executed and update its status.
 
         Args:
-            schedule (dict): The schedule dictionary to check
+            schedule (Schedule): The schedule to check
             now (datetime): Current datetime
 
         Returns:
-            bool: True if schedule should be executed, False otherwise
+            ScheduleState: EXECUTE if the schedule should be executed now
         """
         pass
 
@@ -30,8 +142,22 @@ class TimeCalculator(ABC):
         Calculate and set the next check time for a schedule.
 
         Args:
-            schedule (dict): The schedule dictionary to update
+            schedule (Schedule): The schedule to update
+            now (datetime): Current datetime
+        """
+        pass
+
+    @abstractmethod
+    def window_bounds(self, schedule, now):
+        """
+        Return the concrete window that applies to a schedule at `now`.
+
+        Args:
+            schedule (Schedule): The schedule
             now (datetime): Current datetime
+
+        Returns:
+            tuple: (start_dt, end_dt)
         """
         pass
 
@@ -44,6 +170,41 @@ class DailyTimeCalculator(TimeCalculator):
     including complex midnight-spanning windows (e.g., 23:00 - 01:00).
     """
 
+    def _compute_daily_window(self, schedule, now):
+        """
+        Resolve the daily window that applies at `now`.
+
+        Args:
+            schedule (Schedule): Daily schedule with HH:MM 'start_time'/'end_time'
+            now (datetime): Current datetime
+
+        Returns:
+            tuple: (start_dt, end_dt, spans_midnight, before_start)
+        """
+        # Parse the time strings (format: "HH:MM")
+        start_hour, start_min, end_hour, end_min, spans_midnight = daily_window(schedule)
+        before_start = (now.hour, now.minute) < (start_hour, start_min)
+
+        start_dt, end_dt = _daily_window_bounds(
+            start_hour, start_min, end_hour, end_min, spans_midnight,
+            now.toordinal(), before_start
+        )
+        return start_dt, end_dt, spans_midnight, before_start
+
+    def window_bounds(self, schedule, now):
+        """
+        Return today's (or the current midnight-spanning) window of a daily schedule.
+
+        Args:
+            schedule (Schedule): Daily schedule with HH:MM 'start_time'/'end_time'
+            now (datetime): Current datetime
+
+        Returns:
+            tuple: (start_dt, end_dt)
+        """
+        start_dt, end_dt, _, _ = self._compute_daily_window(schedule, now)
+        return start_dt, end_dt
+
     def check_schedule(self, schedule, now):
         """
         Check a daily schedule (time-based, repeats every day).
@@ -54,81 +215,49 @@ class DailyTimeCalculator(TimeCalculator):
         - Status transitions (pending -> active -> download_started)
 
         Args:
-            schedule (dict): The schedule dictionary to check
+            schedule (Schedule): The schedule to check
             now (datetime): Current datetime
 
         Returns:
-            bool: True if schedule should be executed, False otherwise
+            ScheduleState: EXECUTE if the schedule should be executed now
         """
-        # Parse the time strings (format: "HH:MM")
-        start_time_str = schedule['start_time']
-        end_time_str = schedule['end_time']
-
-        # Get today's date
-        today = now.date()
-
-        # Create datetime objects for today's window
-        start_hour, start_min = map(int, start_time_str.split(':'))
-        end_hour, end_min = map(int, end_time_str.split(':'))
-
-        start_dt = datetime.combine(today, datetime.min.time().replace(hour=start_hour, minute=start_min))
-        end_dt = datetime.combine(today, datetime.min.time().replace(hour=end_hour, minute=end_min))
-
-        # Detect if this is a midnight-spanning window (e.g., 23:00 - 01:00)
-        spans_midnight = end_hour < start_hour or (end_hour == start_hour and end_min < start_min)
-
-        if spans_midnight:
-            # For midnight-spanning windows, we need to check if we're in yesterday's window
-            # that extends into today, OR in today's window that extends into tomorrow
-
-            # Check if we're in yesterday's window (before today's start time)
-            if now.time() < datetime.min.time().replace(hour=start_hour, minute=start_min):
-                # We're in the early morning hours - check if yesterday's window extends to now
-                yesterday = today - timedelta(days=1)
-                start_dt = datetime.combine(yesterday, datetime.min.time().replace(hour=start_hour, minute=start_min))
-                end_dt = datetime.combine(today, datetime.min.time().replace(hour=end_hour, minute=end_min))
-            else:
-                # We're after start time today - window extends into tomorrow
-                end_dt = end_dt + timedelta(days=1)
-        else:
-            # Normal same-day window
-            pass
+        start_dt, end_dt, _, _ = self._compute_daily_window(schedule, now)
 
         # Check if we're currently in the active window
         if start_dt <= now <= end_dt:
-            if schedule['status'] == 'download_started':
+            if schedule.status == 'download_started':
                 # Already downloaded for this window
-                return False
+                return ScheduleState.ACTIVE_WAIT
 
             # Check if transitioning from pending to active (first time in window)
-            was_pending = schedule['status'] == 'pending'
-            schedule['status'] = 'active'
+            was_pending = schedule.status == 'pending'
+            schedule.status = 'active'
 
             # Check if it's time to check stream
-            next_check = schedule.get('next_check')
-            if was_pending or not next_check or now >= datetime.fromisoformat(next_check):
+            next_check = schedule.next_check
+            if was_pending or not next_check or now >= parsed_datetime(schedule, 'next_check'):
                 # It's time! (immediately on window start, or when next_check time arrives)
-                return True
+                return ScheduleState.EXECUTE
 
-            return False
+            return ScheduleState.ACTIVE_WAIT
 
         elif now < start_dt:
             # Window hasn't started yet
-            schedule['status'] = 'pending'
+            schedule.status = 'pending'
             # Ensure next_check is set correctly (at window start)
-            next_check = schedule.get('next_check')
-            if not next_check or datetime.fromisoformat(next_check) != start_dt:
+            next_check = schedule.next_check
+            if not next_check or parsed_datetime(schedule, 'next_check') != start_dt:
                 self.calculate_next_check(schedule, now)
-            return False
+            return ScheduleState.PENDING
 
         else:
             # Window has passed - always reset to pending for next day
-            if schedule['status'] in ['active', 'download_started']:
+            if schedule.status in ['active', 'download_started']:
                 # Reset for next day
-                schedule['status'] = 'pending'
-                schedule['last_check'] = None
+                schedule.status = 'pending'
+                schedule.last_check = None
                 self.calculate_next_check(schedule, now)
-            return False
+            return ScheduleState.PENDING
 
     def calculate_next_check(self, schedule, now):
         """
@@ -141,61 +270,35 @@ class DailyTimeCalculator(TimeCalculator):
         - Midnight-spanning window edge cases
 
         Args:
-            schedule (dict): The schedule dictionary to update
+            schedule (Schedule): The schedule to update
             now (datetime): Current datetime
         """
         # Daily schedule - calculate based on time
-        start_time_str = schedule['start_time']
-        end_time_str = schedule['end_time']
-
-        today = now.date()
-        start_hour, start_min = map(int, start_time_str.split(':'))
-        end_hour, end_min = map(int, end_time_str.split(':'))
-
-        start_dt = datetime.combine(today, datetime.min.time().replace(hour=start_hour, minute=start_min))
-        end_dt = datetime.combine(today, datetime.min.time().replace(hour=end_hour, minute=end_min))
-
-        # Detect if this is a midnight-spanning window (e.g., 23:00 - 01:00)
-        spans_midnight = end_hour < start_hour or (end_hour == start_hour and end_min < start_min)
-
-        if spans_midnight:
-            # For midnight-spanning windows, determine which window we're checking
-            if now.time() < datetime.min.time().replace(hour=start_hour, minute=start_min):
-                # We're in the early morning hours - check if yesterday's window extends to now
-                yesterday = today - timedelta(days=1)
-                start_dt = datetime.combine(yesterday, datetime.min.time().replace(hour=start_hour, minute=start_min))
-                end_dt = datetime.combine(today, datetime.min.time().replace(hour=end_hour, minute=end_min))
-            else:
-                # We're after start time today - window extends into tomorrow
-                end_dt = end_dt + timedelta(days=1)
+        start_dt, end_dt, spans_midnight, before_start = self._compute_daily_window(schedule, now)
 
         # If window hasn't started yet, schedule check for start of window
         if now < start_dt:
-            schedule['next_check'] = start_dt.isoformat()
-            logger.debug(f"Schedule {schedule['id']}: next check set to window start: {start_dt}")
+            remember_datetime(schedule, 'next_check', start_dt)
+            logger.debug("Schedule %s: next check set to window start: %s", schedule.id, start_dt)
         # If we're in the window, schedule random check in 5-8 minutes
         elif start_dt <= now <= end_dt:
-            minutes = random.uniform(5, 8)
-            next_dt = now + timedelta(minutes=minutes)
+            jitter = _JITTER_RING[next(_JITTER_IDX)]
+            next_dt = now + jitter
             # Make sure we don't schedule past the end of the window
             if next_dt > end_dt:
                 next_dt = end_dt
-            schedule['next_check'] = next_dt.isoformat()
-            logger.debug(f"Schedule {schedule['id']}: next check in {minutes:.1f} mins: {next_dt}")
+            remember_datetime(schedule, 'next_check', next_dt)
+            logger.debug("Schedule %s: next check in %.1f mins: %s",
+                         schedule.id, jitter.total_seconds() / 60, next_dt)
         # If window has passed, schedule for next occurrence
         else:
-            # For midnight-spanning, if we're past end time but before start time,
-            # the next window is today (later). Otherwise it's tomorrow.
-            if spans_midnight and now.time() < datetime.min.time().replace(hour=start_hour, minute=start_min):
-                # We're past yesterday's window end, next window is today
-                next_start = datetime.combine(today, datetime.min.time().replace(hour=start_hour, minute=start_min))
-            else:
-                # Next window is tomorrow
-                tomorrow = today + timedelta(days=1)
-                next_start = datetime.combine(tomorrow, datetime.min.time().replace(hour=start_hour, minute=start_min))
+            # The next window starts one day after the window just resolved:
+            # for midnight-spanning windows before today's start that is today
+            # (start_dt was yesterday), otherwise it's tomorrow.
+            next_start = start_dt + timedelta(days=1)
 
-            schedule['next_check'] = next_start.isoformat()
-            logger.debug(f"Schedule {schedule['id']}: next check set to next window start: {next_start}")
+            remember_datetime(schedule, 'next_check', next_start)
+            logger.debug("Schedule %s: next check set to next window start: %s", schedule.id, next_start)
 
 
 class RegularTimeCalculator(TimeCalculator):
@@ -206,6 +309,19 @@ class RegularTimeCalculator(TimeCalculator):
     or repeat weekly.
     """
 
+    def window_bounds(self, schedule, now):
+        """
+        Return the parsed window of a regular schedule.
+
+        Args:
+            schedule (Schedule): Schedule with ISO 'start_time'/'end_time'
+            now (datetime): Current datetime (unused, windows are absolute)
+
+        Returns:
+            tuple: (start_dt, end_dt)
+        """
+        return parsed_datetime(schedule, 'start_time'), parsed_datetime(schedule, 'end_time')
+
     def check_schedule(self, schedule, now):
         """
         Check a regular schedule (datetime-based).
@@ -216,49 +332,46 @@ class RegularTimeCalculator(TimeCalculator):
         - Status transitions (pending -> active -> completed/download_started)
 
         Args:
-            schedule (dict): The schedule dictionary to check
+            schedule (Schedule): The schedule to check
             now (datetime): Current datetime
 
         Returns:
-            bool: True if schedule should be executed, False otherwise
+            ScheduleState: EXECUTE if the schedule should be executed now
         """
         # Regular schedule - handle datetime-based windows
-        start_dt = datetime.fromisoformat(schedule['start_time'])
-        end_dt = datetime.fromisoformat(schedule['end_time'])
+        start_dt = parsed_datetime(schedule, 'start_time')
+        end_dt = parsed_datetime(schedule, 'end_time')
 
         # Check if window passed
         if now > end_dt:
             # Window has passed - handled by scheduler (reschedule or complete)
-            # We don't execute in this state
-            return False
+            return ScheduleState.EXPIRED
 
         # Check if currently active window
-        if start_dt <= now <= end_dt:
-            if schedule['status'] == 'download_started':
+        if start_dt <= now:
+            if schedule.status == 'download_started':
                 # Already downloaded for this window
-                return False
+                return ScheduleState.ACTIVE_WAIT
 
             # Check if transitioning from pending to active (first time in window)
-            was_pending = schedule['status'] == 'pending'
-            schedule['status'] = 'active'
+            was_pending = schedule.status == 'pending'
+            schedule.status = 'active'
 
             # Check if it's time to check stream
-            next_check = schedule.get('next_check')
-            if was_pending or not next_check or now >= datetime.fromisoformat(next_check):
+            next_check = schedule.next_check
+            if was_pending or not next_check or now >= parsed_datetime(schedule, 'next_check'):
                 # It's time! (immediately on window start, or when next_check time arrives)
-                return True
+                return ScheduleState.EXECUTE
 
-            return False
-
-        elif now < start_dt:
-            schedule['status'] = 'pending'
-            # Ensure next_check is set correctly (at window start)
-            next_check = schedule.get('next_check')
-            if not next_check or datetime.fromisoformat(next_check) != start_dt:
-                self.calculate_next_check(schedule, now)
-            return False
+            return ScheduleState.ACTIVE_WAIT
 
-        return False
+        # Window hasn't started yet
+        schedule.status = 'pending'
+        # Ensure next_check is set correctly (at window start)
+        next_check = schedule.next_check
+        if not next_check or parsed_datetime(schedule, 'next_check') != start_dt:
+            self.calculate_next_check(schedule, now)
+        return ScheduleState.PENDING
 
     def calculate_next_check(self, schedule, now):
         """
@@ -270,27 +383,28 @@ class RegularTimeCalculator(TimeCalculator):
         - Clearing next_check for passed windows
 
         Args:
-            schedule (dict): The schedule dictionary to update
+            schedule (Schedule): The schedule to update
             now (datetime): Current datetime
         """
         # Regular schedule - calculate based on datetime
-        start_dt = datetime.fromisoformat(schedule['start_time'])
-        end_dt = datetime.fromisoformat(schedule['end_time'])
+        start_dt = parsed_datetime(schedule, 'start_time')
+        end_dt = parsed_datetime(schedule, 'end_time')
 
         # If window hasn't started yet, schedule check for start of window
         if now < start_dt:
-            schedule['next_check'] = start_dt.isoformat()
-            logger.debug(f"Schedule {schedule['id']}: next check set to window start: {start_dt}")
+            remember_datetime(schedule, 'next_check', start_dt)
+            logger.debug("Schedule %s: next check set to window start: %s", schedule.id, start_dt)
         # If we're in the window, schedule random check in 5-8 minutes
         elif start_dt <= now <= end_dt:
-            minutes = random.uniform(5, 8)
-            next_dt = now + timedelta(minutes=minutes)
+            jitter = _JITTER_RING[next(_JITTER_IDX)]
+            next_dt = now + jitter
             # Make sure we don't schedule past the end of the window
             if next_dt > end_dt:
                 next_dt = end_dt
-            schedule['next_check'] = next_dt.isoformat()
-            logger.debug(f"Schedule {schedule['id']}: next check in {minutes:.1f} mins: {next_dt}")
+            remember_datetime(schedule, 'next_check', next_dt)
+            logger.debug("Schedule %s: next check in %.1f mins: %s",
+                         schedule.id, jitter.total_seconds() / 60, next_dt)
         # If window has passed, clear next_check (will be rescheduled)
         else:
-            schedule['next_check'] = None
-            logger.debug(f"Schedule {schedule['id']}: window passed, clearing next_check")
+            schedule.next_check = None
+            logger.debug("Schedule %s: window passed, clearing next_check", schedule.id)
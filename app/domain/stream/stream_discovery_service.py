@@ -6,15 +6,29 @@ including master playlist parsing, stream matching, and coordination with
 download and selection components.
 """
 
+import re
+import time
 import logging
 import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Callable, Any
 
-from app.utils import PlaylistParser, MetadataExtractor, ThumbnailGenerator
+from app.utils import PlaylistParser
 from app.domain.stream import StreamMatcher
+from app.domain.stream.stream_enrichment import ENRICH_POOL, enrich_stream
 
 logger = logging.getLogger(__name__)
 
+# Seconds during which a repeated detection of the same URL is ignored
+DUPLICATE_DETECTION_WINDOW = 2.0
+
+# Maximum number of recently handled URLs remembered for de-duplication
+MAX_RECENT_URLS = 256
+
+# HLS playlist URL: '.m3u8' followed by a URL delimiter (possibly
+# percent-encoded, as in proxied '...x.m3u8%3Ftoken%3D1') or the end of the URL
+_HLS_URL_RE = re.compile(r'\.m3u8(?:[?#;&/%]|$)', re.IGNORECASE)
+
 
 class StreamDiscoveryService:
     """
@@ -54,6 +68,31 @@ class StreamDiscoveryService:
         self.download_callback = download_callback
         self.selection_callback = selection_callback
 
+        # Recently handled stream URLs -> monotonic time they were handled
+        self._recent_urls = OrderedDict()
+        self._recent_lock = threading.Lock()
+
+    def _is_duplicate_detection(self, stream_url: str) -> bool:
+        """
+        Record a detection and report whether the URL was just handled.
+
+        Args:
+            stream_url: The detected stream URL
+
+        Returns:
+            True if the same URL was handled within DUPLICATE_DETECTION_WINDOW
+        """
+        now = time.monotonic()
+        with self._recent_lock:
+            last_seen = self._recent_urls.get(stream_url)
+            if last_seen is not None and now - last_seen < DUPLICATE_DETECTION_WINDOW:
+                return True
+            self._recent_urls[stream_url] = now
+            self._recent_urls.move_to_end(stream_url)
+            if len(self._recent_urls) > MAX_RECENT_URLS:
+                self._recent_urls.popitem(last=False)
+            return False
+
     def handle_detected_stream(self, stream_info: Dict[str, Any]) -> None:
         """
         Handle a detected stream - determine type and process accordingly.
@@ -71,10 +110,15 @@ class StreamDiscoveryService:
         """
         stream_url = stream_info['url']
 
-        if '.m3u8' in stream_url.lower():
-            content = PlaylistParser.fetch_master_playlist(stream_url)
+        # Several tabs or network retries can report the same stream at once
+        if self._is_duplicate_detection(stream_url):
+            logger.debug(f"Ignoring duplicate detection of {stream_url[:100]}")
+            return
+
+        if _HLS_URL_RE.search(stream_url):
+            is_master, content = PlaylistParser.fetch_if_master_playlist(stream_url)
 
-            if content and '#EXT-X-STREAM-INF:' in content:
+            if is_master:
                 self.process_master_playlist(stream_url, content)
             else:
                 self.process_single_stream(stream_url, stream_info)
@@ -149,11 +193,7 @@ class StreamDiscoveryService:
         """
         # Enrich metadata and generate thumbnails in background (first 5 streams)
         for res in resolutions[:5]:
-            threading.Thread(
-                target=self._enrich_and_add_thumbnail,
-                args=(res,),
-                daemon=True
-            ).start()
+            ENRICH_POOL.submit(self._enrich_and_add_thumbnail, res)
 
         # Trigger selection callback
         if self.selection_callback:
@@ -181,11 +221,7 @@ class StreamDiscoveryService:
         }
 
         # Enrich in background
-        threading.Thread(
-            target=self._enrich_and_add_thumbnail,
-            args=(stream_entry,),
-            daemon=True
-        ).start()
+        ENRICH_POOL.submit(self._enrich_and_add_thumbnail, stream_entry)
 
         # Trigger selection callback
         if self.selection_callback:
@@ -196,22 +232,16 @@ class StreamDiscoveryService:
         Enrich stream metadata and add thumbnail.
 
         Attempts to extract additional metadata from the stream and generate
-        a thumbnail preview. Failures are silently ignored to avoid blocking
-        the main stream processing flow.
+        a thumbnail preview, reusing results already computed for the URL.
+        Failures are silently ignored to avoid blocking the main stream
+        processing flow.
 
         Args:
             stream_dict: Stream dictionary to enrich (modified in-place)
         """
         try:
-            # Enrich metadata
-            MetadataExtractor.enrich_stream_metadata(stream_dict)
-
-            # Add thumbnail
-            stream_url = stream_dict.get('url')
-            if stream_url:
-                thumbnail = ThumbnailGenerator.generate_stream_thumbnail(stream_url)
-                if thumbnail:
-                    stream_dict['thumbnail'] = thumbnail
+            # Enrich metadata and add thumbnail
+            enrich_stream(stream_dict)
         except Exception:
             # Silently ignore enrichment failures
             pass
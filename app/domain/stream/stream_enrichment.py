@@ -0,0 +1,152 @@
+"""
+Shared stream enrichment with per-URL result caching.
+
+Both StreamDiscoveryService and StreamSelectionCoordinator enrich the same
+stream URLs (background enrichment, then again on selection). ffprobe and
+ffmpeg results are cached per URL, and concurrent requests for a URL that
+is already being probed wait for that run instead of starting another
+subprocess.
+"""
+
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.utils import MetadataExtractor, ThumbnailGenerator
+
+logger = logging.getLogger(__name__)
+
+# Number of stream URLs whose metadata/thumbnail results are kept
+ENRICH_CACHE_SIZE = 128
+
+_METADATA_FIELDS = ('resolution', 'framerate', 'codecs')
+
+# Maximum number of streams enriched (ffprobe + thumbnail) at the same time,
+# across discovery and selection
+MAX_ENRICH_WORKERS = 4
+
+# Shared by StreamDiscoveryService and StreamSelectionCoordinator so the
+# bound holds for the process, not per module
+ENRICH_POOL = ThreadPoolExecutor(max_workers=MAX_ENRICH_WORKERS, thread_name_prefix='stream-enrich')
+atexit.register(ENRICH_POOL.shutdown, wait=False)
+
+
+class _UrlResultCache:
+    """Bounded LRU cache of loader(url) results with in-flight de-duplication."""
+
+    def __init__(self, loader: Callable[[str], Any], maxsize: int = ENRICH_CACHE_SIZE):
+        self._loader = loader
+        self._maxsize = maxsize
+        self._results = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Any:
+        """
+        Return loader(url), computing it at most once at a time per URL.
+
+        Failed loads (None or an exception) are not cached, so a later
+        request retries.
+
+        Args:
+            url: Stream URL
+
+        Returns:
+            The loader's result
+        """
+        with self._lock:
+            if url in self._results:
+                self._results.move_to_end(url)
+                return self._results[url]
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = self._inflight[url] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._loader(url)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(url, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(url, None)
+            if value is not None:
+                self._results[url] = value
+                if len(self._results) > self._maxsize:
+                    self._results.popitem(last=False)
+        future.set_result(value)
+        return value
+
+
+_metadata_results = _UrlResultCache(MetadataExtractor.extract_stream_metadata_with_ffprobe)
+_thumbnail_results = _UrlResultCache(ThumbnailGenerator.generate_stream_thumbnail)
+
+
+def cached_stream_metadata(stream_url: str) -> Optional[Dict[str, str]]:
+    """
+    Return ffprobe metadata (resolution, framerate, codecs) for a stream URL.
+
+    Args:
+        stream_url: Stream URL
+
+    Returns:
+        Metadata dictionary, or None if ffprobe failed
+    """
+    return _metadata_results.get(stream_url)
+
+
+def cached_stream_thumbnail(stream_url: str) -> Optional[str]:
+    """
+    Return a data-URI thumbnail for a stream URL.
+
+    Args:
+        stream_url: Stream URL
+
+    Returns:
+        Thumbnail data URI, or None if generation failed
+    """
+    return _thumbnail_results.get(stream_url)
+
+
+def enrich_stream(stream_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill missing metadata and add a thumbnail, reusing cached results.
+
+    Only fields the playlist left empty are filled, like
+    MetadataExtractor.enrich_stream_metadata.
+
+    Args:
+        stream_dict: Stream dictionary to enrich (modified in-place)
+
+    Returns:
+        The same stream dictionary
+    """
+    stream_url = stream_dict.get('url')
+    if not stream_url:
+        return stream_dict
+
+    missing = [f for f in _METADATA_FIELDS if not stream_dict.get(f)]
+    if missing:
+        metadata = cached_stream_metadata(stream_url)
+        if metadata:
+            for f in missing:
+                if metadata.get(f):
+                    stream_dict[f] = metadata[f]
+        else:
+            logger.warning(f"Metadata enrichment failed for {stream_dict.get('name', 'unknown')}, "
+                           f"missing: {', '.join(missing)}")
+
+    thumbnail = cached_stream_thumbnail(stream_url)
+    if thumbnail:
+        stream_dict['thumbnail'] = thumbnail
+
+    return stream_dict
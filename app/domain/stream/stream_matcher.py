@@ -1,12 +1,47 @@
 """Stream matching strategy for finding the best stream based on resolution and framerate"""
 
-import re
 import logging
 from typing import List, Dict, Optional, Any
 
 logger = logging.getLogger(__name__)
 
 
+def _digits_before_p(name: str) -> Optional[int]:
+    """
+    Return the number right before the first 'p' that follows digits ('1080p60' -> 1080).
+
+    Equivalent to re.search(r'(\d+)p', name) for the short variant names
+    this is used on, without the regex machinery.
+    """
+    i = name.find('p')
+    while i != -1:
+        j = i
+        while j > 0 and name[j - 1].isdecimal():
+            j -= 1
+        if j < i:
+            return int(name[j:i])
+        i = name.find('p', i + 1)
+    return None
+
+
+def _digits_after_p(name: str) -> Optional[int]:
+    """
+    Return the number right after the first 'p' followed by digits ('1080p60' -> 60).
+
+    Equivalent to re.search(r'p(\d+)', name).
+    """
+    n = len(name)
+    i = name.find('p')
+    while i != -1:
+        j = i + 1
+        while j < n and name[j].isdecimal():
+            j += 1
+        if j > i + 1:
+            return int(name[i + 1:j])
+        i = name.find('p', j)
+    return None
+
+
 class StreamMatcher:
     """
     Strategy pattern implementation for matching video streams based on resolution and framerate.
@@ -25,7 +60,7 @@ class StreamMatcher:
 
         Args:
             target_resolution: Target resolution (e.g., '1080p', '720p', 'source')
-            target_framerate: Target framerate (e.g., 'any', '60', '30')
+            target_framerate: Target framerate (e.g., 'any', '60', '30', '60fps')
         """
         self.target_resolution = target_resolution
         self.target_framerate = target_framerate
@@ -43,75 +78,69 @@ class StreamMatcher:
         if not resolutions:
             return None
 
-        # Sort all streams by quality (Resolution DESC, Framerate DESC)
-        sorted_streams = sorted(
-            resolutions,
-            key=lambda x: (self.get_resolution_height(x), self.get_framerate(x)),
-            reverse=True
-        )
+        get_height = self.get_resolution_height
+        get_fps = self.get_framerate
 
+        # Parse the targets before touching any stream
         target_res_str = self.target_resolution.lower().replace('p', '')
 
-        # 0. Source/Highest Request
+        # 0. Source/Highest Request - a single linear pass, no sort needed
         if target_res_str == 'source':
             logger.info("Match: Source requested, using highest quality.")
-            return sorted_streams[0]
+            return max(resolutions, key=lambda r: (get_height(r), get_fps(r)))
 
         try:
             target_height = int(target_res_str)
         except ValueError:
             target_height = 1080 # Default if parsing fails
 
-        target_fps = None
-        if self.target_framerate in ['60', '30']:
-            target_fps = float(self.target_framerate)
-
-        # 1. Try Perfect Match (Resolution + FPS)
-        if target_fps:
-            perfect_candidates = []
-            for res in sorted_streams:
-                h = self.get_resolution_height(res)
-                f = self.get_framerate(res)
-                # Allow small tolerance
-                if abs(h - target_height) < 10 and abs(f - target_fps) < 5:
-                    perfect_candidates.append(res)
-
-            if perfect_candidates:
-                logger.info(f"Match: Found perfect match {perfect_candidates[0].get('name')}")
-                return perfect_candidates[0]
+        # Accept '60', '60fps', '60Hz' (only 60 and 30 are matched exactly)
+        fps_str = str(self.target_framerate).strip().lower().removesuffix('fps').removesuffix('hz').strip()
+        target_fps = float(fps_str) if fps_str in ('60', '30') else None
+
+        # One pass classifying every stream into the cascade's candidates, each
+        # keeping the best so far. Strict '>' keeps the first of equals, which is
+        # the order a stable quality sort (Resolution DESC, Framerate DESC) gave.
+        best = perfect = res_match = lower = None
+        best_key = perfect_key = res_key = lower_key = None
+        for r in resolutions:
+            h = get_height(r)
+            f = get_fps(r)
+            key = (h, f)
+            if best is None or key > best_key:
+                best, best_key = r, key
 
-        # 2. Try Match Resolution (Any FPS)
-        res_candidates = []
-        for res in sorted_streams:
-            h = self.get_resolution_height(res)
             if abs(h - target_height) < 10:
-                res_candidates.append(res)
-
-        if res_candidates:
-            # Pick highest FPS among matching resolution
-            best_res = sorted(res_candidates, key=lambda x: self.get_framerate(x), reverse=True)[0]
-            logger.info(f"Match: Found resolution match {best_res.get('name')} (FPS mismatch or any)")
-            return best_res
-
-        # 3. Try Next Resolution Down
-        # Find highest resolution that is LOWER than target
-        lower_candidates = []
-        for res in sorted_streams:
-            h = self.get_resolution_height(res)
-            if h < target_height:
-                lower_candidates.append(res)
-
-        if lower_candidates:
-            # Already sorted by quality, so first one is the "highest of the lower"
-            best_lower = lower_candidates[0]
-            logger.info(f"Match: Fallback to lower resolution {best_lower.get('name')}")
-            return best_lower
+                # Allow small tolerance
+                if target_fps and abs(f - target_fps) < 5 and (perfect is None or key > perfect_key):
+                    perfect, perfect_key = r, key
+                # Highest FPS first, then highest resolution
+                if res_match is None or (f, h) > res_key:
+                    res_match, res_key = r, (f, h)
+            elif h < target_height and (lower is None or key > lower_key):
+                lower, lower_key = r, key
+
+        # 1. Perfect Match (Resolution + FPS)
+        if perfect is not None:
+            logger.info(f"Match: Found perfect match {perfect.get('name')}")
+            return perfect
+
+        # 2. Match Resolution (Any FPS), highest FPS among matching resolution
+        if res_match is not None:
+            logger.info(f"Match: Found resolution match {res_match.get('name')} (FPS mismatch or any)")
+            return res_match
+
+        # 3. Next Resolution Down - the highest resolution that is LOWER than target
+        if lower is not None:
+            logger.info(f"Match: Fallback to lower resolution {lower.get('name')}")
+            return lower
 
         # 4. Fallback to Any (Highest Available)
-        logger.info(f"Match: Fallback to highest available {sorted_streams[0].get('name')}")
-        return sorted_streams[0]
+        logger.info(f"Match: Fallback to highest available {best.get('name')}")
+        return best
 
-    def get_resolution_height(self, res: Dict[str, Any]) -> int:
+    @staticmethod
+    def get_resolution_height(res: Dict[str, Any]) -> int:
         """
         Extract numeric height value from stream resolution metadata.
 
@@ -132,19 +161,20 @@ class StreamMatcher:
         # Try to parse from resolution field (e.g., '1920x1080')
         if 'x' in resolution_str:
             try:
-                return int(resolution_str.split('x')[1])
-            except:
+                return int(resolution_str.partition('x')[2])
+            except ValueError:
                 pass
 
         # Try to parse from name field (e.g., '1080p')
-        match = re.search(r'(\d+)p', name)
-        if match:
-            return int(match.group(1))
+        height = _digits_before_p(name)
+        if height is not None:
+            return height
 
         # Fallback to bandwidth-based estimation
         return res.get('bandwidth', 0) // 1000000
 
-    def get_framerate(self, res: Dict[str, Any]) -> float:
+    @staticmethod
+    def get_framerate(res: Dict[str, Any]) -> float:
         """
         Extract numeric framerate value from stream metadata.
 
@@ -163,14 +193,14 @@ class StreamMatcher:
         fr = res.get('framerate', '')
         if fr:
             try:
-                return float(str(fr).split('.')[0])
-            except:
+                return float(int(float(fr)))
+            except (ValueError, TypeError, OverflowError):
                 pass
 
         # Try to parse from name field (e.g., '1080p60')
         name = res.get('name', '').lower()
-        match = re.search(r'p(\d+)', name)
-        if match:
-            return float(match.group(1))
+        fps = _digits_after_p(name)
+        if fps is not None:
+            return float(fps)
 
         return 0.0
@@ -2,11 +2,11 @@
 
 import time
 import logging
-import threading
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Callable
 
-from app.utils import MetadataExtractor, ThumbnailGenerator
+from app.utils import ThumbnailGenerator
+from app.domain.stream.stream_enrichment import ENRICH_POOL, enrich_stream
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,7 @@ class StreamSelectionCoordinator:
         # Selection state
         self.awaiting_resolution_selection = False
         self.available_resolutions = []
+        self._resolution_index = {}
         self.selected_stream_url = None
         self.selected_stream_metadata = None
 
@@ -74,24 +75,24 @@ class StreamSelectionCoordinator:
         1. Sets the selection state to awaiting user input
         2. Stores available resolutions
         3. Enriches metadata and generates thumbnails for the first 5 streams
-           in background threads to improve UI responsiveness
+           on the shared enrichment pool to improve UI responsiveness
 
         Args:
             resolutions: List of stream dictionaries with resolution metadata
         """
         self.awaiting_resolution_selection = True
         self.available_resolutions = resolutions
+        # Name -> stream, keeping the first stream for duplicate names
+        self._resolution_index = {}
+        for res in resolutions:
+            self._resolution_index.setdefault(res.get('name'), res)
 
         logger.info(f"Presenting {len(resolutions)} streams for user selection")
 
         # Enrich metadata and generate thumbnails in background (first 5 streams)
         # This improves perceived performance by not blocking on metadata extraction
         for res in resolutions[:5]:
-            threading.Thread(
-                target=self.enrich_stream_metadata,
-                args=(res,),
-                daemon=True
-            ).start()
+            ENRICH_POOL.submit(self.enrich_stream_metadata, res)
 
     def select_resolution(self, resolution_name: str) -> bool:
         """
@@ -113,11 +114,7 @@ class StreamSelectionCoordinator:
             return False
 
         # Find the selected stream
-        selected_stream = None
-        for res in self.available_resolutions:
-            if res.get('name') == resolution_name:
-                selected_stream = res
-                break
+        selected_stream = self._resolution_index.get(resolution_name)
 
         if not selected_stream:
             logger.error(f"Resolution '{resolution_name}' not found in available streams")
@@ -137,26 +134,23 @@ class StreamSelectionCoordinator:
         Enrich stream metadata and generate thumbnail.
 
         This method:
-        1. Uses MetadataExtractor to fill in missing stream metadata via ffprobe
-        2. Uses ThumbnailGenerator to create a thumbnail from the stream URL
+        1. Fills in missing stream metadata via ffprobe
+        2. Creates a thumbnail from the stream URL
         3. Handles all exceptions gracefully (metadata enrichment is best-effort)
 
+        ffprobe/ffmpeg results are cached per URL, so re-enriching a stream
+        (e.g. on selection after background enrichment) reuses them.
+
         The stream_dict is modified in-place with enriched data.
 
         Args:
             stream_dict: Stream dictionary to enrich (modified in-place)
         """
         try:
-            # Enrich metadata using ffprobe if fields are missing
-            MetadataExtractor.enrich_stream_metadata(stream_dict)
-
-            # Generate thumbnail from stream URL
-            stream_url = stream_dict.get('url')
-            if stream_url:
-                thumbnail = ThumbnailGenerator.generate_stream_thumbnail(stream_url)
-                if thumbnail:
-                    stream_dict['thumbnail'] = thumbnail
-                    logger.debug(f"Added thumbnail to stream: {stream_dict.get('name', 'unknown')}")
+            # Enrich metadata using ffprobe if fields are missing, and add a thumbnail
+            enrich_stream(stream_dict)
+            if 'thumbnail' in stream_dict:
+                logger.debug(f"Added thumbnail to stream: {stream_dict.get('name', 'unknown')}")
         except Exception as e:
             # Metadata enrichment is best-effort, don't fail the entire process
             logger.warning(f"Failed to enrich stream metadata: {e}")
@@ -180,19 +174,21 @@ class StreamSelectionCoordinator:
             logger.warning("Download already started, ignoring duplicate request")
             return
 
+        stream_url = stream['url']
         self.download_started = True
-        self.selected_stream_url = stream['url']
+        self.selected_stream_url = stream_url
         self.selected_stream_metadata = stream
 
         resolution_name = stream.get('name', 'video')
         logger.info(f"Starting download for resolution: {resolution_name}")
 
         # Extract thumbnail data if available
-        if 'thumbnail' in stream:
-            thumbnail = stream['thumbnail']
-            if thumbnail.startswith('data:image/'):
-                # Strip the data URI prefix to get base64 data
-                self.thumbnail_data = thumbnail.split(',', 1)[1]
+        thumbnail = stream.get('thumbnail')
+        if thumbnail is not None:
+            # Strip the data URI prefix to get base64 data (the comma ends the short header)
+            prefix, sep, body = thumbnail.partition(',')
+            if sep and prefix.startswith('data:image/'):
+                self.thumbnail_data = body
             else:
                 self.thumbnail_data = thumbnail
 
@@ -203,7 +199,7 @@ class StreamSelectionCoordinator:
         if self.download_callback:
             self.download_callback(
                 browser_id,
-                stream['url'],
+                stream_url,
                 filename,
                 resolution_name,
                 stream
@@ -230,19 +226,21 @@ class StreamSelectionCoordinator:
             stream_metadata: Optional metadata dictionary
             browser_id: Optional browser identifier
         """
+        md = stream_metadata or {}
+
         # Construct a minimal stream dictionary
         stream = {
             'url': stream_url,
             'name': resolution_name,
-            'bandwidth': stream_metadata.get('bandwidth', 0) if stream_metadata else 0,
-            'resolution': stream_metadata.get('resolution', '') if stream_metadata else '',
-            'framerate': stream_metadata.get('framerate', '') if stream_metadata else '',
-            'codecs': stream_metadata.get('codecs', '') if stream_metadata else ''
+            'bandwidth': md.get('bandwidth', 0),
+            'resolution': md.get('resolution', ''),
+            'framerate': md.get('framerate', ''),
+            'codecs': md.get('codecs', '')
         }
 
         # Copy thumbnail if present
-        if stream_metadata and 'thumbnail' in stream_metadata:
-            stream['thumbnail'] = stream_metadata['thumbnail']
+        if 'thumbnail' in md:
+            stream['thumbnail'] = md['thumbnail']
 
         self.start_download(stream, browser_id)
 
@@ -324,6 +322,7 @@ class StreamSelectionCoordinator:
         """
         self.awaiting_resolution_selection = False
         self.available_resolutions = []
+        self._resolution_index = {}
         self.selected_stream_url = None
         self.selected_stream_metadata = None
         self.thumbnail_data = None
@@ -1,13 +1,37 @@
 """Chrome Configuration Manager - Handles Chrome options and preferences"""
 
 import os
-import json
+import time
 import logging
-import glob
 from selenium.webdriver.chrome.options import Options
 
+from app.infrastructure.network import fast_json
+
 logger = logging.getLogger(__name__)
 
+# Files Chrome leaves behind in the profile after an unclean shutdown
+LOCK_FILE_NAMES = ('SingletonLock', 'lockfile')
+
+# (key, already-reset value) as Chrome writes them in compact Preferences JSON
+_RESET_PREF_MARKERS = (
+    (b'"exit_type":', b'"exit_type":"Normal"'),
+    (b'"exited_cleanly":', b'"exited_cleanly":true'),
+    (b'"restore_on_startup":', b'"restore_on_startup":5'),
+    (b'"startup_urls":', b'"startup_urls":[]'),
+)
+# The subset of those that mark_clean_exit sets
+_CLEAN_EXIT_PREF_MARKERS = _RESET_PREF_MARKERS[:2]
+
+
+def _prefs_already_set(raw, markers):
+    """
+    Check raw Preferences bytes for the given (key, value) markers without parsing
+
+    Each key must occur exactly once so a same-named key elsewhere in the
+    file cannot mask the real one.
+    """
+    return all(raw.count(key) == 1 and marker in raw for key, marker in markers)
+
 
 class ChromeConfigManager:
     """Manages Chrome browser configuration, preferences, and session state"""
@@ -44,6 +68,9 @@ class ChromeConfigManager:
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--disable-software-rasterizer')
 
+        # Window size for consistent rendering (set at launch, no extra WebDriver call)
+        chrome_options.add_argument('--window-size=1920,1080')
+
         # Optimization flags
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('--disable-background-networking')
@@ -66,9 +93,13 @@ class ChromeConfigManager:
         # User data directory for cookie persistence
         chrome_options.add_argument(f'--user-data-dir={self.config.CHROME_USER_DATA_DIR}')
 
-        # Logging
-        chrome_options.add_argument('--enable-logging')
-        chrome_options.add_argument('--v=1')
+        # Logging: verbose Chrome logs are only useful when debugging and
+        # otherwise write a steady stream nobody reads
+        if self.config.CHROME_VERBOSE_LOGGING:
+            chrome_options.add_argument('--enable-logging')
+            chrome_options.add_argument('--v=1')
+        else:
+            chrome_options.add_argument('--disable-logging')
 
         chrome_options.add_experimental_option('w3c', True)
         chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
@@ -90,8 +121,17 @@ class ChromeConfigManager:
             if not os.path.exists(prefs_path):
                 return
 
-            with open(prefs_path, 'r', encoding='utf-8') as f:
-                prefs = json.load(f)
+            # Preferences can be several MB on a used profile; parse the raw
+            # bytes with the fast parser and only write back on change
+            with open(prefs_path, 'rb') as f:
+                raw = f.read()
+
+            # Common case after a clean shutdown: every flag already has its
+            # reset value
+            if _prefs_already_set(raw, _RESET_PREF_MARKERS):
+                return
+
+            prefs = fast_json.loads(raw)
 
             # Reset crash flags and session restore settings
             changed = False
@@ -121,11 +161,59 @@ class ChromeConfigManager:
             if changed:
                 logger.info("Resetting Chrome crash flag and session restore settings in Preferences")
                 with open(prefs_path, 'w', encoding='utf-8') as f:
-                    json.dump(prefs, f)
+                    f.write(fast_json.dumps(prefs))
 
         except Exception as e:
             logger.warning(f"Could not reset Chrome preferences: {e}")
 
+    def mark_clean_exit(self, max_retries=3):
+        """
+        Set the profile exit flags to a clean exit after Chrome has quit
+
+        This keeps the next startup from showing the "Chrome did not shut
+        down correctly" bubble. The file may still be locked right after
+        quit, so writes are retried.
+
+        Args:
+            max_retries: Attempts before giving up on a locked file
+        """
+        try:
+            prefs_path = os.path.join(self.config.CHROME_USER_DATA_DIR, 'Default', 'Preferences')
+            if not os.path.exists(prefs_path):
+                logger.warning(f"Preferences file not found at {prefs_path}")
+                return
+
+            for retry in range(max_retries):
+                try:
+                    with open(prefs_path, 'rb') as f:
+                        raw = f.read()
+
+                    # Chrome normally writes these itself on a clean quit
+                    if _prefs_already_set(raw, _CLEAN_EXIT_PREF_MARKERS):
+                        return
+
+                    prefs = fast_json.loads(raw)
+
+                    # Mark as clean exit for next startup
+                    if 'profile' not in prefs:
+                        prefs['profile'] = {}
+                    prefs['profile']['exit_type'] = 'Normal'
+                    prefs['profile']['exited_cleanly'] = True
+
+                    with open(prefs_path, 'wb') as f:
+                        f.write(fast_json.dumps_bytes(prefs))
+                    logger.debug("Set Chrome exit flags to Normal for next startup")
+                    return
+                except (IOError, OSError):
+                    # File might be locked, wait and retry
+                    if retry < max_retries - 1:
+                        time.sleep(0.3)
+                        continue
+                    raise
+
+        except Exception as e:
+            logger.warning(f"Could not set Chrome exit flags: {e}")
+
     def cleanup_lock_files(self):
         """
         Clean up Chrome lock files that may prevent startup
@@ -134,16 +222,14 @@ class ChromeConfigManager:
         "Chrome instance exited" errors when Chrome didn't shut down cleanly.
         """
         try:
-            lock_files = glob.glob(
-                os.path.join(self.config.CHROME_USER_DATA_DIR, '**/SingletonLock'),
-                recursive=True
-            )
-            lock_files.extend(
-                glob.glob(
-                    os.path.join(self.config.CHROME_USER_DATA_DIR, '**/lockfile'),
-                    recursive=True
-                )
-            )
+            # One walk checking both names per directory; hidden directories
+            # are skipped, as the previous ** glob did
+            lock_files = []
+            for root, dirs, files in os.walk(self.config.CHROME_USER_DATA_DIR):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                for name in LOCK_FILE_NAMES:
+                    if name in files:
+                        lock_files.append(os.path.join(root, name))
 
             for lock_file in lock_files:
                 try:
@@ -7,7 +7,37 @@ based on the output format (audio vs video).
 
 import os
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Tuple
+
+# Codec options per output extension; anything not listed in the video
+# table falls back to a plain stream copy
+_AUDIO_ARGS: Dict[str, Tuple[str, ...]] = {
+    'mp3': ('-c:a', 'libmp3lame', '-q:a', '2'),
+    'aac': ('-c:a', 'aac', '-b:a', '192k'),
+    'm4a': ('-c:a', 'aac', '-b:a', '192k'),
+    'flac': ('-c:a', 'flac'),
+    'wav': ('-c:a', 'pcm_s16le'),
+    'ogg': ('-c:a', 'libvorbis', '-q:a', '6'),
+    'opus': ('-c:a', 'libopus', '-b:a', '128k'),
+    'wma': ('-c:a', 'wmav2', '-b:a', '192k'),
+}
+
+_MP4_ARGS = ('-c', 'copy', '-bsf:a', 'aac_adtstoasc', '-movflags', '+frag_keyframe+empty_moov')
+_DEFAULT_VIDEO_ARGS = ('-c', 'copy')
+_VIDEO_ARGS: Dict[str, Tuple[str, ...]] = {
+    'mp4': _MP4_ARGS,
+    'm4v': _MP4_ARGS,
+    'mov': _MP4_ARGS,
+    # WebM may need re-encoding if source isn't VP8/VP9
+    'webm': ('-c:v', 'copy', '-c:a', 'copy'),
+    'ts': ('-c', 'copy', '-bsf:v', 'h264_mp4toannexb'),
+    'wmv': ('-c:v', 'wmv2', '-c:a', 'wmav2'),
+}
+
+
+def _output_ext(output_path: str) -> str:
+    """Return the lowercased extension of output_path without the dot."""
+    return os.path.splitext(output_path)[1].lower().lstrip('.')
 
 
 class FFmpegStrategy(ABC):
@@ -35,7 +65,7 @@ class AudioStrategy(FFmpegStrategy):
     Supports: mp3, aac, m4a, flac, wav, ogg, opus, wma
     """
 
-    AUDIO_FORMATS = ['mp3', 'aac', 'm4a', 'flac', 'wav', 'ogg', 'opus', 'wma']
+    AUDIO_FORMATS = frozenset(_AUDIO_ARGS)
 
     def build_command(self, stream_url: str, output_path: str) -> List[str]:
         """
@@ -48,40 +78,15 @@ class AudioStrategy(FFmpegStrategy):
         Returns:
             List of FFmpeg command arguments with audio-specific encoding options
         """
-        # Get file extension
-        ext = os.path.splitext(output_path)[1].lower().lstrip('.')
-
-        # Base command for audio extraction
-        cmd = [
+        return [
             'ffmpeg',
             '-loglevel', 'error',  # Only show errors
             '-i', stream_url,
             '-vn',  # No video
+            *_AUDIO_ARGS.get(_output_ext(output_path), ()),
+            '-y', output_path,
         ]
 
-        # Format-specific encoding options
-        if ext == 'mp3':
-            cmd.extend(['-c:a', 'libmp3lame', '-q:a', '2'])
-        elif ext == 'aac':
-            cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
-        elif ext == 'm4a':
-            cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
-        elif ext == 'flac':
-            cmd.extend(['-c:a', 'flac'])
-        elif ext == 'wav':
-            cmd.extend(['-c:a', 'pcm_s16le'])
-        elif ext == 'ogg':
-            cmd.extend(['-c:a', 'libvorbis', '-q:a', '6'])
-        elif ext == 'opus':
-            cmd.extend(['-c:a', 'libopus', '-b:a', '128k'])
-        elif ext == 'wma':
-            cmd.extend(['-c:a', 'wmav2', '-b:a', '192k'])
-
-        # Add output path with overwrite flag
-        cmd.extend(['-y', output_path])
-
-        return cmd
-
 
 class VideoStrategy(FFmpegStrategy):
     """
@@ -102,44 +107,18 @@ class VideoStrategy(FFmpegStrategy):
         Returns:
             List of FFmpeg command arguments with video-specific options
         """
-        # Get file extension
-        ext = os.path.splitext(output_path)[1].lower().lstrip('.')
-
-        # Base command for video
-        cmd = [
+        return [
             'ffmpeg',
             '-loglevel', 'error',  # Only show errors
             '-i', stream_url,
+            *_VIDEO_ARGS.get(_output_ext(output_path), _DEFAULT_VIDEO_ARGS),
+            '-y', output_path,
         ]
 
-        # Format-specific options
-        if ext in ['mp4', 'm4v', 'mov']:
-            cmd.extend([
-                '-c', 'copy',
-                '-bsf:a', 'aac_adtstoasc',
-                '-movflags', '+frag_keyframe+empty_moov',
-            ])
-        elif ext == 'mkv':
-            cmd.extend(['-c', 'copy'])
-        elif ext == 'webm':
-            # WebM may need re-encoding if source isn't VP8/VP9
-            cmd.extend(['-c:v', 'copy', '-c:a', 'copy'])
-        elif ext == 'ts':
-            cmd.extend(['-c', 'copy', '-bsf:v', 'h264_mp4toannexb'])
-        elif ext == 'flv':
-            cmd.extend(['-c', 'copy'])
-        elif ext == 'wmv':
-            cmd.extend(['-c:v', 'wmv2', '-c:a', 'wmav2'])
-        elif ext == 'avi':
-            cmd.extend(['-c', 'copy'])
-        else:
-            # Default: stream copy
-            cmd.extend(['-c', 'copy'])
-
-        # Add output path with overwrite flag
-        cmd.extend(['-y', output_path])
-
-        return cmd
+
+# Both strategies are stateless, so one shared instance of each is enough
+_AUDIO_STRATEGY = AudioStrategy()
+_VIDEO_STRATEGY = VideoStrategy()
 
 
 def get_strategy(output_path: str) -> FFmpegStrategy:
@@ -150,11 +129,8 @@ def get_strategy(output_path: str) -> FFmpegStrategy:
         output_path: The output file path to determine the format
 
     Returns:
-        An instance of AudioStrategy or VideoStrategy based on the file extension
+        The shared AudioStrategy or VideoStrategy instance based on the file extension
     """
-    ext = os.path.splitext(output_path)[1].lower().lstrip('.')
-
-    if ext in AudioStrategy.AUDIO_FORMATS:
-        return AudioStrategy()
-    else:
-        return VideoStrategy()
+    if _output_ext(output_path) in AudioStrategy.AUDIO_FORMATS:
+        return _AUDIO_STRATEGY
+    return _VIDEO_STRATEGY
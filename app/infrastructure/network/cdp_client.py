@@ -1,23 +1,46 @@
 """Chrome DevTools Protocol (CDP) Client - Handles WebSocket communication with Chrome"""
 
-import json
+import itertools
 import logging
+import queue
+import threading
+import urllib.request
 import websocket
-import requests as req_lib
+
+from app.infrastructure.network import fast_json
 
 logger = logging.getLogger(__name__)
 
 
+class _QueuedSender:
+    """WebSocket stand-in whose send() hands frames to the writer thread"""
+
+    __slots__ = ('_put',)
+
+    def __init__(self, send_queue):
+        self._put = send_queue.put
+
+    def send(self, frame):
+        self._put(frame)
+
+
 class CDPClient:
     """Manages Chrome DevTools Protocol WebSocket connection and event handling"""
 
+    __slots__ = ('ws', 'ws_url', '_next_id', 'network_event_handler', 'fetch_event_handler',
+                 'connection_handler', 'is_connected', '_page_loaded')
+
     def __init__(self):
         """Initialize the CDP client"""
         self.ws = None
         self.ws_url = None
-        self.session_id = 1
+        # Command IDs; count.__next__ is atomic, so any thread may send
+        self._next_id = itertools.count(1).__next__
         self.network_event_handler = None
         self.fetch_event_handler = None
+        self.connection_handler = None
+        self.is_connected = False
+        self._page_loaded = threading.Event()
 
     def setup_connection(self, driver):
         """
@@ -39,34 +62,48 @@ class CDPClient:
                 # Query the debugger to get WebSocket URL
                 debugger_url = f"http://{debugger_address}/json"
                 try:
-                    response = req_lib.get(debugger_url, timeout=5)
-                    if response.status_code == 200:
-                        pages = response.json()
-                        if pages and len(pages) > 0:
-                            self.ws_url = pages[0].get('webSocketDebuggerUrl')
-                            logger.info(f"CDP WebSocket URL obtained")
-                            return True
+                    # Plain urllib: one localhost request does not need a requests session
+                    with urllib.request.urlopen(debugger_url, timeout=5) as response:
+                        pages = fast_json.loads(response.read())
+                    if pages and len(pages) > 0:
+                        self.ws_url = pages[0].get('webSocketDebuggerUrl')
+                        logger.info(f"CDP WebSocket URL obtained")
+                        return True
                 except Exception as e:
                     logger.warning(f"Failed to get WebSocket URL: {e}")
 
-            # Enable Network domain via execute_cdp_cmd as fallback
-            driver.execute_cdp_cmd('Network.enable', {})
+            # Enable Network domain via the chromedriver CDP endpoint as fallback
+            # (works for both Chrome and Remote drivers, unlike execute_cdp_cmd)
+            driver.execute('executeCdpCommand', {'cmd': 'Network.enable', 'params': {}})
             return False
 
         except Exception as e:
             logger.warning(f"Could not set up CDP: {e}")
             return False
 
-    def set_event_handlers(self, network_handler=None, fetch_handler=None):
+    def set_event_handlers(self, network_handler=None, fetch_handler=None, connection_handler=None):
         """
         Set callback handlers for CDP events
 
         Args:
             network_handler: Callable(method, params, ws) for Network.* events
             fetch_handler: Callable(params, ws) for Fetch.requestPaused events
+            connection_handler: Callable(connected) called with True when the
+                WebSocket opens and False when it closes (e.g.
+                NetworkEventHandler.set_cdp_active)
         """
         self.network_event_handler = network_handler
         self.fetch_event_handler = fetch_handler
+        self.connection_handler = connection_handler
+
+    def _set_connected(self, connected):
+        """Record the connection state and tell the connection handler"""
+        self.is_connected = connected
+        if self.connection_handler:
+            try:
+                self.connection_handler(connected)
+            except Exception as e:
+                logger.error(f"CDP connection handler error: {e}")
 
     def start_listener(self):
         """
@@ -79,24 +116,63 @@ class CDPClient:
             logger.warning("No WebSocket URL available, cannot start listener")
             return
 
+        # Outgoing frames go through a queue drained by a writer thread, so
+        # the receive loop never blocks on a send (e.g. one
+        # Fetch.continueRequest per paused request)
+        send_queue = queue.SimpleQueue()
+        sender = _QueuedSender(send_queue)
+
+        def write_frames(ws):
+            while True:
+                frame = send_queue.get()
+                if frame is None:
+                    return
+                try:
+                    ws.send(frame)
+                except Exception as e:
+                    logger.debug(f"CDP send failed, stopping writer: {e}")
+                    return
+
+        def route_fetch(params, ws):
+            if self.fetch_event_handler:
+                self.fetch_event_handler(params, sender)
+
+        def route_page_load(params, ws):
+            # Signal page load waiters
+            self._page_loaded.set()
+
+        # Exact-method routes; Network.* events are matched by prefix.
+        # Page.loadEventFired is main-document only; frameStoppedLoading would
+        # also fire for every subframe
+        routes = {
+            'Fetch.requestPaused': route_fetch,
+            'Page.loadEventFired': route_page_load,
+        }
+
         def on_message(ws, message):
             """Handle incoming CDP messages"""
+            # Chrome sends compact JSON; skip command responses and events nobody
+            # handles without building a dict for them
+            if ('"method":"Network.' not in message
+                    and '"method":"Fetch.requestPaused"' not in message
+                    and '"method":"Page.' not in message):
+                return
+
             try:
-                data = json.loads(message)
+                data = fast_json.loads(message)
                 method = data.get('method', '')
-                params = data.get('params', {})
 
                 # Route Network events
                 if method.startswith('Network.'):
                     if self.network_event_handler:
-                        self.network_event_handler(method, params, ws)
+                        self.network_event_handler(method, data.get('params', {}), sender)
+                    return
 
-                # Route Fetch events
-                elif method == 'Fetch.requestPaused':
-                    if self.fetch_event_handler:
-                        self.fetch_event_handler(params, ws)
+                route = routes.get(method)
+                if route:
+                    route(data.get('params', {}), ws)
 
-            except json.JSONDecodeError:
+            except fast_json.JSONDecodeError:
                 pass
             except Exception as e:
                 logger.error(f"CDP error: {e}")
@@ -105,10 +181,14 @@ class CDPClient:
             logger.error(f"CDP WebSocket error: {error}")
 
         def on_close(ws, close_status_code, close_msg):
-            pass
+            self._set_connected(False)
+            send_queue.put(None)
 
         def on_open(ws):
-            self._enable_domains(ws)
+            threading.Thread(target=write_frames, args=(ws,), daemon=True,
+                             name='cdp-writer').start()
+            self._enable_domains(sender)
+            self._set_connected(True)
 
         try:
             self.ws = websocket.WebSocketApp(
@@ -118,9 +198,36 @@ class CDPClient:
                 on_error=on_error,
                 on_close=on_close
             )
-            self.ws.run_forever()
+            # Chrome only sends valid UTF-8; websocket-client's validator is
+            # pure Python and would run over every text frame
+            self.ws.run_forever(skip_utf8_validation=True)
         except Exception as e:
             logger.error(f"CDP WebSocket error: {e}")
+        finally:
+            # run_forever can return without on_close (e.g. connect failure)
+            if self.is_connected:
+                self._set_connected(False)
+
+    def expect_page_load(self):
+        """
+        Arm the page load signal before triggering a navigation
+
+        Must be called before the navigation starts so a fast load event
+        is not missed.
+        """
+        self._page_loaded.clear()
+
+    def wait_for_page_load(self, timeout=10):
+        """
+        Block until Page.loadEventFired (main document loaded) arrives
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if a load event arrived, False on timeout
+        """
+        return self._page_loaded.wait(timeout)
 
     def _enable_domains(self, ws):
         """
@@ -161,12 +268,11 @@ class CDPClient:
             params: Dictionary of parameters
         """
         command = {
-            "id": self.session_id,
+            "id": self._next_id(),
             "method": method,
             "params": params
         }
-        self.session_id += 1
-        ws.send(json.dumps(command))
+        ws.send(fast_json.dumps(command))
 
     def send_fetch_continue(self, ws, request_id):
         """
@@ -0,0 +1,32 @@
+"""JSON helpers for hot paths - orjson when installed, stdlib json otherwise"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    def loads(data):
+        """Parse a JSON document (str or bytes)"""
+        return orjson.loads(data)
+
+    def dumps(obj):
+        """Serialize obj to a JSON str (websocket-client sends str frames)"""
+        return orjson.dumps(obj).decode()
+
+    def dumps_bytes(obj):
+        """Serialize obj to compact UTF-8 JSON bytes (for files)"""
+        return orjson.dumps(obj)
+
+else:
+    loads = json.loads
+    dumps = json.dumps
+
+    def dumps_bytes(obj):
+        """Serialize obj to compact UTF-8 JSON bytes (for files)"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one type covers both
+JSONDecodeError = json.JSONDecodeError
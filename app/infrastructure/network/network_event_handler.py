@@ -1,15 +1,32 @@
 """Network Event Handler - Processes CDP network events and detects video streams"""
 
-import json
 import logging
-import time
+import threading
+from collections import OrderedDict
+
+from app.infrastructure.network import fast_json
 
 logger = logging.getLogger(__name__)
 
+# Number of reported stream URLs remembered for de-duplication
+MAX_SEEN_URLS = 2048
+
+# Fetch.continueRequest frame sent for every paused request; CDP request IDs
+# are plain tokens (e.g. "interception-job-12.0"), so no JSON escaping needed
+_CONTINUE_TEMPLATE = '{{"id":{},"method":"Fetch.continueRequest","params":{{"requestId":"{}"}}}}'
+
+# Performance-log polling intervals (seconds) without and with a live CDP
+# WebSocket delivering the same events
+PERF_LOG_POLL_INTERVAL = 0.5
+PERF_LOG_IDLE_INTERVAL = 5.0
+
 
 class NetworkEventHandler:
     """Handles network events from CDP and legacy performance logs"""
 
+    __slots__ = ('stream_filter', 'stream_callback', '_is_video_stream', '_get_stream_type',
+                 '_is_master', '_is_media', '_seen_urls', '_seen_lock', '_cdp_active', '_stop_event')
+
     def __init__(self, stream_filter, stream_callback):
         """
         Initialize the network event handler
@@ -20,6 +37,62 @@ class NetworkEventHandler:
         """
         self.stream_filter = stream_filter
         self.stream_callback = stream_callback
+        # Bound once; these run for every network event
+        self._is_video_stream = stream_filter.is_video_stream_lc
+        self._get_stream_type = stream_filter.get_stream_type_lc
+        self._is_master = stream_filter.is_likely_master_playlist_lc
+        self._is_media = stream_filter.is_likely_media_playlist_lc
+        self._seen_urls = OrderedDict()
+        self._seen_lock = threading.Lock()
+        self._cdp_active = threading.Event()
+        self._stop_event = threading.Event()
+
+    def set_cdp_active(self, active):
+        """
+        Mark whether the CDP WebSocket is delivering network events
+
+        While it is, the performance-log fallback only polls every
+        PERF_LOG_IDLE_INTERVAL seconds. Pass this as the CDPClient
+        connection_handler so it follows the WebSocket's open/close.
+
+        Args:
+            active: True if CDP events are being received
+        """
+        if active:
+            self._cdp_active.set()
+        else:
+            self._cdp_active.clear()
+
+    def stop(self):
+        """Wake and end monitor_performance_logs immediately"""
+        self._stop_event.set()
+
+    def _is_new_stream(self, url):
+        """
+        Record url as reported and return True if it had not been seen yet
+
+        Players re-request the same playlist many times; only the first
+        detection is passed on to stream_callback.
+
+        Args:
+            url: Detected stream URL
+
+        Returns:
+            bool: True if the URL was not reported before
+        """
+        with self._seen_lock:
+            if url in self._seen_urls:
+                self._seen_urls.move_to_end(url)
+                return False
+            self._seen_urls[url] = None
+            if len(self._seen_urls) > MAX_SEEN_URLS:
+                self._seen_urls.popitem(last=False)
+            return True
+
+    def reset_seen(self):
+        """Forget reported stream URLs (e.g. after navigating to a new page)"""
+        with self._seen_lock:
+            self._seen_urls.clear()
 
     def handle_network_event(self, method, params, ws):
         """
@@ -35,9 +108,9 @@ class NetworkEventHandler:
             url = response.get('url', '')
             mime_type = response.get('mimeType', '')
 
-            if self.stream_filter.is_video_stream(url, mime_type):
-                stream_type = self.stream_filter.get_stream_type(url)
-                self.stream_callback(url, mime_type, stream_type)
+            url_lower = url.lower()
+            if self._is_video_stream(url_lower, mime_type) and self._is_new_stream(url):
+                self.stream_callback(url, mime_type, self._get_stream_type(url_lower))
 
     def handle_fetch_event(self, params, ws):
         """
@@ -52,28 +125,21 @@ class NetworkEventHandler:
         request_id = params.get('requestId', '')
 
         # Check for HLS playlists
-        if 'm3u8' in url.lower():
-            is_likely_master = self.stream_filter.is_likely_master_playlist(url)
-            is_likely_media = self.stream_filter.is_likely_media_playlist(url)
+        url_lower = url.lower()
+        if 'm3u8' in url_lower:
+            is_likely_master = self._is_master(url_lower)
+            is_likely_media = self._is_media(url_lower)
 
             # Only capture master playlists, not media segments
             if not is_likely_media and (is_likely_master or self.stream_callback):
                 mime_type = 'application/vnd.apple.mpegurl'
-                if self.stream_filter.is_video_stream(url, mime_type):
+                if self._is_video_stream(url_lower, mime_type) and self._is_new_stream(url):
                     self.stream_callback(url, mime_type, 'HLS')
 
         # Continue the request (must not block the request)
         if request_id and ws:
             try:
-                # Import here to avoid circular dependency
-                from app.infrastructure.network.cdp_client import CDPClient
-                # Use static method to send continue command
-                continue_cmd = {
-                    "id": getattr(ws, 'session_id', 1),
-                    "method": "Fetch.continueRequest",
-                    "params": {"requestId": request_id}
-                }
-                ws.send(json.dumps(continue_cmd))
+                ws.send(_CONTINUE_TEMPLATE.format(getattr(ws, 'session_id', 1), request_id))
             except Exception:
                 pass
 
@@ -85,13 +151,24 @@ class NetworkEventHandler:
             driver: Selenium WebDriver instance
             is_running_func: Callable that returns True while monitoring should continue
         """
-        while is_running_func() and driver:
+        is_video_stream = self._is_video_stream
+        get_stream_type = self._get_stream_type
+        is_new_stream = self._is_new_stream
+        stop_event = self._stop_event
+
+        cdp_active = self._cdp_active
+
+        while is_running_func() and driver and not stop_event.is_set():
             try:
                 logs = driver.get_log('performance')
 
                 for entry in logs:
                     try:
-                        log_data = json.loads(entry['message'])
+                        raw = entry['message']
+                        # Cheap substring check before parsing the entry
+                        if '"Network.responseReceived"' not in raw:
+                            continue
+                        log_data = fast_json.loads(raw)
                         message = log_data.get('message', {})
                         method = message.get('method', '')
 
@@ -101,16 +178,18 @@ class NetworkEventHandler:
                             url = response.get('url', '')
                             mime_type = response.get('mimeType', '')
 
-                            if self.stream_filter.is_video_stream(url, mime_type):
-                                stream_type = self.stream_filter.get_stream_type(url)
-                                self.stream_callback(url, mime_type, stream_type)
+                            url_lower = url.lower()
+                            if is_video_stream(url_lower, mime_type) and is_new_stream(url):
+                                self.stream_callback(url, mime_type, get_stream_type(url_lower))
 
-                    except json.JSONDecodeError:
+                    except fast_json.JSONDecodeError:
                         continue
                     except Exception:
                         pass
 
-                time.sleep(0.5)
+                # CDP delivers the same events while connected; the log is then
+                # only drained now and then as a safety net
+                stop_event.wait(PERF_LOG_IDLE_INTERVAL if cdp_active.is_set() else PERF_LOG_POLL_INTERVAL)
 
             except Exception:
                 break
@@ -1,31 +1,54 @@
 """Stream Filter - Detects and filters video stream URLs"""
 
+import re
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Distinct URLs whose filter decisions are memoized; Chrome requests the
+# same manifests, segments and beacons over and over
+DECISION_CACHE_SIZE = 4096
+
 
 class StreamFilter:
-    """Filters and identifies video stream URLs from network traffic"""
+    """
+    Filters and identifies video stream URLs from network traffic
+
+    Decisions depend only on the arguments, so each check is memoized per
+    URL (and MIME type) across all instances. The *_lc variants take a
+    URL that is already lowercased, letting callers that run several
+    checks lowercase it once.
+    """
+
+    __slots__ = ()
 
     # Playlist extensions we care about
-    PLAYLIST_EXTENSIONS = ['.m3u8', '.mpd']
+    PLAYLIST_EXTENSIONS = ('.m3u8', '.mpd')
 
     # MIME types for playlists
-    PLAYLIST_MIME_TYPES = [
+    PLAYLIST_MIME_TYPES = (
         'application/vnd.apple.mpegurl',
         'application/dash+xml',
         'application/x-mpegurl',
         'vnd.apple.mpegurl'
-    ]
+    )
 
     # Segment extensions to filter out
-    SEGMENT_EXTENSIONS = ['.ts', '.m4s']
+    SEGMENT_EXTENSIONS = ('.ts', '.m4s')
 
     # Keywords to filter out (ads, tracking)
-    FILTER_KEYWORDS = ['doubleclick', 'analytics', 'tracking']
+    FILTER_KEYWORDS = ('doubleclick', 'analytics', 'tracking')
 
-    def is_video_stream(self, url, mime_type=''):
+    # Precompiled matchers for the lists above, applied to lowercased input
+    _PLAYLIST_RE = re.compile(
+        '(?:' + '|'.join(map(re.escape, PLAYLIST_EXTENSIONS)) + r')(?:\?|\Z)'
+    )
+    _FILTER_RE = re.compile('|'.join(map(re.escape, FILTER_KEYWORDS)))
+    _PLAYLIST_MIME_RE = re.compile('|'.join(map(re.escape, PLAYLIST_MIME_TYPES)))
+
+    @staticmethod
+    def is_video_stream(url, mime_type=''):
         """
         Check if URL is a video stream - ONLY playlists, not segments
 
@@ -36,10 +59,14 @@ class StreamFilter:
         Returns:
             bool: True if URL is a video stream playlist
         """
-        url_lower = url.lower()
+        return StreamFilter.is_video_stream_lc(url.lower(), mime_type)
 
+    @staticmethod
+    @lru_cache(maxsize=DECISION_CACHE_SIZE)
+    def is_video_stream_lc(url_lower, mime_type=''):
+        """is_video_stream for a URL the caller has already lowercased"""
         # Filter out individual segment files
-        if any(url_lower.endswith(ext) for ext in self.SEGMENT_EXTENSIONS):
+        if url_lower.endswith(StreamFilter.SEGMENT_EXTENSIONS):
             return False
 
         if '/segment/' in url_lower:
@@ -50,9 +77,9 @@ class StreamFilter:
             return True
 
         # Check for playlist extensions
-        if any(url_lower.endswith(ext) or f'{ext}?' in url_lower for ext in self.PLAYLIST_EXTENSIONS):
+        if StreamFilter._PLAYLIST_RE.search(url_lower):
             # Filter out ads and tracking
-            if any(keyword in url_lower for keyword in self.FILTER_KEYWORDS):
+            if StreamFilter._FILTER_RE.search(url_lower):
                 return False
             return True
 
@@ -61,13 +88,13 @@ class StreamFilter:
             return True
 
         # Check MIME type for playlists
-        mime_type_lower = mime_type.lower()
-        if any(mime in mime_type_lower for mime in self.PLAYLIST_MIME_TYPES):
+        if mime_type and StreamFilter._PLAYLIST_MIME_RE.search(mime_type.lower()):
             return True
 
         return False
 
-    def is_likely_master_playlist(self, url):
+    @staticmethod
+    def is_likely_master_playlist(url):
         """
         Check if URL is likely a master playlist
 
@@ -77,7 +104,12 @@ class StreamFilter:
         Returns:
             bool: True if URL appears to be a master playlist
         """
-        url_lower = url.lower()
+        return StreamFilter.is_likely_master_playlist_lc(url.lower())
+
+    @staticmethod
+    @lru_cache(maxsize=DECISION_CACHE_SIZE)
+    def is_likely_master_playlist_lc(url_lower):
+        """is_likely_master_playlist for a URL the caller has already lowercased"""
         return (
             'usher' in url_lower or
             'master' in url_lower or
@@ -86,7 +118,8 @@ class StreamFilter:
             'api' in url_lower
         )
 
-    def is_likely_media_playlist(self, url):
+    @staticmethod
+    def is_likely_media_playlist(url):
         """
         Check if URL is likely a media playlist (not master)
 
@@ -96,14 +129,20 @@ class StreamFilter:
         Returns:
             bool: True if URL appears to be a media/segment playlist
         """
-        url_lower = url.lower()
+        return StreamFilter.is_likely_media_playlist_lc(url.lower())
+
+    @staticmethod
+    @lru_cache(maxsize=DECISION_CACHE_SIZE)
+    def is_likely_media_playlist_lc(url_lower):
+        """is_likely_media_playlist for a URL the caller has already lowercased"""
         return (
             '/chunklist' in url_lower or
             '/media_' in url_lower or
             '/segment' in url_lower
         )
 
-    def get_stream_type(self, url):
+    @staticmethod
+    def get_stream_type(url):
         """
         Determine stream type from URL
 
@@ -113,8 +152,12 @@ class StreamFilter:
         Returns:
             str: Stream type ('HLS', 'DASH', 'MP4', or 'UNKNOWN')
         """
-        url_lower = url.lower()
+        return StreamFilter.get_stream_type_lc(url.lower())
 
+    @staticmethod
+    @lru_cache(maxsize=DECISION_CACHE_SIZE)
+    def get_stream_type_lc(url_lower):
+        """get_stream_type for a URL the caller has already lowercased"""
         if '.m3u8' in url_lower:
             return 'HLS'
         elif '.mpd' in url_lower:
@@ -1,5 +1,6 @@
 """Persistence layer components for data storage and retrieval."""
 
+from .atomic_file import write_file_atomically
 from .schedule_repository import ScheduleRepository
 
-__all__ = ['ScheduleRepository']
+__all__ = ['ScheduleRepository', 'write_file_atomically']
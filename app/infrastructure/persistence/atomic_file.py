@@ -0,0 +1,54 @@
+"""Crash-safe whole-file writes."""
+
+import os
+import threading
+
+
+def _write_durably(path: str, data: bytes) -> None:
+    """
+    Write data to path and fsync it using raw file descriptor calls.
+
+    The payload is already fully serialized, so Python's buffered file
+    layer would only add a copy and extra calls; this is open, write(s),
+    fsync and close.
+
+    Args:
+        path: File to create or truncate
+        data: Complete file contents
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_file_atomically(path: str, data: bytes) -> None:
+    """
+    Replace path with data so readers see either the old or the new file.
+
+    The data goes to a temporary file next to path, is fsynced, and is then
+    renamed over path. A crash mid-write leaves the previous file intact.
+
+    Args:
+        path: Destination file
+        data: Complete new file contents
+
+    Raises:
+        OSError: If the temporary file cannot be written or renamed
+    """
+    # Unique per writer thread so two writers sharing the file cannot rename
+    # each other's half-written temp file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        _write_durably(tmp_path, data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -1,13 +1,85 @@
 """Repository for schedule persistence operations."""
 
-import os
-import json
+import atexit
 import logging
 import threading
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import List, Dict, Mapping, Optional, Sequence
+
+from app.infrastructure.network import fast_json
+from app.infrastructure.persistence.atomic_file import write_file_atomically
 
 logger = logging.getLogger(__name__)
 
+# Seconds add/remove/update wait before writing, so a burst of changes is
+# saved with a single write
+SAVE_DEBOUNCE_DELAY = 0.1
+
+
+class _ReadWriteLock:
+    """
+    Shared/exclusive lock: any number of readers, or one writer.
+
+    Waiting writers block new readers so they cannot starve. The write side
+    is reentrant, and a thread holding it may also take the read side, so
+    add_schedule can call save_schedules while holding the lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        """Hold the lock shared for the duration of the with block."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                nested = True
+            else:
+                nested = False
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if not nested:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively for the duration of the with block."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = me
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
 
 class ScheduleRepository:
     """
@@ -25,8 +97,23 @@ class ScheduleRepository:
             config: Configuration object containing SCHEDULES_FILE path
         """
         self.config = config
-        self.lock = threading.Lock()
+        # Reads (load/get) share the lock; save/add/remove/update are exclusive
+        self.lock = _ReadWriteLock()
         self._schedules_cache = None
+        # id -> position in _schedules_cache (first occurrence), rebuilt with it
+        self._schedule_positions = {}
+        # Bytes of the last successful save, to skip rewriting identical content
+        self._last_written = None
+        # Cache changes are numbered; the file is current when the last
+        # written change is the latest one
+        self._change_seq = 0
+        self._saved_seq = 0
+        self._io_lock = threading.Lock()
+        # Debounced background save for add/remove/update
+        self._save_executor = None
+        self._save_pending = threading.Event()
+        self._save_guard = threading.Lock()
+        atexit.register(self.flush)
 
     def load_schedules(self) -> List[Dict]:
         """
@@ -37,23 +124,30 @@ class ScheduleRepository:
 
         Note:
             Returns empty list if file doesn't exist or on error.
-            Errors are logged but not raised.
+            Errors are logged but not raised. While a debounced save is
+            still pending the file is behind the cache, so the cache is
+            returned instead of being replaced by the stale file.
         """
-        with self.lock:
-            if os.path.exists(self.config.SCHEDULES_FILE):
-                try:
-                    with open(self.config.SCHEDULES_FILE, 'r') as f:
-                        schedules = json.load(f)
-                    logger.info(f"Loaded {len(schedules)} schedules")
-                    self._schedules_cache = schedules
-                    return schedules
-                except Exception as e:
-                    logger.error(f"Error loading schedules: {e}")
-                    self._schedules_cache = []
-                    return []
-            else:
+        # Exclusive: the cache is replaced, and concurrent loaders must not
+        # swap it under each other
+        with self.lock.write():
+            if self._schedules_cache is not None and self._change_seq != self._saved_seq:
+                return self._schedules_cache
+
+            # Open directly rather than stat first; a missing file is the rare case
+            try:
+                with open(self.config.SCHEDULES_FILE, 'rb') as f:
+                    schedules = fast_json.loads(f.read())
+                logger.info("Loaded %d schedules", len(schedules))
+                self._set_cache(schedules)
+                return schedules
+            except FileNotFoundError:
                 logger.info("No schedules file found, starting with empty list")
-                self._schedules_cache = []
+                self._set_cache([])
+                return []
+            except Exception as e:
+                logger.error("Error loading schedules: %s", e)
+                self._set_cache([])
                 return []
 
     def save_schedules(self, schedules: List[Dict]) -> None:
@@ -65,15 +159,14 @@ class ScheduleRepository:
 
         Note:
             Errors are logged but not raised to maintain existing behavior.
+            The file is replaced atomically (temp file + fsync + rename), so
+            a crash mid-save leaves the previous version intact. Saving
+            content identical to the last save skips the write.
         """
-        with self.lock:
-            try:
-                with open(self.config.SCHEDULES_FILE, 'w') as f:
-                    json.dump(schedules, f, indent=2)
-                self._schedules_cache = schedules
-                logger.debug(f"Saved {len(schedules)} schedules to disk")
-            except Exception as e:
-                logger.error(f"Error saving schedules: {e}")
+        with self.lock.write():
+            self._set_cache(schedules)
+            self._change_seq += 1
+        self._persist()
 
     def add_schedule(self, schedule: Dict) -> Dict:
         """
@@ -86,14 +179,16 @@ class ScheduleRepository:
             Dict: The added schedule
 
         Note:
-            This method loads existing schedules, adds the new one,
-            and saves them back to disk.
+            The schedule is visible to readers immediately; the write to
+            disk is debounced (see SAVE_DEBOUNCE_DELAY).
         """
-        with self.lock:
-            schedules = self._load_for_modification()
+        with self.lock.write():
+            self._ensure_cached()
+            schedules = self._schedules_cache
             schedules.append(schedule)
-            self.save_schedules(schedules)
-            logger.info(f"Added schedule {schedule.get('id')}")
+            self._schedule_positions.setdefault(schedule.get('id'), len(schedules) - 1)
+            self._mark_dirty()
+            logger.info("Added schedule %s", schedule.get('id'))
             return schedule
 
     def remove_schedule(self, schedule_id: str) -> bool:
@@ -106,19 +201,21 @@ class ScheduleRepository:
         Returns:
             bool: True if schedule was found and removed, False otherwise
         """
-        with self.lock:
-            schedules = self._load_for_modification()
-            initial_count = len(schedules)
-            schedules = [s for s in schedules if s['id'] != schedule_id]
-
-            if len(schedules) < initial_count:
-                self.save_schedules(schedules)
-                logger.info(f"Removed schedule {schedule_id}")
-                return True
-            else:
-                logger.warning(f"Schedule {schedule_id} not found for removal")
+        with self.lock.write():
+            self._ensure_cached()
+            if schedule_id not in self._schedule_positions:
+                logger.warning("Schedule %s not found for removal", schedule_id)
                 return False
 
+            # Delete in place; readers only see the cache under the read lock
+            schedules = self._schedules_cache
+            while schedule_id in self._schedule_positions:
+                del schedules[self._schedule_positions[schedule_id]]
+                self._set_cache(schedules)
+            self._mark_dirty()
+            logger.info("Removed schedule %s", schedule_id)
+            return True
+
     def update_schedule(self, schedule_id: str, updates: Dict) -> Optional[Dict]:
         """
         Update an existing schedule with new values.
@@ -130,19 +227,108 @@ class ScheduleRepository:
         Returns:
             Optional[Dict]: Updated schedule if found, None otherwise
         """
-        with self.lock:
-            schedules = self._load_for_modification()
+        with self.lock.write():
+            self._ensure_cached()
+            position = self._schedule_positions.get(schedule_id)
+            if position is None:
+                logger.warning("Schedule %s not found for update", schedule_id)
+                return None
+
+            schedule = self._schedules_cache[position]
+            # Apply all updates
+            schedule.update(updates)
+            self._mark_dirty()
+            logger.info("Updated schedule %s", schedule_id)
+            return schedule
+
+    def update_schedule_field(self, schedule_id: str, key: str, value) -> Optional[Dict]:
+        """
+        Set a single field of an existing schedule.
 
-            for schedule in schedules:
-                if schedule['id'] == schedule_id:
-                    # Apply all updates
-                    schedule.update(updates)
-                    self.save_schedules(schedules)
-                    logger.info(f"Updated schedule {schedule_id}")
-                    return schedule
+        Same as update_schedule(schedule_id, {key: value}) without building
+        the updates dict, for the common one-field change (e.g. status).
 
-            logger.warning(f"Schedule {schedule_id} not found for update")
-            return None
+        Args:
+            schedule_id: ID of the schedule to update
+            key: Field name
+            value: New value
+
+        Returns:
+            Optional[Dict]: Updated schedule if found, None otherwise
+        """
+        with self.lock.write():
+            self._ensure_cached()
+            position = self._schedule_positions.get(schedule_id)
+            if position is None:
+                logger.warning("Schedule %s not found for update", schedule_id)
+                return None
+
+            schedule = self._schedules_cache[position]
+            schedule[key] = value
+            self._mark_dirty()
+            logger.info("Updated schedule %s", schedule_id)
+            return schedule
+
+    def flush(self) -> None:
+        """
+        Write pending changes to disk now.
+
+        Called automatically at interpreter exit.
+        """
+        if self._change_seq != self._saved_seq:
+            self._persist()
+
+    def _persist(self) -> None:
+        """
+        Write the current cache to disk if it changed since the last write.
+
+        The lock is held only to copy the cache; serializing and writing
+        happen outside it, so readers and mutations are not blocked by
+        disk I/O. _io_lock keeps writes in order.
+        """
+        with self._io_lock:
+            with self.lock.read():
+                seq = self._change_seq
+                if seq == self._saved_seq or self._schedules_cache is None:
+                    return
+                # Copy the dicts too: update_schedule mutates them in place
+                snapshot = [dict(s) for s in self._schedules_cache]
+
+            try:
+                # Compact: the file is read by this code, not by people
+                data = fast_json.dumps_bytes(snapshot)
+                if data != self._last_written:
+                    write_file_atomically(self.config.SCHEDULES_FILE, data)
+                    self._last_written = data
+                    logger.debug("Saved %d schedules to disk", len(snapshot))
+                self._saved_seq = seq
+            except Exception as e:
+                logger.error("Error saving schedules: %s", e)
+
+    def _mark_dirty(self) -> None:
+        """
+        Record that the cache is ahead of the file and queue a debounced save.
+
+        Must be called with the write lock held.
+        """
+        self._change_seq += 1
+        with self._save_guard:
+            if self._save_pending.is_set():
+                return
+            self._save_pending.set()
+            if self._save_executor is None:
+                self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='schedule-repo-save')
+            self._save_executor.submit(self._flush_pending)
+
+    def _flush_pending(self) -> None:
+        """Write the queued save after the debounce delay (runs on the writer thread)."""
+        time.sleep(SAVE_DEBOUNCE_DELAY)
+        # Clear first so changes made while saving queue another save
+        self._save_pending.clear()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("Error in debounced schedule save: %s", e)
 
     def get_all_schedules(self) -> List[Dict]:
         """
@@ -152,10 +338,36 @@ class ScheduleRepository:
             List[Dict]: List of all schedule dictionaries
 
         Note:
-            This loads fresh data from disk to ensure consistency.
+            The file is only written by this repository, so after the first
+            load schedules are served from the in-memory cache. Callers get
+            copies and may modify them freely.
         """
+        with self.lock.read():
+            cached = self._schedules_cache
+            if cached is not None:
+                return [dict(s) for s in cached]
         return self.load_schedules()
 
+    def get_all_schedules_view(self) -> Sequence[Mapping]:
+        """
+        Get all schedules without copying them.
+
+        Returns:
+            Sequence[Mapping]: Tuple of the cached schedule dicts
+
+        Note:
+            The dicts are the repository's own and must be treated as
+            read-only; use get_all_schedules() for copies that can be
+            modified. The tuple itself is a snapshot of list membership.
+        """
+        with self.lock.read():
+            cached = self._schedules_cache
+            if cached is not None:
+                return tuple(cached)
+        self.load_schedules()
+        with self.lock.read():
+            return tuple(self._schedules_cache)
+
     def get_schedule_by_id(self, schedule_id: str) -> Optional[Dict]:
         """
         Get a specific schedule by its ID.
@@ -166,28 +378,52 @@ class ScheduleRepository:
         Returns:
             Optional[Dict]: Schedule dictionary if found, None otherwise
         """
-        schedules = self.get_all_schedules()
-        for schedule in schedules:
-            if schedule['id'] == schedule_id:
-                return schedule
-        return None
+        with self.lock.read():
+            loaded = self._schedules_cache is not None
+        if not loaded:
+            self.load_schedules()
+
+        with self.lock.read():
+            position = self._schedule_positions.get(schedule_id)
+            if position is None:
+                return None
+            return dict(self._schedules_cache[position])
+
+    def _set_cache(self, schedules: List[Dict]) -> None:
+        """
+        Replace the cached schedule list and its id index.
 
-    def _load_for_modification(self) -> List[Dict]:
+        Args:
+            schedules: Schedule list now matching the file on disk
         """
-        Load schedules for modification operations.
+        positions = {}
+        for i, schedule in enumerate(schedules):
+            positions.setdefault(schedule.get('id'), i)
+        self._schedules_cache = schedules
+        self._schedule_positions = positions
 
-        Returns:
-            List[Dict]: Fresh list of schedules from disk
+    def _ensure_cached(self) -> None:
+        """
+        Populate the cache from disk if nothing has been loaded yet.
 
-        Note:
-            This is an internal method that always loads fresh data
-            to ensure consistency during modifications.
+        Must be called with the write lock held.
         """
-        if os.path.exists(self.config.SCHEDULES_FILE):
-            try:
-                with open(self.config.SCHEDULES_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading schedules for modification: {e}")
-                return []
-        return []
+        if self._schedules_cache is None:
+            self._set_cache(self._read_schedules_file())
+
+    def _read_schedules_file(self) -> List[Dict]:
+        """
+        Read the schedules file to seed the cache for a modification.
+
+        Returns:
+            List[Dict]: Schedules on disk, or an empty list if the file is
+            missing or unreadable
+        """
+        try:
+            with open(self.config.SCHEDULES_FILE, 'rb') as f:
+                return fast_json.loads(f.read())
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.error("Error loading schedules for modification: %s", e)
+            return []
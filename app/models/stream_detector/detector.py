@@ -1,5 +1,4 @@
 import time
-import json
 import logging
 import threading
 import websocket
@@ -10,10 +9,9 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import os
-import glob
 
 from app.utils import PlaylistParser, MetadataExtractor, ThumbnailGenerator
+from app.infrastructure.browser.chrome_config_manager import ChromeConfigManager
 from .cdp_mixin import CDPMixin
 from .network_monitor_mixin import NetworkMonitorMixin
 from .stream_parser_mixin import StreamParserMixin
@@ -30,11 +28,18 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
     def __init__(self, browser_id, config, resolution='1080p', framerate='any', auto_download=False, filename=None, output_format='mp4'):
         self.browser_id = browser_id
         self.config = config
+        self.chrome_config = ChromeConfigManager(config)
         self.driver = None
+        # Every chromedriver started by start_browser (Chrome runs as its
+        # child), including ones from failed attempts, so the owner can make
+        # sure they have all exited
+        self.chromedriver_pids = []
         self.detected_streams = []
         self.is_running = False
         self.is_closing = False  # Flag to prevent duplicate close logs
         self.download_started = False
+        # Set once the download callback has run, or when the browser closes
+        self.download_started_event = threading.Event()
         self.thumbnail_data = None
         self.resolution = resolution
         self.framerate = framerate  # 'any', '60', '30'
@@ -43,6 +48,7 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
         self.output_format = output_format  # Output file format (mp4, mkv, mp3, etc.)
         self.awaiting_resolution_selection = False
         self.available_resolutions = []
+        self.resolutions_by_url = {}  # url -> entry of available_resolutions
         self.selected_stream_url = None
         # WebSocket CDP connection
         self.ws = None
@@ -75,43 +81,7 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
                 chrome_options.add_argument('--disable-dev-shm-usage')
 
                 # Fix "Chrome did not shut down correctly" and session restore issues
-                try:
-                    prefs_path = os.path.join(self.config.CHROME_USER_DATA_DIR, 'Default', 'Preferences')
-                    if os.path.exists(prefs_path):
-                        with open(prefs_path, 'r', encoding='utf-8') as f:
-                            prefs = json.load(f)
-                        
-                        # Reset crash flags and session restore settings
-                        changed = False
-                        
-                        # Reset exit_type to Normal
-                        if 'profile' in prefs:
-                            if prefs['profile'].get('exit_type') != 'Normal':
-                                prefs['profile']['exit_type'] = 'Normal'
-                                changed = True
-                            # Also reset exited_cleanly flag
-                            if prefs['profile'].get('exited_cleanly') != True:
-                                prefs['profile']['exited_cleanly'] = True
-                                changed = True
-                        
-                        # Disable session restore (prevents blank window with highlighted URL)
-                        if 'session' in prefs:
-                            if prefs['session'].get('restore_on_startup') != 5:  # 5 = don't restore
-                                prefs['session']['restore_on_startup'] = 5
-                                changed = True
-                        
-                        # Also clear the startup URLs (another session restore mechanism)
-                        if 'session' in prefs and 'startup_urls' in prefs['session']:
-                            if prefs['session']['startup_urls']:
-                                prefs['session']['startup_urls'] = []
-                                changed = True
-                        
-                        if changed:
-                            logger.debug("Resetting Chrome crash flag and session restore settings in Preferences")
-                            with open(prefs_path, 'w', encoding='utf-8') as f:
-                                json.dump(prefs, f)
-                except Exception as prefs_error:
-                    logger.warning(f"Could not reset Chrome preferences: {prefs_error}")
+                self.chrome_config.reset_preferences()
 
                 # Enable remote debugging for CDP WebSocket (port 0 = auto-assign)
                 chrome_options.add_argument('--remote-debugging-port=0')
@@ -144,9 +114,13 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
                 # User data directory for cookie persistence
                 chrome_options.add_argument(f'--user-data-dir={self.config.CHROME_USER_DATA_DIR}')
 
-                # Logging
-                chrome_options.add_argument('--enable-logging')
-                chrome_options.add_argument('--v=1')
+                # Logging: verbose Chrome logs are only useful when debugging and
+                # otherwise write a steady stream nobody reads
+                if self.config.CHROME_VERBOSE_LOGGING:
+                    chrome_options.add_argument('--enable-logging')
+                    chrome_options.add_argument('--v=1')
+                else:
+                    chrome_options.add_argument('--disable-logging')
 
                 chrome_options.add_experimental_option('w3c', True)
                 chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
@@ -176,7 +150,12 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
                 )
 
                 try:
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                    try:
+                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                    finally:
+                        # Recorded even if the session failed after chromedriver started
+                        if service.process is not None:
+                            self.chromedriver_pids.append(service.process.pid)
                     logger.debug("Chrome started successfully")
                     
                     # Set page load timeout to prevent hangs
@@ -191,18 +170,7 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
                         retry_count += 1
 
                         # Clean up problematic lock files in user-data-dir
-                        try:
-                            lock_files = glob.glob(os.path.join(self.config.CHROME_USER_DATA_DIR, '**/SingletonLock'), recursive=True)
-                            lock_files.extend(glob.glob(os.path.join(self.config.CHROME_USER_DATA_DIR, '**/lockfile'), recursive=True))
-
-                            for lock_file in lock_files:
-                                try:
-                                    os.remove(lock_file)
-                                    logger.info(f"Removed lock file: {lock_file}")
-                                except Exception as remove_error:
-                                    logger.warning(f"Could not remove {lock_file}: {remove_error}")
-                        except Exception as cleanup_error:
-                            logger.warning(f"Error during lock file cleanup: {cleanup_error}")
+                        self.chrome_config.cleanup_lock_files()
 
                         # Small delay to let file system catch up
                         time.sleep(1)
@@ -215,6 +183,8 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
 
             except WebDriverException as e:
                 logger.error(f"WebDriver error starting browser: {e}")
+                # Don't leave a half-started Chrome holding the profile lock
+                self._quit_driver()
                 if retry_count < max_retries - 1:
                     retry_count += 1
                     logger.info(f"Retrying... attempt {retry_count + 1}/{max_retries}")
@@ -226,6 +196,7 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
                 logger.error(f"Unexpected error starting browser: {type(e).__name__}: {e}")
                 import traceback
                 logger.error(f"Traceback: {traceback.format_exc()}")
+                self._quit_driver()
                 return False
 
         if retry_count >= max_retries:
@@ -298,6 +269,15 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
              
         return True
 
+    def _quit_driver(self):
+        """Quit and forget the current driver, ignoring errors"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.debug(f"Error quitting driver: {e}")
+            self.driver = None
+
     def close(self):
         """Close the browser gracefully"""
         # Check if already closing to prevent duplicate logs
@@ -306,6 +286,8 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
 
         self.is_closing = True
         self.is_running = False
+        # No download can start from here on; release anyone waiting for one
+        self.download_started_event.set()
 
         # Close WebSocket connection
         if self.ws:
@@ -350,37 +332,7 @@ class StreamDetector(CDPMixin, NetworkMonitorMixin, StreamParserMixin,
                 time.sleep(0.8)
 
                 # Step 4: AFTER Chrome has quit, fix the preferences file for next startup
-                try:
-                    prefs_path = os.path.join(self.config.CHROME_USER_DATA_DIR, 'Default', 'Preferences')
-                    if os.path.exists(prefs_path):
-                        # Read and update preferences
-                        max_retries = 3
-                        for retry in range(max_retries):
-                            try:
-                                with open(prefs_path, 'r', encoding='utf-8') as f:
-                                    prefs = json.load(f)
-
-                                # Mark as clean exit for next startup
-                                if 'profile' not in prefs:
-                                    prefs['profile'] = {}
-                                prefs['profile']['exit_type'] = 'Normal'
-                                prefs['profile']['exited_cleanly'] = True
-
-                                with open(prefs_path, 'w', encoding='utf-8') as f:
-                                    json.dump(prefs, f)
-                                logger.debug("Set Chrome exit flags to Normal for next startup")
-                                break
-                            except (IOError, OSError) as file_error:
-                                # File might be locked, wait and retry
-                                if retry < max_retries - 1:
-                                    time.sleep(0.3)
-                                    continue
-                                else:
-                                    raise file_error
-                    else:
-                        logger.warning(f"Preferences file not found at {prefs_path}")
-                except Exception as prefs_error:
-                    logger.warning(f"Could not set Chrome exit flags: {prefs_error}")
+                self.chrome_config.mark_clean_exit()
 
                 logger.debug(f"Browser {self.browser_id} closed gracefully")
 
@@ -73,6 +73,7 @@ class DownloadHandlerMixin:
         # Call download callback if set
         if self.download_callback:
             self.download_callback(self.browser_id, stream_url, filename, resolution_name, stream_metadata)
+        self.download_started_event.set()
 
         # Wait for video to load
         time.sleep(3)
@@ -153,6 +153,10 @@ class StreamParserMixin:
         logger.info(f"Showing {len(resolutions)} stream options for user selection")
         self.awaiting_resolution_selection = True
         self.available_resolutions = resolutions
+        # Index by URL for select_stream; the first stream with a URL wins
+        self.resolutions_by_url = {}
+        for stream in resolutions:
+            self.resolutions_by_url.setdefault(stream['url'], stream)
 
         # Enrich metadata and add thumbnails for each stream
         for stream in resolutions:
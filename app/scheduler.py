@@ -1,15 +1,82 @@
 import os
 import time
-import json
+import atexit
+import heapq
+import itertools
 import uuid
 import logging
 import threading
 import random
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta, time as dtime
 from zoneinfo import ZoneInfo
 
+from app.infrastructure.network import fast_json
+from app.infrastructure.persistence import write_file_atomically
+
 logger = logging.getLogger(__name__)
 
+# Persisted fields the check loop may change; compared before/after each
+# schedule is processed so a tick only marks the list dirty on real changes
+_CHECK_STATE_FIELDS = ('status', 'next_check', 'last_check', 'start_time', 'end_time',
+                       'active_browser_id', 'manual_stop')
+
+# Seconds between scheduler ticks; schedules waiting on a check or a
+# download are polled at this rate
+CHECK_INTERVAL = 30
+
+# Browser checks running at once; further checks queue on the pool (the
+# browser service queues browsers beyond its own limit anyway)
+MAX_CONCURRENT_CHECKS = 8
+
+# Schedules sharing a start time (e.g. all on the hour) have their first
+# check spread over this many seconds past the window start, so their
+# browser launches do not all queue up at once
+START_JITTER_SECONDS = 60
+
+# Distinct time strings kept parsed; each schedule only has a handful
+TIME_PARSE_CACHE_SIZE = 1024
+
+# Time strings are re-read on every tick but rarely change, so each distinct
+# value is parsed once. datetimes are immutable, so sharing results is safe.
+_fromisoformat = lru_cache(maxsize=TIME_PARSE_CACHE_SIZE)(datetime.fromisoformat)
+
+
+@lru_cache(maxsize=TIME_PARSE_CACHE_SIZE)
+def _parse_daily_time(time_str):
+    """Parse a daily schedule's HH:MM string into a (shared) time object."""
+    hour, minute = map(int, time_str.split(':'))
+    return dtime(hour, minute)
+
+
+def _start_jitter(schedule_id, window):
+    """
+    Offset of a schedule's first check from its window start.
+
+    Derived from the schedule id, so it is the same across restarts, and
+    never more than half the window.
+    """
+    seconds = zlib.crc32(schedule_id.encode()) % START_JITTER_SECONDS
+    return max(timedelta(0), min(timedelta(seconds=seconds), window / 2))
+
+
+@lru_cache(maxsize=TIME_PARSE_CACHE_SIZE)
+def _parse_iso(dt_str, tz):
+    """Parse an ISO datetime string for comparison in tz (see Scheduler._parse_dt)."""
+    dt = _fromisoformat(dt_str)
+    if dt.tzinfo is None:
+        if tz:
+            dt = dt.replace(tzinfo=tz)
+        # else: remains naive UTC — matches _now() for no-tz schedules
+    elif tz is None:
+        # Stored with Z (UTC-aware) but schedule has no timezone — strip so
+        # comparison with naive _now() doesn't raise TypeError
+        dt = dt.replace(tzinfo=None)
+    return dt
+
+
 class Scheduler:
     """
     Manages scheduled stream checks with intelligent retry and resilience.
@@ -21,26 +88,44 @@ class Scheduler:
     - Specific download tracking for multi-stream support
     - Thread-safe schedule management with JSON persistence
     - Lazy disk writes (only when schedules are actually modified)
+    - Due-time heap, so a tick only visits schedules that need attention
     """
 
     def __init__(self, config, browser_service):
         self.config = config
         self.browser_service = browser_service
         self.schedules = []
+        self._by_id = {}  # schedule id -> schedule dict in self.schedules
+        # Heap of (due epoch seconds, seq, schedule id); _due_seq holds the
+        # seq of each schedule's live entry so superseded entries are skipped
+        self._due_heap = []
+        self._due_seq = {}
+        self._heap_seq = itertools.count()
         self.running = False
         self.thread = None
+        # Set by stop() and by edits due before the loop's next wake-up
+        self._wake_event = threading.Event()
+        self._wake_at = 0.0  # epoch seconds the loop is waiting until
+        self._check_pool = None  # created on the first check
         self.lock = threading.Lock()
         self._dirty = False  # True when in-memory schedules differ from disk
+        # Bytes of the last successful save, to skip rewriting identical content
+        self._last_written = None
+        # Bumped on every change; get_schedules re-sorts only when it moves
+        self._change_seq = 0
+        self._sorted_cache = (-1, [])
         self._auto_paused = {}  # browser_id -> [schedule_ids paused for that manual session]
 
         self.load_schedules()
+        # Saves are batched by the loop; write anything still pending on exit
+        atexit.register(self.flush)
 
     def load_schedules(self):
         """Load schedules from disk"""
         if os.path.exists(self.config.SCHEDULES_FILE):
             try:
-                with open(self.config.SCHEDULES_FILE, 'r') as f:
-                    self.schedules = json.load(f)
+                with open(self.config.SCHEDULES_FILE, 'rb') as f:
+                    self.schedules = fast_json.loads(f.read())
                 logger.info(f"Loaded {len(self.schedules)} schedules")
 
                 # Ensure all schedules have next_check calculated
@@ -56,21 +141,73 @@ class Scheduler:
                 self.schedules = []
         else:
             self.schedules = []
+        self._by_id = {s['id']: s for s in self.schedules}
+        self._index_schedules()
+        self._change_seq += 1
 
     def save_schedules(self):
         """Save schedules to disk (only if dirty)"""
         if not self._dirty:
             return
         try:
-            with open(self.config.SCHEDULES_FILE, 'w') as f:
-                json.dump(self.schedules, f, indent=2)
+            # Serialize first, then swap the file in atomically so a crash
+            # mid-save cannot leave a truncated schedules.json
+            data = fast_json.dumps_bytes(self.schedules)
+            if data != self._last_written:
+                write_file_atomically(self.config.SCHEDULES_FILE, data)
+                self._last_written = data
             self._dirty = False
         except Exception as e:
             logger.error(f"Error saving schedules: {e}")
 
+    def _index_schedules(self):
+        """Rebuild the due-time heap with every schedule due immediately."""
+        self._due_heap = []
+        self._due_seq = {}
+        for schedule in self.schedules:
+            self._push_due(0, schedule['id'])
+
+    def _push_due(self, due, schedule_id):
+        """
+        Queue a schedule to be visited once `due` (epoch seconds) has passed.
+
+        Replaces any entry already queued for the schedule; pass 0 to have the
+        next tick visit it.
+        """
+        seq = next(self._heap_seq)
+        self._due_seq[schedule_id] = seq
+        heapq.heappush(self._due_heap, (due, seq, schedule_id))
+        if due < self._wake_at:
+            self._wake_event.set()
+
+        # Superseded entries are normally dropped as they come due; compact
+        # when edits have left the heap mostly stale
+        if len(self._due_heap) > 2 * len(self._due_seq) + 64:
+            self._due_heap = [e for e in self._due_heap if self._due_seq.get(e[2]) == e[1]]
+            heapq.heapify(self._due_heap)
+
     def _mark_dirty(self):
         """Mark schedules as needing a save."""
         self._dirty = True
+        self._change_seq += 1
+
+    def _request_save(self):
+        """
+        Mark schedules dirty and have them saved soon. Call with self.lock held.
+
+        While the loop runs it is woken to save, so a burst of edits costs one
+        write; otherwise the save happens right away.
+        """
+        self._mark_dirty()
+        if self.running:
+            self._wake_event.set()
+        else:
+            self.save_schedules()
+
+    def flush(self):
+        """Write pending schedule changes to disk now."""
+        with self.lock:
+            self.save_schedules()
 
     # ── Timezone helpers ──────────────────────────────────────────
 
@@ -84,10 +221,14 @@ class Scheduler:
                 pass
         return None
 
-    def _now(self, schedule=None):
-        """Return datetime.now(), timezone-aware when the schedule carries one."""
+    def _now(self, schedule=None, now_ts=None):
+        """Return datetime.now(), timezone-aware when the schedule carries one.
+        Pass now_ts (epoch seconds) to get that instant instead, so one clock
+        read serves a whole tick."""
         tz = self._get_tz(schedule)
-        return datetime.now(tz) if tz else datetime.now()
+        if now_ts is None:
+            return datetime.now(tz) if tz else datetime.now()
+        return datetime.fromtimestamp(now_ts, tz) if tz else datetime.fromtimestamp(now_ts)
 
     def _parse_dt(self, dt_str, tz):
         """Parse an ISO datetime string and attach timezone if provided.
@@ -95,16 +236,7 @@ class Scheduler:
         aware so Python can compare two aware datetimes directly.  When the schedule
         has no timezone and we would otherwise compare aware vs naive, strip the tz
         so both sides stay naive-UTC."""
-        dt = datetime.fromisoformat(dt_str)
-        if dt.tzinfo is None:
-            if tz:
-                dt = dt.replace(tzinfo=tz)
-            # else: remains naive UTC — matches _now() for no-tz schedules
-        elif tz is None:
-            # Stored with Z (UTC-aware) but schedule has no timezone — strip so
-            # comparison with naive _now() doesn't raise TypeError
-            dt = dt.replace(tzinfo=None)
-        return dt
+        return _parse_iso(dt_str, tz)
 
     def _strip_tz(self, dt):
         """Strip timezone for storage (timezone is persisted separately)."""
@@ -142,40 +274,44 @@ class Scheduler:
             }
             self._update_next_check(schedule)
             self.schedules.append(schedule)
-            self._mark_dirty()
-            self.save_schedules()
+            self._by_id[schedule['id']] = schedule
+            self._push_due(0, schedule['id'])
+            self._request_save()
             return schedule
 
     def remove_schedule(self, schedule_id):
         """Remove a schedule"""
         with self.lock:
-            self.schedules = [s for s in self.schedules if s['id'] != schedule_id]
-            self._mark_dirty()
-            self.save_schedules()
+            target = self._by_id.pop(schedule_id, None)
+            if target is not None:
+                self._due_seq.pop(schedule_id, None)
+                # In place: no N-1 copy, and holders of self.schedules see the removal
+                self.schedules.remove(target)
+            self._request_save()
             return True
 
     def update_schedule(self, schedule_id, url, start_time, end_time, repeat=False, daily=False, name=None, resolution='1080p', framerate='any', format='mp4', timezone=None):
         """Update an existing schedule"""
         with self.lock:
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    schedule['url'] = url
-                    schedule['name'] = name
-                    schedule['start_time'] = start_time
-                    schedule['end_time'] = end_time
-                    schedule['repeat'] = repeat
-                    schedule['daily'] = daily
-                    schedule['resolution'] = resolution
-                    schedule['framerate'] = framerate
-                    schedule['format'] = format
-                    if timezone:
-                        schedule['timezone'] = timezone
-                    schedule['status'] = 'pending'
-                    self._update_next_check(schedule)
-                    self._mark_dirty()
-                    self.save_schedules()
-                    logger.info(f"Updated schedule {schedule_id}")
-                    return schedule
+            schedule = self._by_id.get(schedule_id)
+            if schedule is not None:
+                schedule['url'] = url
+                schedule['name'] = name
+                schedule['start_time'] = start_time
+                schedule['end_time'] = end_time
+                schedule['repeat'] = repeat
+                schedule['daily'] = daily
+                schedule['resolution'] = resolution
+                schedule['framerate'] = framerate
+                schedule['format'] = format
+                if timezone:
+                    schedule['timezone'] = timezone
+                schedule['status'] = 'pending'
+                self._update_next_check(schedule)
+                self._push_due(0, schedule_id)
+                self._request_save()
+                logger.info(f"Updated schedule {schedule_id}")
+                return schedule
 
             return None
 
@@ -196,58 +332,54 @@ class Scheduler:
         schedule_id = parts[1]
 
         with self.lock:
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    if schedule.get('active_browser_id') == browser_id:
-                        schedule['status'] = 'pending'
-                        schedule['active_browser_id'] = None
-                        schedule['manual_stop'] = False
-
-                        if schedule.get('daily'):
-                            logger.info(f"Moving daily schedule {schedule_id} to next day")
-                            start_time_str = schedule['start_time']
-                            start_hour, start_min = map(int, start_time_str.split(':'))
-                            tz = self._get_tz(schedule)
-                            now_local = self._now(schedule)
-                            tomorrow = now_local.date() + timedelta(days=1)
-                            if tz:
-                                next_start = datetime.combine(tomorrow, dtime(start_hour, start_min), tzinfo=tz)
-                            else:
-                                next_start = datetime.combine(tomorrow, dtime(start_hour, start_min))
-                            schedule['next_check'] = self._store_dt(next_start)
-                            logger.info(f"Daily schedule {schedule_id} moved to {next_start}")
-                        elif schedule.get('repeat'):
-                            logger.info(f"Moving weekly schedule {schedule_id} to next week")
-                            self._reschedule_next_week(schedule)
-                        else:
-                            logger.info(f"One-time schedule {schedule_id} stopped, marking as completed")
-                            schedule['status'] = 'completed'
-                            self._update_next_check(schedule)
+            schedule = self._by_id.get(schedule_id)
+            if schedule is not None:
+                if schedule.get('active_browser_id') == browser_id:
+                    schedule['status'] = 'pending'
+                    schedule['active_browser_id'] = None
+                    schedule['manual_stop'] = False
 
-                        self._mark_dirty()
-                        self.save_schedules()
-                        logger.info(f"Schedule {schedule_id} moved to next time slot (browser_id: {browser_id})")
-                        return True
+                    if schedule.get('daily'):
+                        logger.info(f"Moving daily schedule {schedule_id} to next day")
+                        start_t = _parse_daily_time(schedule['start_time'])
+                        tz = self._get_tz(schedule)
+                        now_local = self._now(schedule)
+                        tomorrow = now_local.date() + timedelta(days=1)
+                        next_start = datetime.combine(tomorrow, start_t, tzinfo=tz)
+                        schedule['next_check'] = self._store_dt(next_start)
+                        logger.info(f"Daily schedule {schedule_id} moved to {next_start}")
+                    elif schedule.get('repeat'):
+                        logger.info(f"Moving weekly schedule {schedule_id} to next week")
+                        self._reschedule_next_week(schedule)
+                    else:
+                        logger.info(f"One-time schedule {schedule_id} stopped, marking as completed")
+                        schedule['status'] = 'completed'
+                        self._update_next_check(schedule)
+
+                    self._push_due(0, schedule_id)
+                    self._request_save()
+                    logger.info(f"Schedule {schedule_id} moved to next time slot (browser_id: {browser_id})")
+                    return True
 
         return False
 
     def pause_schedule(self, schedule_id):
         """Toggle the paused state of a schedule."""
         with self.lock:
-            for schedule in self.schedules:
-                if schedule['id'] == schedule_id:
-                    currently_paused = schedule.get('paused', False)
-                    schedule['paused'] = not currently_paused
-                    if schedule['paused']:
-                        schedule['status'] = 'paused'
-                    else:
-                        # Resuming — recalculate next check and set pending
-                        schedule['status'] = 'pending'
-                        self._update_next_check(schedule)
-                    self._mark_dirty()
-                    self.save_schedules()
-                    logger.info(f"Schedule {schedule_id} {'paused' if schedule['paused'] else 'unpaused'}")
-                    return schedule
+            schedule = self._by_id.get(schedule_id)
+            if schedule is not None:
+                currently_paused = schedule.get('paused', False)
+                schedule['paused'] = not currently_paused
+                if schedule['paused']:
+                    schedule['status'] = 'paused'
+                else:
+                    # Resuming — recalculate next check and set pending
+                    schedule['status'] = 'pending'
+                    self._update_next_check(schedule)
+                    self._push_due(0, schedule_id)
+                self._request_save()
+                logger.info(f"Schedule {schedule_id} {'paused' if schedule['paused'] else 'unpaused'}")
+                return schedule
         return None
 
     def pause_all_for_manual(self, browser_id):
@@ -270,25 +402,38 @@ class Scheduler:
         if not ids_to_resume:
             return
         with self.lock:
-            for schedule in self.schedules:
-                if schedule['id'] in ids_to_resume and schedule.get('auto_paused'):
+            for schedule_id in ids_to_resume:
+                schedule = self._by_id.get(schedule_id)
+                if schedule is not None and schedule.get('auto_paused'):
                     del schedule['auto_paused']
                     if not schedule.get('paused', False):
                         schedule['status'] = 'pending'
                         self._update_next_check(schedule)
+                        self._push_due(0, schedule_id)
+                        self._mark_dirty()
         logger.info(f"Auto-resumed {len(ids_to_resume)} schedule(s) after manual session {browser_id}")
 
     def get_schedules(self):
-        """Get all schedules — active schedules sorted by next_check, paused schedules at the bottom."""
-        sorted_schedules = sorted(
-            self.schedules,
-            key=lambda s: (
-                s.get('paused', False),        # paused go last
-                s.get('next_check') is None,
-                s.get('next_check') or ''
+        """Get all schedules — active schedules sorted by next_check, paused schedules at the bottom.
+
+        The order is cached and only recomputed after a change, so repeated
+        polling of the list costs a copy rather than a sort.
+        """
+        seq, sorted_schedules = self._sorted_cache
+        if seq != self._change_seq:
+            # Read the counter first: a change during the sort leaves the
+            # cache stale, so the next call sorts again
+            seq = self._change_seq
+            sorted_schedules = sorted(
+                self.schedules,
+                key=lambda s: (
+                    s.get('paused', False),        # paused go last
+                    s.get('next_check') is None,
+                    s.get('next_check') or ''
+                )
             )
-        )
-        return sorted_schedules
+            self._sorted_cache = (seq, sorted_schedules)
+        return list(sorted_schedules)
 
     def refresh_all_schedule_times(self):
         """
@@ -307,10 +452,10 @@ class Scheduler:
                 schedule['manual_stop'] = False
                 schedule['last_check'] = None
                 self._update_next_check(schedule)
+                self._push_due(0, schedule['id'])
                 count += 1
 
-            self._mark_dirty()
-            self.save_schedules()
+            self._request_save()
             logger.info(f"Reset {count} schedules to fresh state")
             return count
 
@@ -327,138 +472,258 @@ class Scheduler:
     def stop(self):
         """Stop the scheduler loop"""
         self.running = False
+        self._wake_event.set()
+        if self._check_pool:
+            self._check_pool.shutdown(wait=False)
+            self._check_pool = None
         if self.thread:
             self.thread.join(timeout=2)
             logger.info("Scheduler stopped")
+        self.flush()
 
     def _run_loop(self):
         """Main scheduler loop"""
         logger.info("Scheduler loop running")
         while self.running:
+            self._wake_event.clear()
             try:
                 self._check_schedules()
+                # One write per iteration for everything changed since the last
+                self.flush()
             except Exception as e:
                 logger.error(f"Scheduler loop error: {e}")
 
-            for _ in range(30):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Sleep until the soonest schedule is due (at most CHECK_INTERVAL,
+            # and at least a second so a past due time cannot spin the loop)
+            now_ts = time.time()
+            with self.lock:
+                due = self._due_heap[0][0] if self._due_heap else now_ts + CHECK_INTERVAL
+                timeout = min(CHECK_INTERVAL, max(1.0, due - now_ts))
+                self._wake_at = now_ts + timeout
+            self._wake_event.wait(timeout)
+            self._wake_at = 0.0
 
     def _check_schedules(self):
-        """Check all schedules and run tasks if needed"""
+        """Visit the schedules that are due and run tasks if needed"""
+        now_ts = time.time()
+        # Idle tick: nothing due yet, so skip the lock entirely. Reading the
+        # heap top unlocked is safe; a push racing with it is seen next tick
+        heap = self._due_heap
+        if not heap or heap[0][0] > now_ts:
+            return
+
+        # Hold the lock only to take the due snapshot, not for the whole pass
         with self.lock:
-            for schedule in self.schedules:
-                # Skip paused schedules (user-paused or auto-paused for manual session)
-                if schedule.get('paused', False) or schedule.get('auto_paused', False):
+            # Drain everything due first so a schedule re-queued as due now
+            # waits for the next tick
+            heap = self._due_heap
+            due_ids = []
+            while heap and heap[0][0] <= now_ts:
+                _, seq, schedule_id = heapq.heappop(heap)
+                # Entries superseded by a later push are skipped
+                if self._due_seq.get(schedule_id) == seq:
+                    del self._due_seq[schedule_id]
+                    due_ids.append(schedule_id)
+
+        for schedule_id in due_ids:
+            # Short critical section per schedule, so API calls interleave with
+            # the pass; a schedule removed meanwhile is simply gone
+            with self.lock:
+                schedule = self._by_id.get(schedule_id)
+                if schedule is None:
                     continue
+                due = self._visit_schedule(schedule, now_ts)
+                # An edit during the pass has already re-queued it
+                if due is not None and schedule_id not in self._due_seq:
+                    self._push_due(due, schedule_id)
 
-                if schedule['status'] == 'completed' and not schedule.get('daily'):
-                    continue
+    def _visit_schedule(self, schedule, now_ts):
+        """
+        Check one due schedule. Must be called with self.lock held.
 
-                # Skip schedules that are already being checked by a running thread
-                if schedule.get('status') == 'checking':
-                    continue
+        Args:
+            schedule (dict): The due schedule
+            now_ts (float): Epoch seconds of the tick; every time comparison
+                for the schedule uses this one instant
 
-                try:
-                    # Compute now in the schedule's timezone (or naive if none stored)
-                    tz = self._get_tz(schedule)
-                    now = self._now(schedule)
+        Returns:
+            float or None: When it is next due (epoch seconds), or None if it
+            needs no visit until something changes it
+        """
+        # Skip paused schedules (user-paused or auto-paused for manual session);
+        # unpausing queues them again
+        if schedule.get('paused', False) or schedule.get('auto_paused', False):
+            return None
 
-                    if schedule.get('daily'):
-                        self._check_daily_schedule(schedule, now)
-                    else:
-                        start_dt = self._parse_dt(schedule['start_time'], tz)
-                        end_dt   = self._parse_dt(schedule['end_time'],   tz)
-
-                        if now > end_dt:
-                            if schedule['repeat']:
-                                self._reschedule_next_week(schedule)
-                            else:
-                                if schedule['status'] != 'download_started':
-                                    schedule['status'] = 'completed'
-                                schedule['active_browser_id'] = None
-                                schedule['manual_stop'] = False
-                            continue
-
-                        if start_dt <= now <= end_dt:
-                            if schedule['status'] == 'download_started':
-                                active_browser_id = schedule.get('active_browser_id')
-                                if self._is_download_active(active_browser_id):
-                                    continue
-                                else:
-                                    logger.info(f"Download {active_browser_id} stopped for schedule {schedule['id']}, resuming stream checks")
-                                    schedule['status'] = 'active'
-                                    schedule['active_browser_id'] = None
-                                    schedule['next_check'] = None  # re-check immediately on next tick
-
-                            if schedule['status'] != 'active':
-                                next_check_val = schedule.get('next_check')
-                                if next_check_val:
-                                    try:
-                                        next_check_dt = self._parse_dt(next_check_val, tz)
-                                        if next_check_dt <= end_dt:
-                                            schedule['status'] = 'active'
-                                    except (ValueError, TypeError):
-                                        schedule['status'] = 'active'
-                                else:
-                                    schedule['status'] = 'active'
-
-                            next_check = schedule.get('next_check')
-                            if not next_check or now >= self._parse_dt(next_check, tz):
-                                self._perform_check(schedule)
-
-                        elif now < start_dt:
-                            schedule['status'] = 'pending'
-                            next_check = schedule.get('next_check')
-                            if not next_check:
-                                self._update_next_check(schedule)
-                            else:
-                                try:
-                                    if self._parse_dt(next_check, tz) < now:
-                                        self._update_next_check(schedule)
-                                except (ValueError, TypeError):
-                                    self._update_next_check(schedule)
-
-                except Exception as e:
-                    logger.error(f"Error processing schedule {schedule['id']}: {e}")
+        if schedule['status'] == 'completed' and not schedule.get('daily'):
+            return None
 
-            self.save_schedules()
+        # Skip schedules that are already being checked by a running thread
+        if schedule.get('status') == 'checking':
+            return now_ts + CHECK_INTERVAL
 
-    def _check_daily_schedule(self, schedule, now):
+        before = tuple(schedule.get(f) for f in _CHECK_STATE_FIELDS)
+        try:
+            # Compute now in the schedule's timezone (or naive if none stored)
+            now = self._now(schedule, now_ts)
+
+            if schedule.get('daily'):
+                self._check_daily_schedule(schedule, now)
+            else:
+                self._check_regular_schedule(schedule, now)
+            return self._next_due(schedule, now, now_ts)
+
+        except Exception as e:
+            logger.error(f"Error processing schedule {schedule['id']}: {e}")
+            return now_ts + CHECK_INTERVAL
+        finally:
+            if tuple(schedule.get(f) for f in _CHECK_STATE_FIELDS) != before:
+                self._mark_dirty()
+
+    def _check_regular_schedule(self, schedule, now):
+        """Check a one-time or weekly schedule (ISO datetime window)."""
+        tz = self._get_tz(schedule)
+        start_dt = self._parse_dt(schedule['start_time'], tz)
+        end_dt   = self._parse_dt(schedule['end_time'],   tz)
+
+        if now > end_dt:
+            if schedule['repeat']:
+                self._reschedule_next_week(schedule, now)
+            else:
+                if schedule['status'] != 'download_started':
+                    schedule['status'] = 'completed'
+                schedule['active_browser_id'] = None
+                schedule['manual_stop'] = False
+            return
+
+        if start_dt <= now <= end_dt:
+            if schedule['status'] == 'download_started':
+                active_browser_id = schedule.get('active_browser_id')
+                if self._is_download_active(active_browser_id):
+                    return
+                else:
+                    logger.info(f"Download {active_browser_id} stopped for schedule {schedule['id']}, resuming stream checks")
+                    schedule['status'] = 'active'
+                    schedule['active_browser_id'] = None
+                    schedule['next_check'] = None  # re-check immediately on next tick
+
+            if schedule['status'] != 'active':
+                next_check_val = schedule.get('next_check')
+                if next_check_val:
+                    try:
+                        next_check_dt = self._parse_dt(next_check_val, tz)
+                        if next_check_dt <= end_dt:
+                            schedule['status'] = 'active'
+                    except (ValueError, TypeError):
+                        schedule['status'] = 'active'
+                else:
+                    schedule['status'] = 'active'
+
+            next_check = schedule.get('next_check')
+            if not next_check or now >= self._parse_dt(next_check, tz):
+                self._perform_check(schedule, now)
+
+        elif now < start_dt:
+            schedule['status'] = 'pending'
+            next_check = schedule.get('next_check')
+            if not next_check:
+                self._update_next_check(schedule, now)
+            else:
+                try:
+                    if self._parse_dt(next_check, tz) < now:
+                        self._update_next_check(schedule, now)
+                except (ValueError, TypeError):
+                    self._update_next_check(schedule, now)
+
+    def _next_due(self, schedule, now, now_ts):
         """
-        Check a daily schedule (time-based, repeats every day).
+        Work out when a just-visited schedule next needs attention.
 
-        Handles:
-        - Midnight-spanning windows (e.g., 23:00-01:00)
-        - Status transitions (pending -> active -> checking -> download_started)
-        - Auto-resume on download failures (unless manually stopped)
-        - Proper reset when time window ends
+        A schedule only changes state at its window start, its next_check and
+        its window end, so it is not visited in between. Schedules waiting on
+        a check or a download are polled every CHECK_INTERVAL. Visiting early
+        is harmless, and anything else that changes a schedule queues it again.
+
+        Args:
+            schedule (dict): The schedule just visited
+            now (datetime): Current datetime in the schedule's timezone
+            now_ts (float): The same instant in epoch seconds
+
+        Returns:
+            float or None: Epoch seconds it is next due, or None if never
         """
-        start_time_str = schedule['start_time']
-        end_time_str = schedule['end_time']
+        daily = schedule.get('daily')
+        status = schedule['status']
+        if status == 'completed' and not daily:
+            return None
+
+        poll = now_ts + CHECK_INTERVAL
+        if status == 'checking':
+            return poll
+
         tz = self._get_tz(schedule)
+        if daily:
+            start_dt, end_dt = self._daily_window(schedule, now)
+        else:
+            start_dt = self._parse_dt(schedule['start_time'], tz)
+            end_dt   = self._parse_dt(schedule['end_time'],   tz)
 
-        today = now.date()
-        start_hour, start_min = map(int, start_time_str.split(':'))
-        end_hour, end_min = map(int, end_time_str.split(':'))
+        if now < start_dt:
+            return start_dt.timestamp()
+
+        next_check = schedule.get('next_check')
+        if now <= end_dt:
+            if status == 'download_started' or not next_check:
+                return poll
+            return min(self._parse_dt(next_check, tz), end_dt).timestamp()
 
-        def _combine(d, h, m):
-            return datetime.combine(d, dtime(h, m), tzinfo=tz) if tz else datetime.combine(d, dtime(h, m))
+        if not daily:
+            # One-time window is over; a weekly one has just been moved ahead,
+            # so look again rather than dropping it
+            return poll if schedule.get('repeat') else None
 
-        start_dt = _combine(today, start_hour, start_min)
-        end_dt   = _combine(today, end_hour,   end_min)
+        # Daily window passed: the reset scheduled the next window start
+        if next_check:
+            return max(self._parse_dt(next_check, tz).timestamp(), poll)
+        return poll
 
-        spans_midnight = end_hour < start_hour or (end_hour == start_hour and end_min < start_min)
+    def _daily_window(self, schedule, now):
+        """
+        Return the (start, end) datetimes of the daily window relevant to now.
+
+        For a midnight-spanning window (e.g., 23:00-01:00) seen before its start
+        time, that is the window that began yesterday.
+        """
+        tz = self._get_tz(schedule)
+        today = now.date()
+        start_t = _parse_daily_time(schedule['start_time'])
+        end_t = _parse_daily_time(schedule['end_time'])
+
+        start_dt = datetime.combine(today, start_t, tzinfo=tz)
+        end_dt   = datetime.combine(today, end_t,   tzinfo=tz)
 
-        if spans_midnight:
-            if now.time().replace(tzinfo=None) < dtime(start_hour, start_min):
+        if end_t < start_t:  # spans midnight
+            if now.time().replace(tzinfo=None) < start_t:
                 yesterday = today - timedelta(days=1)
-                start_dt = _combine(yesterday, start_hour, start_min)
-                end_dt   = _combine(today,     end_hour,   end_min)
+                start_dt = datetime.combine(yesterday, start_t, tzinfo=tz)
             else:
                 end_dt = end_dt + timedelta(days=1)
 
+        return start_dt, end_dt
+
+    def _check_daily_schedule(self, schedule, now):
+        """
+        Check a daily schedule (time-based, repeats every day).
+
+        Handles:
+        - Midnight-spanning windows (e.g., 23:00-01:00)
+        - Status transitions (pending -> active -> checking -> download_started)
+        - Auto-resume on download failures (unless manually stopped)
+        - Proper reset when time window ends
+        """
+        tz = self._get_tz(schedule)
+        start_dt, end_dt = self._daily_window(schedule, now)
+
         if start_dt <= now <= end_dt:
             if schedule['status'] == 'download_started':
                 active_browser_id = schedule.get('active_browser_id')
@@ -484,19 +749,19 @@ class Scheduler:
 
             next_check = schedule.get('next_check')
             if not next_check or now >= self._parse_dt(next_check, tz):
-                self._perform_check(schedule)
+                self._perform_check(schedule, now)
 
         elif now < start_dt:
             schedule['status'] = 'pending'
             next_check = schedule.get('next_check')
             if not next_check:
-                self._update_next_check(schedule)
+                self._update_next_check(schedule, now)
             else:
                 try:
                     if self._parse_dt(next_check, tz) < now:
-                        self._update_next_check(schedule)
+                        self._update_next_check(schedule, now)
                 except (ValueError, TypeError):
-                    self._update_next_check(schedule)
+                    self._update_next_check(schedule, now)
 
         else:
             if schedule['status'] in ['active', 'download_started', 'checking']:
@@ -504,88 +769,93 @@ class Scheduler:
                 schedule['last_check'] = None
                 schedule['active_browser_id'] = None
                 schedule['manual_stop'] = False
-                self._update_next_check(schedule)
+                self._update_next_check(schedule, now)
 
-    def _update_next_check(self, schedule):
+    def _update_next_check(self, schedule, now=None):
         """
         Calculate next check time based on schedule window.
 
         Logic:
-        - Before window: Schedule check at window start
+        - Before window: Schedule check at window start (plus _start_jitter)
         - During window: Random 5-8 minute intervals
         - After window: Schedule for next occurrence (daily/weekly)
         - Handles midnight-spanning windows correctly
+
+        `now` defaults to the current time in the schedule's timezone.
         """
         tz  = self._get_tz(schedule)
-        now = self._now(schedule)
+        if now is None:
+            now = self._now(schedule)
 
         def _store(dt):
             return self._store_dt(dt)
 
         if schedule.get('daily'):
-            start_time_str = schedule['start_time']
-            end_time_str = schedule['end_time']
-
             today = now.date()
-            start_hour, start_min = map(int, start_time_str.split(':'))
-            end_hour, end_min = map(int, end_time_str.split(':'))
-
-            def _combine(d, h, m):
-                return datetime.combine(d, dtime(h, m), tzinfo=tz) if tz else datetime.combine(d, dtime(h, m))
-
-            start_dt = _combine(today, start_hour, start_min)
-            end_dt   = _combine(today, end_hour,   end_min)
+            start_t = _parse_daily_time(schedule['start_time'])
+            end_t = _parse_daily_time(schedule['end_time'])
+            spans_midnight = end_t < start_t
+            before_start = now.time().replace(tzinfo=None) < start_t
+            start_dt, end_dt = self._daily_window(schedule, now)
 
-            spans_midnight = end_hour < start_hour or (end_hour == start_hour and end_min < start_min)
-
-            if spans_midnight:
-                if now.time().replace(tzinfo=None) < dtime(start_hour, start_min):
-                    yesterday = today - timedelta(days=1)
-                    start_dt = _combine(yesterday, start_hour, start_min)
-                    end_dt   = _combine(today,     end_hour,   end_min)
-                else:
-                    end_dt = end_dt + timedelta(days=1)
+            jitter = _start_jitter(schedule['id'], end_dt - start_dt)
 
             if now < start_dt:
-                schedule['next_check'] = _store(start_dt)
-                logger.debug(f"Schedule {schedule['id']}: next check set to window start: {start_dt}")
+                schedule['next_check'] = _store(start_dt + jitter)
+                logger.debug("Schedule %s: next check set to window start: %s", schedule['id'], start_dt + jitter)
             elif start_dt <= now <= end_dt:
                 minutes = random.uniform(5, 8)
                 next_dt = min(now + timedelta(minutes=minutes), end_dt)
                 schedule['next_check'] = _store(next_dt)
-                logger.debug(f"Schedule {schedule['id']}: next check in {minutes:.1f} mins: {next_dt}")
+                logger.debug("Schedule %s: next check in %.1f mins: %s", schedule['id'], minutes, next_dt)
             else:
-                if spans_midnight and now.time().replace(tzinfo=None) < dtime(start_hour, start_min):
-                    next_start = _combine(today,                          start_hour, start_min)
+                if spans_midnight and before_start:
+                    next_start = datetime.combine(today,                     start_t, tzinfo=tz)
                 else:
-                    next_start = _combine(today + timedelta(days=1), start_hour, start_min)
+                    next_start = datetime.combine(today + timedelta(days=1), start_t, tzinfo=tz)
+                next_start += jitter
 
                 schedule['next_check'] = _store(next_start)
-                logger.debug(f"Schedule {schedule['id']}: next check set to next window start: {next_start}")
+                logger.debug("Schedule %s: next check set to next window start: %s", schedule['id'], next_start)
 
         else:
             start_dt = self._parse_dt(schedule['start_time'], tz)
             end_dt   = self._parse_dt(schedule['end_time'],   tz)
 
             if now < start_dt:
-                schedule['next_check'] = _store(start_dt)
-                logger.debug(f"Schedule {schedule['id']}: next check set to window start: {start_dt}")
+                first_check = start_dt + _start_jitter(schedule['id'], end_dt - start_dt)
+                schedule['next_check'] = _store(first_check)
+                logger.debug("Schedule %s: next check set to window start: %s", schedule['id'], first_check)
             elif start_dt <= now <= end_dt:
                 minutes = random.uniform(5, 8)
                 next_dt = min(now + timedelta(minutes=minutes), end_dt)
                 schedule['next_check'] = _store(next_dt)
-                logger.debug(f"Schedule {schedule['id']}: next check in {minutes:.1f} mins: {next_dt}")
+                logger.debug("Schedule %s: next check in %.1f mins: %s", schedule['id'], minutes, next_dt)
             else:
                 schedule['next_check'] = None
-                logger.debug(f"Schedule {schedule['id']}: window passed, clearing next_check")
+                logger.debug("Schedule %s: window passed, clearing next_check", schedule['id'])
+
+    def _reschedule_next_week(self, schedule, now=None):
+        """
+        Move schedule forward by whole weeks until its window has not ended yet.
+
+        A schedule that is several weeks stale (e.g. the app was down) catches
+        up in one call. `now` defaults to the current time in the schedule's
+        timezone and is passed on to _update_next_check.
+        """
+        if now is None:
+            now = self._now(schedule)
+        start_dt = _fromisoformat(schedule['start_time'])
+        end_dt = _fromisoformat(schedule['end_time'])
 
-    def _reschedule_next_week(self, schedule):
-        """Move schedule to next week"""
-        start_dt = datetime.fromisoformat(schedule['start_time'])
-        end_dt = datetime.fromisoformat(schedule['end_time'])
+        week = timedelta(days=7)
+        weeks = 1
+        end_cmp = self._parse_dt(schedule['end_time'], self._get_tz(schedule))
+        while now > end_cmp + weeks * week:
+            weeks += 1
 
-        new_start = start_dt + timedelta(days=7)
-        new_end = end_dt + timedelta(days=7)
+        new_start = start_dt + weeks * week
+        new_end = end_dt + weeks * week
 
         schedule['start_time'] = new_start.isoformat()
         schedule['end_time'] = new_end.isoformat()
@@ -593,7 +863,7 @@ class Scheduler:
         schedule['active_browser_id'] = None
         schedule['manual_stop'] = False
 
-        self._update_next_check(schedule)
+        self._update_next_check(schedule, now)
         logger.info(f"Rescheduled {schedule['id']} to next week: {new_start}")
 
     def _is_download_active(self, browser_id):
@@ -601,34 +871,26 @@ class Scheduler:
         Check if a specific download is still active.
 
         Returns True if the download exists in the queue and has no completed_at.
-        Uses get_download_status (which holds _queue_lock) to avoid a TOCTOU race.
+        Uses is_download_running (one lookup under _queue_lock) to avoid a
+        TOCTOU race without building a full status dict.
         """
         try:
             if not browser_id:
                 return False
 
-            dl_status = self.browser_service.download_service.get_download_status(browser_id)
-
-            if dl_status is None:
-                logger.debug(f"Download {browser_id} not found in queue")
-                return False
-
-            is_active = not dl_status.get('completed', False)
-            if is_active:
-                logger.debug(f"Download {browser_id} is still active")
-            else:
-                logger.debug(f"Download {browser_id} has completed")
+            is_active = self.browser_service.download_service.is_download_running(browser_id)
+            logger.debug("Download %s %s", browser_id, 'is still active' if is_active else 'is not running')
             return is_active
 
         except Exception as e:
             logger.error(f"Error checking download status for {browser_id}: {e}")
             return False
 
-    def _perform_check(self, schedule):
+    def _perform_check(self, schedule, now=None):
         """Perform the actual browser check for a schedule.
 
-        Sets status to 'checking' before spawning the thread to prevent
-        duplicate check threads from being spawned on subsequent loop iterations.
+        Sets status to 'checking' before submitting the task to the check pool
+        to prevent duplicate checks from being queued on subsequent loop iterations.
         """
         # Guard: mark as checking before the thread starts
         schedule['status'] = 'checking'
@@ -636,15 +898,16 @@ class Scheduler:
 
         duration = random.uniform(20, 60)
 
-        check_thread = threading.Thread(
-            target=self._run_browser_check_task,
-            args=(schedule, duration),
-            daemon=True,
-        )
-        check_thread.start()
+        # Reuse pooled threads instead of starting one per check
+        if self._check_pool is None:
+            self._check_pool = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_CHECKS,
+                thread_name_prefix='sched-check'
+            )
+        self._check_pool.submit(self._run_browser_check_task, schedule, duration)
 
         # Update next check time so the loop doesn't re-trigger immediately
-        self._update_next_check(schedule)
+        self._update_next_check(schedule, now)
 
     def _run_browser_check_task(self, schedule, duration):
         """The actual browser check task running in a separate thread."""
@@ -667,51 +930,38 @@ class Scheduler:
                 logger.warning(f"Failed to start browser for schedule {schedule['id']}")
                 # Revert status so next loop can retry
                 with self.lock:
-                    for s in self.schedules:
-                        if s['id'] == schedule['id'] and s.get('status') == 'checking':
-                            s['status'] = 'active'
-                            self._mark_dirty()
-                            break
+                    s = self._by_id.get(schedule['id'])
+                    if s is not None and s.get('status') == 'checking':
+                        s['status'] = 'active'
+                        self._mark_dirty()
                 return
 
-            start_wait = time.time()
-            while time.time() - start_wait < duration:
-                status = self.browser_service.get_browser_status(browser_id)
-                if not status:
-                    break
-
-                dl_status = self.browser_service.download_service.get_download_status(browser_id)
-                if dl_status:
-                    logger.info(f"Download started for schedule {schedule['id']}! (browser_id: {browser_id})")
-
-                    with self.lock:
-                        for s in self.schedules:
-                            if s['id'] == schedule['id']:
-                                s['status'] = 'download_started'
-                                s['active_browser_id'] = browser_id
-                                self._mark_dirty()
-                                self.save_schedules()
-                                break
-
-                    break
-
-                time.sleep(1)
-
-            # Loop exited without detecting a download in the polling window.
-            # Check download_queue directly — the download callback may have fired
-            # just before the browser was closed externally (e.g. by _ensure_chrome_closed
-            # launching the next queued browser), causing the poll loop to miss it.
+            # Wakes as soon as the detector starts a download or closes
+            detector.download_started_event.wait(timeout=duration)
+            if self.browser_service.download_service.get_download_status(browser_id):
+                logger.info(f"Download started for schedule {schedule['id']}! (browser_id: {browser_id})")
+
+                with self.lock:
+                    s = self._by_id.get(schedule['id'])
+                    if s is not None:
+                        s['status'] = 'download_started'
+                        s['active_browser_id'] = browser_id
+                        self._request_save()
+
+            # Still 'checking' if no download was seen. Check download_queue directly —
+            # the download callback may have fired just before the browser was
+            # closed externally (e.g. by _ensure_chrome_closed launching the next
+            # queued browser).
             with self.lock:
-                for s in self.schedules:
-                    if s['id'] == schedule['id'] and s.get('status') == 'checking':
-                        if self._is_download_active(browser_id):
-                            logger.info(f"Download {browser_id} found after loop exit for schedule {schedule['id']}, marking as started")
-                            s['status'] = 'download_started'
-                            s['active_browser_id'] = browser_id
-                        else:
-                            s['status'] = 'active'
-                        self._mark_dirty()
-                        break
+                s = self._by_id.get(schedule['id'])
+                if s is not None and s.get('status') == 'checking':
+                    if self._is_download_active(browser_id):
+                        logger.info(f"Download {browser_id} found after loop exit for schedule {schedule['id']}, marking as started")
+                        s['status'] = 'download_started'
+                        s['active_browser_id'] = browser_id
+                    else:
+                        s['status'] = 'active'
+                    self._mark_dirty()
 
             logger.info(f"Closing browser for schedule {schedule['id']}")
             self.browser_service.close_browser(browser_id)
@@ -719,16 +969,15 @@ class Scheduler:
         except Exception as e:
             logger.error(f"Error in browser check task: {e}")
             with self.lock:
-                for s in self.schedules:
-                    if s['id'] == schedule['id'] and s.get('status') == 'checking':
-                        if self._is_download_active(browser_id):
-                            logger.info(f"Download {browser_id} found after error for schedule {schedule['id']}, marking as started")
-                            s['status'] = 'download_started'
-                            s['active_browser_id'] = browser_id
-                        else:
-                            s['status'] = 'active'
-                        self._mark_dirty()
-                        break
+                s = self._by_id.get(schedule['id'])
+                if s is not None and s.get('status') == 'checking':
+                    if self._is_download_active(browser_id):
+                        logger.info(f"Download {browser_id} found after error for schedule {schedule['id']}, marking as started")
+                        s['status'] = 'download_started'
+                        s['active_browser_id'] = browser_id
+                    else:
+                        s['status'] = 'active'
+                    self._mark_dirty()
             try:
                 self.browser_service.close_browser(browser_id)
             except Exception:
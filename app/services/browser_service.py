@@ -2,13 +2,98 @@ import os
 import time
 import logging
 import subprocess
+import psutil
 import shutil
 import threading
-import queue
+from dataclasses import dataclass
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from app.models import StreamDetector
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for closed Chrome processes to exit before killing them
+CHROME_EXIT_TIMEOUT = 8
+# Threads deleting profile entries in parallel when clearing cookies
+CLEAR_COOKIES_WORKERS = 8
+# Exact process names swept before the Chrome profile is deleted
+CHROME_PROCESS_NAMES = frozenset({
+    'chrome', 'google-chrome', 'chromedriver', 'chrome_crashpad_handler',
+})
+
+# argv of the (Chrome, ChromeDriver) version probes
+_VERSION_PROBES = (
+    ('google-chrome', '--version'),
+    ('chromedriver', '--version'),
+)
+
+
+def _run_all(cmds, timeout=5):
+    """
+    Run commands concurrently and return their stripped stdout, in order.
+
+    Raises like subprocess.run(..., timeout=...) would; commands still
+    running when one fails are killed.
+    """
+    procs = []
+    try:
+        for cmd in cmds:
+            procs.append(subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                          stderr=subprocess.PIPE, text=True))
+        # All were started together, so they share one deadline
+        deadline = time.monotonic() + timeout
+        return [proc.communicate(timeout=max(0, deadline - time.monotonic()))[0].strip()
+                for proc in procs]
+    finally:
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+@lru_cache(maxsize=1)
+def _probe_versions():
+    """
+    Return the (Chrome, ChromeDriver) version strings.
+
+    The installed binaries do not change while the app runs, so they are
+    only run once; a failed probe raises and is retried on the next call.
+    """
+    chrome_version, driver_version = _run_all(_VERSION_PROBES)
+    return chrome_version, driver_version
+
+
+@dataclass(slots=True)
+class BrowserSlot:
+    """
+    An entry of BrowserService.active_browsers.
+
+    A launch is tracked from the moment it is queued: status is 'queued',
+    then 'launching', 'active' once its detector exists, and 'closing'
+    while close_browser shuts it down.
+    """
+
+    status: str
+    url: str
+    resolution: str
+    framerate: str
+    detector: Optional[StreamDetector] = None
+
+    @property
+    def launched(self):
+        """True once the slot holds a detector"""
+        return self.detector is not None
+
+    def to_status(self):
+        """Return the status dict reported while the browser is not launched yet"""
+        return {
+            'status': self.status,
+            'url': self.url,
+            'resolution': self.resolution,
+            'framerate': self.framerate
+        }
+
 
 class BrowserService:
     """Manages browser instances and stream detection"""
@@ -16,150 +101,81 @@ class BrowserService:
     def __init__(self, config, download_service):
         self.config = config
         self.download_service = download_service
-        self.active_browsers = {}
+        self.active_browsers = {}  # browser_id -> BrowserSlot
 
-        # Queue for browser launch requests
-        self.browser_queue = queue.Queue()
-        self.queue_processor_thread = None
-        self.queue_running = False
+        # Browser launches run one at a time on a single worker, so only one
+        # Chrome uses the shared profile at once
+        self._launch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser-launch')
         self.queue_lock = threading.Lock()
+        # chromedriver/Chrome processes of launched browsers, waited on before
+        # the next launch instead of scanning the whole process table
+        self._chrome_procs = []
 
         self._manual_active = False  # set True while a manual session is running
 
-        # Start queue processor
-        self._start_queue_processor()
-
     def start_browser(self, url, browser_id, resolution='1080p', framerate='any', auto_download=False, filename=None, output_format='mp4'):
         """
         Queue a browser instance for stream detection.
 
-        This method adds the browser launch request to a queue and waits for it to complete.
-        The queue ensures that only one Chrome window is active at a time, preventing cookie conflicts.
+        This method submits the browser launch to the launch executor and waits for it to complete.
+        The single launch worker ensures that only one Chrome window is active at a time, preventing cookie conflicts.
         """
-        # Create a threading event to signal completion
-        completion_event = threading.Event()
-        result_container = {'success': False, 'detector': None}
-
-        # Package the request
-        request = {
-            'url': url,
-            'browser_id': browser_id,
-            'resolution': resolution,
-            'framerate': framerate,
-            'auto_download': auto_download,
-            'filename': filename,
-            'output_format': output_format,
-            'completion_event': completion_event,
-            'result': result_container
-        }
-
         # Add placeholder to active_browsers to show "queued" status
         with self.queue_lock:
-            self.active_browsers[browser_id] = {
-                'status': 'queued',
-                'url': url,
-                'resolution': resolution,
-                'framerate': framerate
-            }
+            self.active_browsers[browser_id] = BrowserSlot('queued', url, resolution, framerate)
 
-        # Add to queue
         logger.info(f"Queueing browser launch for {browser_id}")
-        self.browser_queue.put(request)
-
-        # Wait for completion
-        completion_event.wait()
-
-        return result_container['success'], result_container['detector']
-
-    def _start_queue_processor(self):
-        """Start the background thread that processes browser launch requests"""
-        if self.queue_running:
-            return
-
-        self.queue_running = True
-        self.queue_processor_thread = threading.Thread(target=self._process_browser_queue, daemon=True)
-        self.queue_processor_thread.start()
-        logger.info("Browser queue processor started")
+        future = self._launch_executor.submit(
+            self._run_launch_request,
+            url, browser_id, resolution, framerate, auto_download, filename, output_format
+        )
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error in browser launch for {browser_id}: {e}")
+            return False, None
 
     def set_manual_active(self, active: bool):
         """Signal whether a manual browser/download session is in progress."""
         self._manual_active = active
         logger.info(f"Manual session {'started' if active else 'ended'}")
 
-    def _process_browser_queue(self):
-        """Background thread that processes browser launch requests one by one"""
-        logger.info("Browser queue processor thread running")
-
-        while self.queue_running:
-            try:
-                # Wait for a request with timeout to allow checking queue_running flag
-                try:
-                    request = self.browser_queue.get(timeout=1)
-                except queue.Empty:
-                    continue
-
-                browser_id = request['browser_id']
-
-                # Drop queued scheduled launches while a manual session is active
-                if self._manual_active and browser_id.startswith('sched_'):
-                    logger.info(f"Dropping queued scheduled launch {browser_id} — manual session active")
-                    with self.queue_lock:
-                        self.active_browsers.pop(browser_id, None)
-                    request['result']['success'] = False
-                    request['completion_event'].set()
-                    self.browser_queue.task_done()
-                    continue
-
-                # Update status from 'queued' to 'launching'
-                with self.queue_lock:
-                    if browser_id in self.active_browsers and isinstance(self.active_browsers[browser_id], dict):
-                        self.active_browsers[browser_id]['status'] = 'launching'
-                        logger.info(f"Launching {browser_id} (was queued)")
-
-                # Ensure all previous Chrome instances are fully closed
-                self._ensure_chrome_closed()
-
-                # Now launch the browser
-                success, detector = self._launch_browser_internal(
-                    url=request['url'],
-                    browser_id=request['browser_id'],
-                    resolution=request['resolution'],
-                    framerate=request['framerate'],
-                    auto_download=request['auto_download'],
-                    filename=request['filename'],
-                    output_format=request['output_format']
-                )
-
-                # Store result
-                request['result']['success'] = success
-                request['result']['detector'] = detector
-
-                # Signal completion
-                request['completion_event'].set()
-
-                # Mark task as done
-                self.browser_queue.task_done()
+    def _run_launch_request(self, url, browser_id, resolution, framerate, auto_download, filename, output_format):
+        """Launch one queued browser (runs on the launch worker, one request at a time)"""
+        # Drop queued scheduled launches while a manual session is active
+        if self._manual_active and browser_id.startswith('sched_'):
+            logger.info(f"Dropping queued scheduled launch {browser_id} — manual session active")
+            with self.queue_lock:
+                self.active_browsers.pop(browser_id, None)
+            return False, None
 
-            except Exception as e:
-                logger.error(f"Error in browser queue processor: {e}")
-                # Still signal completion even on error
-                if 'request' in locals() and request:
-                    request['completion_event'].set()
+        # Update status from 'queued' to 'launching'
+        with self.queue_lock:
+            slot = self.active_browsers.get(browser_id)
+            if slot is not None and slot.status == 'queued':
+                slot.status = 'launching'
+                logger.info(f"Launching {browser_id} (was queued)")
+
+        # Ensure all previous Chrome instances are fully closed
+        self._ensure_chrome_closed()
+
+        # Now launch the browser
+        return self._launch_browser_internal(
+            url=url,
+            browser_id=browser_id,
+            resolution=resolution,
+            framerate=framerate,
+            auto_download=auto_download,
+            filename=filename,
+            output_format=output_format
+        )
 
     def _ensure_chrome_closed(self):
         """
         Ensure all Chrome processes and browsers are fully closed before starting a new one.
-        Waits for a few extra seconds to be absolutely sure.
         """
         # Close all active browsers tracked by this service (skip queued ones)
-        browsers_to_close = []
-
-        with self.queue_lock:
-            # Create a snapshot of browsers to close (thread-safe)
-            for bid, browser in list(self.active_browsers.items()):
-                # Only close actual browsers, not queued placeholders
-                if not isinstance(browser, dict):
-                    browsers_to_close.append(bid)
+        browsers_to_close = self._snapshot_ids(launched_only=True)
 
         if browsers_to_close:
             logger.info("Closing all active browsers before launching new one...")
@@ -169,35 +185,81 @@ class BrowserService:
                 except Exception as e:
                     logger.warning(f"Error closing browser {bid}: {e}")
 
-        # Poll for Chrome to exit — no unconditional sleep upfront
-        max_wait = 8  # Maximum 8 seconds to wait
-        wait_count = 0
+        # Returns once every tracked process has exited (or been killed and
+        # reaped), so their profile locks are already released
+        self._wait_for_chrome_exit()
+        logger.info("Chrome ready to launch")
+
+    def _snapshot_ids(self, launched_only=False):
+        """
+        Return the tracked browser IDs, taken under one lock acquisition.
 
-        while wait_count < max_wait:
+        Args:
+            launched_only: Skip queued placeholders and return only launched browsers
+        """
+        with self.queue_lock:
+            if launched_only:
+                return [bid for bid, slot in self.active_browsers.items() if slot.launched]
+            return list(self.active_browsers)
+
+    def _track_chrome(self, detector):
+        """Remember the chromedriver processes (and their Chrome children) a detector started"""
+        procs = []
+        for pid in getattr(detector, 'chromedriver_pids', ()):
             try:
-                # Check for Chrome processes (platform-specific)
-                if os.name == 'nt':  # Windows
-                    result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq chrome.exe'],
-                                          capture_output=True, text=True, timeout=2)
-                    chrome_running = 'chrome.exe' in result.stdout
-                else:  # Linux/Mac
-                    result = subprocess.run(['pgrep', '-f', 'chrome'],
-                                          capture_output=True, text=True, timeout=2)
-                    chrome_running = len(result.stdout.strip()) > 0
-
-                if not chrome_running:
-                    break
-
-                time.sleep(1)
-                wait_count += 1
+                root = psutil.Process(pid)
+                procs.append(root)
+                procs.extend(root.children(recursive=True))
+            except psutil.Error as e:
+                logger.debug(f"Could not track chromedriver {pid}: {e}")
+        if procs:
+            with self.queue_lock:
+                self._chrome_procs.extend(procs)
 
-            except Exception as e:
-                logger.debug(f"Error checking Chrome processes: {e}")
-                break
+    def _wait_for_chrome_exit(self, timeout=CHROME_EXIT_TIMEOUT):
+        """
+        Wait for the tracked Chrome processes to exit, killing any that hang.
 
-        # Short buffer to let OS fully release any file locks
-        time.sleep(1)
-        logger.info("Chrome ready to launch")
+        Args:
+            timeout: Seconds to wait before killing; 0 kills them straight away
+        """
+        with self.queue_lock:
+            procs, self._chrome_procs = self._chrome_procs, []
+        if not procs:
+            return
+
+        # Pick up processes Chrome started after launch (renderers, GPU, ...)
+        tracked = {p.pid: p for p in procs}
+        for proc in procs:
+            try:
+                for child in proc.children(recursive=True):
+                    tracked.setdefault(child.pid, child)
+            except psutil.Error:
+                pass
+
+        _, alive = psutil.wait_procs(list(tracked.values()), timeout=timeout)
+        if alive:
+            logger.warning(f"Killing {len(alive)} Chrome process(es) that did not exit")
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+            psutil.wait_procs(alive, timeout=2)
+
+    def _kill_chrome_by_name(self):
+        """Kill every Chrome/chromedriver process, tracked or not, and wait for them to go"""
+        procs = [p for p in psutil.process_iter(['name'])
+                 if p.info['name'] in CHROME_PROCESS_NAMES]
+        if not procs:
+            return
+        logger.info(f"Killing {len(procs)} remaining Chrome process(es)")
+        for proc in procs:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(procs, timeout=3)
 
     def _launch_browser_internal(self, url, browser_id, resolution='1080p', framerate='any', auto_download=False, filename=None, output_format='mp4'):
         """Internal method to actually launch the browser (called by queue processor)"""
@@ -215,9 +277,20 @@ class BrowserService:
         detector.set_download_callback(self.download_service.start_download)
 
         with self.queue_lock:
-            self.active_browsers[browser_id] = detector
+            slot = self.active_browsers.get(browser_id)
+            if slot is None:
+                slot = self.active_browsers[browser_id] = BrowserSlot('launching', url, resolution, framerate)
+            slot.detector = detector
+            slot.status = 'active'
+
+        try:
+            started = detector.start_browser(url)
+        finally:
+            # Also on failure: a Chrome spawned by a failed start must be
+            # waited on (or killed) before the next launch
+            self._track_chrome(detector)
 
-        if detector.start_browser(url):
+        if started:
             return True, detector
         else:
             with self.queue_lock:
@@ -228,16 +301,21 @@ class BrowserService:
     def close_browser(self, browser_id):
         """Close a specific browser instance"""
         with self.queue_lock:
-            if browser_id not in self.active_browsers:
+            slot = self.active_browsers.get(browser_id)
+            if slot is None:
                 return False
 
-            detector = self.active_browsers[browser_id]
-            # Check if it's a dict (queued) or StreamDetector object (active)
-            if isinstance(detector, dict):
+            if not slot.launched:
                 # Just remove from dict - it's still queued, hasn't launched yet
                 del self.active_browsers[browser_id]
                 return True
 
+            if slot.status == 'closing':
+                # Another caller is already closing it
+                return True
+            slot.status = 'closing'
+            detector = slot.detector
+
         # Close the detector outside the lock to avoid deadlock
         # (detector.close() might do blocking operations)
         try:
@@ -246,8 +324,8 @@ class BrowserService:
             logger.error(f"Error closing browser {browser_id}: {e}")
 
         with self.queue_lock:
-            # Remove from dict after closing
-            if browser_id in self.active_browsers:
+            # Remove after closing, unless the ID was reused meanwhile
+            if self.active_browsers.get(browser_id) is slot:
                 del self.active_browsers[browser_id]
 
         return True
@@ -255,18 +333,15 @@ class BrowserService:
     def get_browser_status(self, browser_id):
         """Get status of a specific browser"""
         with self.queue_lock:
-            if browser_id not in self.active_browsers:
+            slot = self.active_browsers.get(browser_id)
+            if slot is None:
                 return None
 
-            browser = self.active_browsers[browser_id]
-            # Check if it's a dict (queued) or StreamDetector object (active)
-            if isinstance(browser, dict):
-                # Return the queued status (make a copy to avoid thread issues)
-                return browser.copy()
-            else:
-                # It's a StreamDetector, get its status
-                # (call get_status outside the lock to avoid potential deadlock)
-                detector = browser
+            if not slot.launched:
+                # Return the queued status (a fresh dict, safe to hand out)
+                return slot.to_status()
+            # Launched: call get_status outside the lock to avoid potential deadlock
+            detector = slot.detector
 
         # Call get_status outside the lock
         try:
@@ -276,21 +351,24 @@ class BrowserService:
             return None
 
     def get_browser(self, browser_id):
-        """Get a browser instance"""
+        """Get a browser instance (its status dict while still queued)"""
         with self.queue_lock:
-            return self.active_browsers.get(browser_id)
+            slot = self.active_browsers.get(browser_id)
+            if slot is None:
+                return None
+            return slot.detector if slot.launched else slot.to_status()
 
     def select_resolution(self, browser_id, stream):
         """Handle manual resolution selection"""
         with self.queue_lock:
-            if browser_id not in self.active_browsers:
+            slot = self.active_browsers.get(browser_id)
+            if slot is None:
                 return False, "Browser not found"
 
-            detector = self.active_browsers[browser_id]
-
             # Check if browser is still queued
-            if isinstance(detector, dict):
+            if not slot.launched:
                 return False, "Browser is queued and not yet launched"
+            detector = slot.detector
 
         logger.info(f"User selected resolution: {stream.get('name')}")
 
@@ -309,22 +387,17 @@ class BrowserService:
     def select_stream(self, browser_id, stream_url):
         """Handle manual stream selection"""
         with self.queue_lock:
-            if browser_id not in self.active_browsers:
+            slot = self.active_browsers.get(browser_id)
+            if slot is None:
                 return False, "Browser not found"
 
-            detector = self.active_browsers[browser_id]
-
             # Check if browser is still queued
-            if isinstance(detector, dict):
+            if not slot.launched:
                 return False, "Browser is queued and not yet launched"
+            detector = slot.detector
 
         # Find stream object
-        selected_stream = None
-        for res in detector.available_resolutions:
-            if res['url'] == stream_url:
-                selected_stream = res
-                break
-
+        selected_stream = detector.resolutions_by_url.get(stream_url)
         if not selected_stream:
             selected_stream = {
                 'url': stream_url,
@@ -354,7 +427,7 @@ class BrowserService:
             logger.info("Clear cookies requested")
 
             # Close all active browsers
-            browsers_to_close = list(self.active_browsers.keys())
+            browsers_to_close = self._snapshot_ids()
             for browser_id in browsers_to_close:
                 try:
                     self.close_browser(browser_id)
@@ -362,15 +435,16 @@ class BrowserService:
                 except Exception as e:
                     logger.error(f"Error closing browser {browser_id}: {e}")
 
-            # Force kill Chrome processes
+            # Force kill whatever is left of the closed browsers' Chrome and
+            # chromedriver processes and wait for them to go
             try:
-                subprocess.run(['pkill', '-9', 'chrome'], check=False, timeout=5)
-                subprocess.run(['pkill', '-9', 'chromedriver'], check=False, timeout=5)
-            except Exception:
-                pass
-
-            # Wait for processes to terminate
-            time.sleep(3)
+                self._wait_for_chrome_exit(timeout=0)
+                # Also sweep Chrome this service did not start (e.g. the test
+                # driver from the browser routes, or orphans of a crash) so
+                # nothing holds the profile while it is deleted
+                self._kill_chrome_by_name()
+            except Exception as e:
+                logger.debug(f"Error killing Chrome processes: {e}")
 
             if os.path.exists(self.config.CHROME_USER_DATA_DIR):
                 try:
@@ -378,33 +452,19 @@ class BrowserService:
                     cleared_count = 0
                     failed_count = 0
 
-                    for item in os.listdir(self.config.CHROME_USER_DATA_DIR):
-                        item_path = os.path.join(self.config.CHROME_USER_DATA_DIR, item)
-                        try:
-                            if os.path.isfile(item_path) or os.path.islink(item_path):
-                                os.unlink(item_path)
+                    # Profile dirs hold many small cache files, so deleting the
+                    # top-level items in parallel keeps the disk queue busy
+                    root = self.config.CHROME_USER_DATA_DIR
+                    with ThreadPoolExecutor(max_workers=CLEAR_COOKIES_WORKERS,
+                                            thread_name_prefix='clear-cookies') as executor:
+                        with os.scandir(root) as entries:
+                            futures = [executor.submit(self._remove_item, entry)
+                                       for entry in entries]
+                        for future in as_completed(futures):
+                            if future.result():
                                 cleared_count += 1
-                            elif os.path.isdir(item_path):
-                                try:
-                                    shutil.rmtree(item_path)
-                                    cleared_count += 1
-                                except OSError:
-                                    # Try to clear contents
-                                    for root, dirs, files in os.walk(item_path, topdown=False):
-                                        for name in files:
-                                            try:
-                                                os.remove(os.path.join(root, name))
-                                            except:
-                                                pass
-                                        for name in dirs:
-                                            try:
-                                                os.rmdir(os.path.join(root, name))
-                                            except:
-                                                pass
-                                    cleared_count += 1
-                        except Exception as item_error:
-                            logger.error(f"Failed to remove {item}: {item_error}")
-                            failed_count += 1
+                            else:
+                                failed_count += 1
 
                     logger.info(f"Chrome data cleared: {cleared_count} items")
 
@@ -421,28 +481,44 @@ class BrowserService:
             logger.error(f"Clear cookies error: {e}")
             return False, str(e)
 
+    @staticmethod
+    def _remove_item(entry):
+        """
+        Delete one top-level entry (os.DirEntry) of the Chrome profile directory.
+
+        Returns:
+            bool: True if the entry was removed (or emptied), False on failure
+        """
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                # rmtree walks the tree once with scandir; ignore_errors keeps it
+                # going past locked files, so whatever can go is removed even
+                # when the directory itself cannot be
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.unlink(entry.path)
+            return True
+        except Exception as item_error:
+            logger.error(f"Failed to remove {entry.name}: {item_error}")
+            return False
+
     def check_chrome_installation(self):
         """Check Chrome and ChromeDriver installation"""
         logger.info("Checking Chrome installation...")
         try:
-            # Check Chrome
-            chrome_result = subprocess.run(['google-chrome', '--version'],
-                                          capture_output=True, text=True, timeout=5)
-            logger.info(f"Chrome: {chrome_result.stdout.strip()}")
-
-            # Check ChromeDriver
-            driver_result = subprocess.run(['chromedriver', '--version'],
-                                          capture_output=True, text=True, timeout=5)
-            logger.info(f"ChromeDriver: {driver_result.stdout.strip()}")
+            chrome_version, driver_version = _probe_versions()
+            logger.info(f"Chrome: {chrome_version}")
+            logger.info(f"ChromeDriver: {driver_version}")
 
             # Check Display
             display = os.getenv('DISPLAY', 'NOT SET')
             logger.info(f"DISPLAY environment: {display}")
 
             # Check Xvfb
-            xvfb_result = subprocess.run(['ps', 'aux'],
-                                        capture_output=True, text=True, timeout=5)
-            if 'Xvfb' in xvfb_result.stdout:
+            # Read in-process from the process table rather than spawning pgrep
+            xvfb_running = any(p.info['name'] == 'Xvfb'
+                               for p in psutil.process_iter(['name']))
+            if xvfb_running:
                 logger.info("Xvfb is running ✓")
             else:
                 logger.warning("Xvfb not found in process list!")
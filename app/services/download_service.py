@@ -18,6 +18,7 @@ class DownloadService:
         self.download_queue = {}          # protected by _queue_lock
         self.direct_download_status = {}  # protected by _queue_lock
         self.download_thumbnails = {}     # protected by _queue_lock
+        self._start_events = {}           # browser_id -> Event, protected by _queue_lock
         # History file lives in /app/logs by default so it doesn't appear
         # inside the user's downloads folder. Can be overridden via history_file.
         self._history_file = history_file or os.path.join(download_dir, '.download_history.json')
@@ -46,6 +47,21 @@ class DownloadService:
         ).start()
         return browser_id, output_path
 
+    def register_start_event(self, browser_id):
+        """Return an Event that is set once a download for browser_id has started."""
+        with self._queue_lock:
+            event = self._start_events.get(browser_id)
+            if event is None:
+                event = self._start_events[browser_id] = threading.Event()
+            if browser_id in self.download_queue:
+                event.set()
+        return event
+
+    def unregister_start_event(self, browser_id):
+        """Drop the start Event for browser_id once nobody is waiting on it."""
+        with self._queue_lock:
+            self._start_events.pop(browser_id, None)
+
     def stop_download(self, browser_id):
         """Stop an active download, escalating from SIGTERM to SIGKILL if needed."""
         with self._queue_lock:
@@ -121,6 +137,12 @@ class DownloadService:
             'success': download_info.get('success', True),
         }
 
+    def is_download_running(self, browser_id):
+        """Return True if browser_id has a queued download that has not completed."""
+        with self._queue_lock:
+            download_info = self.download_queue.get(browser_id)
+            return download_info is not None and 'completed_at' not in download_info
+
     def get_history(self):
         """Return the persisted download history list."""
         try:
@@ -229,6 +251,9 @@ class DownloadService:
             }
             with self._queue_lock:
                 self.download_queue[browser_id] = queue_entry
+                start_event = self._start_events.get(browser_id)
+            if start_event:
+                start_event.set()
 
             thumbnail_thread = threading.Thread(
                 target=self._thumbnail_updater,
@@ -20,6 +20,41 @@ class PlaylistParser:
             logger.error(f"Failed to fetch master playlist: {e}")
             return None
 
+    @staticmethod
+    def fetch_if_master_playlist(url):
+        """
+        Stream a playlist and return (is_master, content).
+
+        Stops reading as soon as the playlist shows its type: the first
+        #EXTINF before any #EXT-X-STREAM-INF means a media playlist, so the
+        connection is closed without downloading the rest. Content is only
+        returned for master playlists.
+        """
+        try:
+            with requests.get(url, timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    return False, None
+
+                encoding = response.encoding or 'utf-8'
+                lines = []
+                is_master = False
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode(encoding, errors='replace')
+                    if not is_master:
+                        if line.startswith('#EXT-X-STREAM-INF:'):
+                            is_master = True
+                        elif line.startswith('#EXTINF'):
+                            # Media playlist - don't read the remaining segments
+                            return False, None
+                    lines.append(line)
+
+                if not is_master:
+                    return False, None
+                return True, '\n'.join(lines)
+        except Exception as e:
+            logger.error(f"Failed to fetch master playlist: {e}")
+            return False, None
+
     @staticmethod
     def parse_master_playlist(content):
         """Parse master playlist and extract resolution information"""